@@ -1,14 +1,20 @@
 """Hubspace integration."""
 
 import logging
+import time
 
 from aioafero import InvalidAuth
 from aioafero.v1 import AferoBridgeV1
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_PASSWORD, CONF_TIMEOUT, CONF_TOKEN, CONF_USERNAME
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers import aiohttp_client, device_registry as dr
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import (
+    aiohttp_client,
+    device_registry as dr,
+    entity_registry as er,
+)
 
+from .accounts import get_account_id
 from .bridge import HubspaceBridge
 from .const import (
     CONF_CLIENT,
@@ -19,27 +25,31 @@ from .const import (
     POLLING_TIME_STR,
 )
 from .services import async_register_services
+from .snapshot import DiscoverySnapshot
 
 _LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Hubspace as config entry."""
+    start = time.monotonic()
     bridge = HubspaceBridge(hass, entry)
     if not await bridge.async_initialize_bridge():
         return False
 
     async_register_services(hass)
 
-    device_registry = dr.async_get(hass)
-    device_registry.async_get_or_create(
-        config_entry_id=entry.entry_id,
-        identifiers={
-            (DOMAIN, bridge.config_entry.data[CONF_USERNAME]),
-        },
-        name=f"hubspace-{bridge.config_entry.data[CONF_USERNAME]}",
-        manufacturer="Hubspace",
-        model="Cloud API",
+    bridge.startup_phases["total"] = round(time.monotonic() - start, 3)
+    _LOGGER.debug(
+        "Setup of %s took %.3fs (%s) with entities %s",
+        entry.title,
+        bridge.startup_phases["total"],
+        ", ".join(
+            f"{phase}: {duration:.3f}s"
+            for phase, duration in bridge.startup_phases.items()
+            if phase != "total"
+        ),
+        bridge.get_entity_counts(),
     )
     return True
 
@@ -60,6 +70,8 @@ async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
         res = await perform_v4_migration(hass, config_entry)
     if config_entry.version == 4 and config_entry.minor_version == 0:
         res = await perform_v5_migration(hass, config_entry)
+    if config_entry.version == 5 and config_entry.minor_version == 0:
+        res = await perform_v6_migration(hass, config_entry)
     _LOGGER.debug(
         "Migration to configuration version %s.%s successful",
         config_entry.version,
@@ -158,6 +170,36 @@ async def perform_v5_migration(hass: HomeAssistant, config_entry: ConfigEntry) -
     return True
 
 
+async def perform_v6_migration(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
+    """Perform version 6 migration of the configuration entry.
+
+    * Ensure unique_id includes the client
+    * Ensure the hub device and its entities are identified by the client
+    """
+    username = config_entry.data[CONF_USERNAME]
+    account_id = get_account_id(username, config_entry.data[CONF_CLIENT])
+    dev_reg = dr.async_get(hass)
+    hub_device = dev_reg.async_get_device(identifiers={(DOMAIN, username)})
+    if hub_device and config_entry.entry_id in hub_device.config_entries:
+        dev_reg.async_update_device(
+            hub_device.id, new_identifiers={(DOMAIN, account_id)}
+        )
+
+    @callback
+    def migrate_unique_id(entity_entry: er.RegistryEntry) -> dict[str, str] | None:
+        """Prefix the unique ID of the hub entities with the client."""
+        if not entity_entry.unique_id.startswith(f"{username}-"):
+            return None
+        key = entity_entry.unique_id.removeprefix(f"{username}-")
+        return {"new_unique_id": f"{account_id}-{key}"}
+
+    await er.async_migrate_entries(hass, config_entry.entry_id, migrate_unique_id)
+    hass.config_entries.async_update_entry(
+        config_entry, version=6, minor_version=0, unique_id=account_id.lower()
+    )
+    return True
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     try:
@@ -167,3 +209,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if len(hass.data[DOMAIN]) == 0:
         hass.data.pop(DOMAIN)
     return unload_success
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored discovery snapshot."""
+    await DiscoverySnapshot(hass, entry.entry_id).async_remove()
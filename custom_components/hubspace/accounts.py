@@ -0,0 +1,171 @@
+"""Share polling, connections and request budgets between accounts."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import math
+import time
+from typing import TYPE_CHECKING
+
+import aiohttp
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.util import ssl as ssl_util
+
+from .const import ACCOUNTS_DATA, SESSION_DNS_CACHE_SEC, SESSION_KEEPALIVE_SEC
+
+if TYPE_CHECKING:
+    from .bridge import HubspaceBridge  # pragma: nocover
+
+
+class AccountScheduler:
+    """Coordinate the accounts loaded in a single Home Assistant instance.
+
+    Polls from different accounts are started at least tick / accounts
+    seconds apart, so accounts that were set up together settle into
+    staggered phases rather than querying the API at the same moment. Request
+    limits set on accounts apply to the accounts together, so accounts with a
+    limit split the highest limit set on any of them evenly. Accounts that use
+    a separate session share a single connection pool.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the scheduler.
+
+        :param hass: Home Assistant instance
+        :param clock: Monotonic clock
+        """
+        self._hass = hass
+        self._clock = clock
+        # entry id -> bridge
+        self.accounts: dict[str, HubspaceBridge] = {}
+        # Polls delayed so they did not start with another account
+        self.staggered: int = 0
+        self._last_poll: float = -math.inf
+        self.session: aiohttp.ClientSession | None = None
+        self._session_users: set[str] = set()
+        self._cancel_session_close: CALLBACK_TYPE | None = None
+
+    @callback
+    def register(self, bridge: HubspaceBridge) -> None:
+        """Add an account and rebalance the request budgets."""
+        self.accounts[bridge.config_entry.entry_id] = bridge
+        self._rebalance()
+
+    @callback
+    def unregister(self, bridge: HubspaceBridge) -> None:
+        """Remove an account and rebalance the request budgets."""
+        if self.accounts.get(bridge.config_entry.entry_id) is bridge:
+            self.accounts.pop(bridge.config_entry.entry_id)
+        self._rebalance()
+
+    def _rebalance(self) -> None:
+        """Limit each account to its share of the limits set on the accounts."""
+        poll_limits = [bridge.poll_rate_limit for bridge in self.accounts.values()]
+        command_limits = [
+            bridge.command_rate_limit for bridge in self.accounts.values()
+        ]
+        for bridge in self.accounts.values():
+            bridge.poll_limiter.set_rate(get_share(bridge.poll_rate_limit, poll_limits))
+            bridge.command_limiter.set_rate(
+                get_share(bridge.command_rate_limit, command_limits)
+            )
+
+    async def async_wait_for_turn(self, tick: float) -> None:
+        """Wait until the poll of an account will not start with another.
+
+        :param tick: Seconds between the polls of the account
+        """
+        if len(self.accounts) <= 1:
+            return
+        now = self._clock()
+        start = max(now, self._last_poll + tick / len(self.accounts))
+        self._last_poll = start
+        if start > now:
+            self.staggered += 1
+            await asyncio.sleep(start - now)
+
+    @callback
+    def acquire_session(self, entry_id: str) -> aiohttp.ClientSession:
+        """Get the separate session shared by accounts.
+
+        :param entry_id: Account using the session
+        """
+        if self.session is None or self.session.closed:
+            self.session = create_session()
+            self._cancel_session_close = self._hass.bus.async_listen_once(
+                EVENT_HOMEASSISTANT_CLOSE, self._async_close_session_on_stop
+            )
+        self._session_users.add(entry_id)
+        return self.session
+
+    async def async_release_session(self, entry_id: str) -> None:
+        """Close the separate session once no account is using it."""
+        self._session_users.discard(entry_id)
+        if self._session_users:
+            return
+        if self._cancel_session_close:
+            self._cancel_session_close()
+            self._cancel_session_close = None
+        if self.session and not self.session.closed:
+            await self.session.close()
+
+    async def _async_close_session_on_stop(self, _event: Event) -> None:
+        """Close the separate session when Home Assistant stops."""
+        self._cancel_session_close = None
+        self._session_users.clear()
+        if self.session and not self.session.closed:
+            await self.session.close()
+
+
+@callback
+def async_get_accounts(hass: HomeAssistant) -> AccountScheduler:
+    """Get the scheduler shared by all accounts."""
+    if ACCOUNTS_DATA not in hass.data:
+        hass.data[ACCOUNTS_DATA] = AccountScheduler(hass)
+    return hass.data[ACCOUNTS_DATA]
+
+
+def get_share(limit: float, limits: list[float]) -> float:
+    """Get the rate an account may use.
+
+    Unlimited accounts, and the only account with a limit, keep their own
+    limit.
+
+    :param limit: Rate configured for the account. 0 is unlimited
+    :param limits: Rates configured for all accounts
+    """
+    limited = [rate for rate in limits if rate]
+    if not limit or len(limited) <= 1:
+        return limit
+    return min(limit, max(limited) / len(limited))
+
+
+def get_account_id(username: str, client: str) -> str:
+    """Get an identifier for an account that is unique across clients.
+
+    The same email address may be used with more than one Afero client.
+    """
+    return f"{client}-{username}"
+
+
+def create_session() -> aiohttp.ClientSession:
+    """Create a session with a connection pool tuned for the Afero API.
+
+    Connections are kept alive between polls and DNS lookups are cached, so
+    most requests reuse an open connection rather than performing a TLS
+    handshake. Connections to each host are not capped by the pool, as each
+    account using it caps its own concurrent requests.
+    """
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            keepalive_timeout=SESSION_KEEPALIVE_SEC,
+            ttl_dns_cache=SESSION_DNS_CACHE_SEC,
+            ssl=ssl_util.client_context(),
+        ),
+    )
@@ -1,16 +1,15 @@
 """Home Assistant entity for getting state from Afero binary sensors."""
 
+from functools import partial
 import logging
 
-from aioafero import EventType
 from aioafero.v1 import AferoController, AferoModelResource
-from aioafero.v1.models import AferoBinarySensor
 from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
     BinarySensorEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .bridge import HubspaceBridge
@@ -41,6 +40,15 @@ class AferoBinarySensorEntity(HubspaceBaseEntity, BinarySensorEntity):
             sensor
         )
         self._attr_name = self.entity_description.name
+        function_class, function_instance = sensor.split("|", 1)
+        self.functions = frozenset(
+            {
+                (
+                    function_class,
+                    None if function_instance == "None" else function_instance,
+                )
+            }
+        )
 
     @property
     def is_on(self) -> bool:
@@ -75,45 +83,8 @@ async def async_setup_entry(
 ) -> None:
     """Set up entities."""
     bridge: HubspaceBridge = hass.data[DOMAIN][config_entry.entry_id]
-
-    # add all current items in controller
-    sensor_entities = []
-    for controller in bridge.api.controllers:
-        # Listen for new devices
-        if not controller.ITEM_BINARY_SENSORS:
-            continue
-        config_entry.async_on_unload(
-            controller.subscribe(
-                await generate_callback(bridge, controller, async_add_entities),
-                event_filter=EventType.RESOURCE_ADDED,
-            )
+    config_entry.async_on_unload(
+        bridge.entity_factory.async_register(
+            "binary_sensors", partial(get_sensors, bridge), async_add_entities
         )
-        # Add any currently tracked entities
-        for resource in controller:
-            if sensors := get_sensors(bridge, controller, resource):
-                async_add_entities(sensors)
-
-    async_add_entities(sensor_entities)
-
-
-async def generate_callback(bridge, controller, async_add_entities: callback):
-    """Generate a callback function for handling new binary sensor entities.
-
-    Args:
-        bridge: HubspaceBridge instance for managing device communication
-        controller: AferoController instance managing the device
-        async_add_entities: Callback function to register new entities
-
-    Returns:
-        Callback function that adds new binary sensor entities when resources are added
-
-    """
-
-    async def add_entity_controller(
-        event_type: EventType, resource: AferoBinarySensor
-    ) -> None:
-        """Add an entity."""
-        if sensors := get_sensors(bridge, controller, resource):
-            async_add_entities(sensors)
-
-    return add_entity_controller
+    )
@@ -1,24 +1,118 @@
 """Bridge knows how to interact with aioafero to update data."""
 
 import asyncio
-from collections.abc import Callable
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from functools import partial
 import logging
 from pathlib import Path
+import random
+import time
 from typing import Any
 
-from aioafero import EventType, InvalidAuth, InvalidResponse, TemperatureUnit
-from aioafero.v1 import AferoBridgeV1
+from aioafero import (
+    AferoDevice,
+    EventType,
+    InvalidAuth,
+    InvalidResponse,
+    TemperatureUnit,
+)
+from aioafero.errors import DeviceNotFound
+from aioafero.v1 import AferoBridgeV1, AferoModelResource
+from aioafero.v1.auth import AferoAuth, TokenData
+from aioafero.v1.controllers.base import BaseResourcesController
+from aioafero.v1.controllers.event import AferoEvent
 import aiohttp
 from aiohttp import client_exceptions
 from homeassistant import core
-from homeassistant.config_entries import SOURCE_REAUTH, ConfigEntry
-from homeassistant.const import CONF_PASSWORD, CONF_TIMEOUT, CONF_TOKEN, CONF_USERNAME
+from homeassistant.config_entries import SOURCE_REAUTH, ConfigEntry, ConfigEntryState
+from homeassistant.const import (
+    CONF_PASSWORD,
+    CONF_TIMEOUT,
+    CONF_TOKEN,
+    CONF_USERNAME,
+    Platform,
+)
 from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
-from homeassistant.helpers import aiohttp_client
+from homeassistant.helpers import aiohttp_client, entity_registry as er
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
 from homeassistant.util.unit_system import METRIC_SYSTEM
 
-from .const import CONF_CLIENT, DOMAIN, PLATFORMS, POLLING_TIME_STR
+from .accounts import async_get_accounts, get_account_id
+from .commands import (
+    CommandBatcher,
+    CommandCoalescer,
+    CommandScheduler,
+    RequestPriority,
+)
+from .const import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_MAX_BACKOFF_SEC,
+    CIRCUIT_MIN_BACKOFF_SEC,
+    COMMAND_BATCH_WINDOW_SEC,
+    COMMAND_RATE_BURST,
+    COMMAND_RATE_MAX_WAIT_SEC,
+    CONF_CLIENT,
+    CONF_COALESCE_WRITES,
+    CONF_COMMAND_RATE_LIMIT,
+    CONF_COMMAND_WINDOW,
+    CONF_DEDICATED_SESSION,
+    CONF_MAX_CONCURRENT,
+    CONF_MIN_WRITE_INTERVAL,
+    CONF_OPTIMISTIC,
+    CONF_POLL_RATE_LIMIT,
+    CONF_POLLING_DECAY,
+    CONF_POLLING_MIN,
+    DEFAULT_COALESCE_WRITES,
+    DEFAULT_COMMAND_RATE_LIMIT,
+    DEFAULT_COMMAND_WINDOW_MS,
+    DEFAULT_DEDICATED_SESSION,
+    DEFAULT_MAX_CONCURRENT,
+    DEFAULT_MIN_WRITE_INTERVAL_SEC,
+    DEFAULT_OPTIMISTIC,
+    DEFAULT_POLL_RATE_LIMIT,
+    DEFAULT_POLLING_DECAY_SEC,
+    DEFAULT_POLLING_MIN_SEC,
+    DOMAIN,
+    HEALTH_WINDOW_SEC,
+    LATENCY_SAMPLES,
+    OPTIMISTIC_TIMEOUT_SEC,
+    PLATFORMS,
+    PLATFORMS_ALWAYS,
+    POLL_RATE_BURST,
+    POLLING_TIER_MULTIPLIERS,
+    POLLING_TIME_STR,
+    RESOURCE_FEATURE_PLATFORMS,
+    RESOURCE_TYPE_PLATFORMS,
+    SIGNAL_AVAILABILITY,
+    SIGNAL_HEALTH,
+    TOKEN_REFRESH_JITTER_SEC,
+    TOKEN_REFRESH_MARGIN_SEC,
+    TOKEN_REFRESH_RETRY_SEC,
+    TOKEN_SAVE_DELAY_SEC,
+    WRITE_BATCH_SIZE,
+    WRITE_FLUSH_DELAY_SEC,
+)
 from .device import async_setup_devices
+from .factory import EntityFactory
+from .metrics import LatencyStats
+from .optimistic import ExpectationTracker
+from .polling import PollScheduler, get_poll_tier, get_states_fingerprint
+from .resilience import (
+    OUTAGE_ERRORS,
+    CircuitBreaker,
+    CircuitState,
+    RateLimitExceeded,
+    TokenBucket,
+)
+from .routing import UpdateRouter
+from .snapshot import DiscoverySnapshot
+from .writes import StateWriter
 
 
 def mock_get_data(filename: str) -> dict:
@@ -54,27 +148,125 @@ class HubspaceBridge:
         # light id -> color-mode / power state before night-light was enabled
         self.night_light_previous_modes: dict[str, str] = {}
         self.night_light_was_on: dict[str, bool] = {}
+        # Platforms that have been forwarded, and those waiting for the entry
+        # to finish loading before they can be forwarded
+        self.platforms: set[Platform] = set()
+        self._pending_platforms: set[Platform] = set()
+        # setup phase -> seconds taken
+        self.startup_phases: dict[str, float] = {}
         # Jobs to be executed when API is reset.
         self.reset_jobs: list[core.CALLBACK_TYPE] = []
         # self.sensor_manager: SensorManager | None = None
         self.logger = logging.getLogger(__name__)
-        polling_interval = int(self.config_entry.options[POLLING_TIME_STR])
+        options = self.config_entry.options
+        # Options the bridge was set up with, so changes to the entry data
+        # alone do not cause a reload
+        self.options: dict[str, Any] = dict(options)
+        polling_interval = int(options[POLLING_TIME_STR])
+        self.poll_scheduler = PollScheduler(
+            int(options.get(CONF_POLLING_MIN, DEFAULT_POLLING_MIN_SEC)),
+            polling_interval,
+            int(options.get(CONF_POLLING_DECAY, DEFAULT_POLLING_DECAY_SEC)),
+            tier_intervals={
+                tier: max(int(polling_interval * multiplier), 2)
+                for tier, multiplier in POLLING_TIER_MULTIPLIERS.items()
+            },
+        )
+        self.command_coalescer = CommandCoalescer(
+            int(options.get(CONF_COMMAND_WINDOW, DEFAULT_COMMAND_WINDOW_MS)) / 1000
+        )
+        self.command_batcher = CommandBatcher(COMMAND_BATCH_WINDOW_SEC)
+        max_concurrent = int(options.get(CONF_MAX_CONCURRENT, DEFAULT_MAX_CONCURRENT))
+        self.command_scheduler = CommandScheduler(max_concurrent)
+        self.optimistic: bool = bool(options.get(CONF_OPTIMISTIC, DEFAULT_OPTIMISTIC))
+        self.expectations = ExpectationTracker(hass, OPTIMISTIC_TIMEOUT_SEC)
+        self.circuit = CircuitBreaker(
+            CIRCUIT_FAILURE_THRESHOLD,
+            CIRCUIT_MIN_BACKOFF_SEC,
+            CIRCUIT_MAX_BACKOFF_SEC,
+            on_change=self._circuit_changed,
+        )
+        # Polls and commands have separate budgets so a busy automation does
+        # not starve polling, and a large account does not delay commands
+        self.poll_rate_limit = int(
+            options.get(CONF_POLL_RATE_LIMIT, DEFAULT_POLL_RATE_LIMIT)
+        )
+        self.command_rate_limit = int(
+            options.get(CONF_COMMAND_RATE_LIMIT, DEFAULT_COMMAND_RATE_LIMIT)
+        )
+        self.poll_limiter = TokenBucket(self.poll_rate_limit, POLL_RATE_BURST)
+        self.command_limiter = TokenBucket(self.command_rate_limit, COMMAND_RATE_BURST)
+        # Polls, connections and request budgets are shared with other accounts
+        self.accounts = async_get_accounts(hass)
+        self.accounts.register(self)
+        self.poll_stats = LatencyStats(LATENCY_SAMPLES, HEALTH_WINDOW_SEC)
+        self.command_stats = LatencyStats(LATENCY_SAMPLES, HEALTH_WINDOW_SEC)
+        # Duration of the last poll of all due devices, and when one last
+        # succeeded
+        self.last_poll_duration: float | None = None
+        self.last_poll: datetime | None = None
+        self.snapshot = DiscoverySnapshot(hass, config_entry.entry_id)
+        # aioafero may rotate the refresh token at any time. Keep the entry
+        # up to date so a restart does not begin from a stale token.
+        self._token_saver = Debouncer(
+            hass,
+            self.logger,
+            cooldown=TOKEN_SAVE_DELAY_SEC,
+            immediate=False,
+            function=self._async_save_token,
+        )
+        # Access tokens are refreshed in the background ahead of expiry, and
+        # concurrent callers share the refresh in progress
+        self._token_refresh: asyncio.Task | None = None
+        self._cancel_token_refresh: core.CALLBACK_TYPE | None = None
+        # Discovery payload used for the first poll when starting from the
+        # snapshot. Entities report an assumed state until a live discovery
+        # has reconciled it.
+        self._snapshot_devices: list[dict] | None = None
+        self.stale: bool = False
+        # metadevice id -> polling tier
+        self.poll_tiers: dict[str, str | None] = {}
+        # metadevice id -> fingerprint of the last states forwarded. Polls
+        # that match are dropped before they reach aioafero and the entities.
+        self.fingerprints: dict[str, int] = {}
+        self.polls_unchanged: int = 0
         # Afero only supports Celsius and Fahrenheit so we use hass.config.units.temperature_unit
         temp_unit = (
             TemperatureUnit.CELSIUS
             if hass.config.units == METRIC_SYSTEM
             else TemperatureUnit.FAHRENHEIT
         )
+        # Connections that are not shared with other integrations, if enabled
+        self.session: aiohttp.ClientSession | None = None
+        if options.get(CONF_DEDICATED_SESSION, DEFAULT_DEDICATED_SESSION):
+            self.session = self.accounts.acquire_session(config_entry.entry_id)
         # store actual api connection to bridge as api
         self.api = AferoBridgeV1(
             self.config_entry.data[CONF_USERNAME],
             self.config_entry.data[CONF_PASSWORD],
             refresh_token=self.config_entry.data[CONF_TOKEN],
-            session=aiohttp_client.async_get_clientsession(hass),
-            polling_interval=polling_interval,
+            session=self.session or aiohttp_client.async_get_clientsession(hass),
+            polling_interval=self.poll_scheduler.tick,
             afero_client=self.config_entry.data[CONF_CLIENT],
             temperature_unit=temp_unit,
         )
+        # aioafero polls on every tick, but only the devices the scheduler
+        # considers due are queried
+        self.api.fetch_all_device_states = self.async_fetch_due_states
+        self._fetch_live_discovery_data = self.api.fetch_discovery_data
+        self._get_live_account_id = self.api.get_account_id
+        self.api.fetch_discovery_data = self.async_fetch_discovery_data
+        self.api.get_account_id = self.async_get_account_id
+        # Entities are only called when a function they render has changed
+        self.router = UpdateRouter(self.api)
+        self.entity_factory = EntityFactory()
+        self.state_writer = StateWriter(
+            hass,
+            options.get(CONF_COALESCE_WRITES, DEFAULT_COALESCE_WRITES),
+            options.get(CONF_MIN_WRITE_INTERVAL, DEFAULT_MIN_WRITE_INTERVAL_SEC),
+            delay=WRITE_FLUSH_DELAY_SEC,
+            batch_size=WRITE_BATCH_SIZE,
+        )
         # store (this) bridge object in hass data
         hass.data.setdefault(DOMAIN, {})[self.config_entry.entry_id] = self
 
@@ -85,14 +277,25 @@ class HubspaceBridge:
             self.config_entry.async_start_reauth(self.hass)
 
         setup_ok = False
+        with self.startup_phase("snapshot"):
+            snapshot = await self.snapshot.async_load(self.api.temperature_unit.value)
+        if snapshot:
+            self.logger.debug(
+                "Starting from the discovery snapshot of %d devices",
+                len(snapshot["devices"]),
+            )
+            self._snapshot_devices = snapshot["devices"]
+            self.stale = True
 
         # Dev mocking
         # self.api.fetch_discovery_data = mock_get_data("dual-channel-lights-raw.json")
 
         try:
             async with asyncio.timeout(self.config_entry.options[CONF_TIMEOUT]):
-                await self.api.initialize()
-                await self.api.async_block_until_done()
+                with self.startup_phase("login"):
+                    await self.api.initialize()
+                with self.startup_phase("first_poll"):
+                    await self.api.async_block_until_done()
             setup_ok = True
         except (InvalidAuth, InvalidResponse, aiohttp.web_exceptions.HTTPForbidden):
             # Credentials have changed. Force a re-login
@@ -113,32 +316,446 @@ class HubspaceBridge:
         finally:
             if not setup_ok:
                 await self.api.close()
+                await self.async_close_session()
+                self.accounts.unregister(self)
 
+        for controller in self.api.controllers:
+            self.batch_controller_updates(controller)
         # Subscribe to invalid_auth events
         self.config_entry.async_on_unload(
             self.api.events.subscribe(reauth, event_filter=EventType.INVALID_AUTH)
         )
         # Init devices
-        await async_setup_devices(self)
-        await self.hass.config_entries.async_forward_entry_setups(
-            self.config_entry, PLATFORMS
+        with self.startup_phase("devices"):
+            await async_setup_devices(self)
+        self.platforms = set(PLATFORMS_ALWAYS)
+        self.entity_factory.async_index(self.api.controllers)
+        for controller in self.api.controllers:
+            for resource in controller:
+                self.platforms |= get_resource_platforms(controller, resource)
+            self.config_entry.async_on_unload(
+                controller.subscribe(
+                    partial(self._async_resource_added, controller),
+                    event_filter=EventType.RESOURCE_ADDED,
+                )
+            )
+        self.config_entry.async_on_unload(
+            self.config_entry.async_on_state_change(self._async_forward_pending)
         )
+        with self.startup_phase("platforms"):
+            await self.hass.config_entries.async_forward_entry_setups(
+                self.config_entry, sort_platforms(self.platforms)
+            )
         # add listener for config entry updates.
         self.reset_jobs.append(self.config_entry.add_update_listener(_update_listener))
+        self.async_check_token()
+        self.async_schedule_token_refresh()
         self.authorized = True
+        if self.stale:
+            self.config_entry.async_create_background_task(
+                self.hass,
+                self.api.events.perform_discovery_poll(),
+                f"{DOMAIN}_reconcile_{self.config_entry.entry_id}",
+            )
         return True
 
+    async def async_close_session(self) -> None:
+        """Stop using the separate session, if one was acquired."""
+        if self.session:
+            await self.accounts.async_release_session(self.config_entry.entry_id)
+
+    @contextmanager
+    def startup_phase(self, name: str) -> Iterator[None]:
+        """Record how long a phase of setup takes."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.startup_phases[name] = round(time.monotonic() - start, 3)
+
+    def get_entity_counts(self) -> dict[str, int]:
+        """Get the number of entities registered for each platform."""
+        return dict(
+            Counter(
+                entity.domain
+                for entity in er.async_entries_for_config_entry(
+                    er.async_get(self.hass), self.config_entry.entry_id
+                )
+            )
+        )
+
+    @core.callback
+    def _async_resource_added(
+        self,
+        controller: BaseResourcesController,
+        event_type: EventType,
+        resource: AferoModelResource,
+    ) -> None:
+        """Add entities for the new resource and forward any platforms it requires."""
+        self.entity_factory.async_resource_added(controller, resource)
+        missing = (
+            get_resource_platforms(controller, resource)
+            - self.platforms
+            - self._pending_platforms
+        )
+        if not missing:
+            return
+        self.logger.debug("Forwarding new platforms %s", missing)
+        self._pending_platforms |= missing
+        self._async_forward_pending()
+
+    @core.callback
+    def _async_forward_pending(self) -> None:
+        """Forward waiting platforms once the entry has loaded."""
+        if (
+            not self._pending_platforms
+            or self.config_entry.state is not ConfigEntryState.LOADED
+        ):
+            return
+        platforms = sort_platforms(self._pending_platforms)
+        self.platforms |= self._pending_platforms
+        self._pending_platforms = set()
+        self.config_entry.async_create_task(
+            self.hass,
+            self.hass.config_entries.async_forward_entry_setups(
+                self.config_entry, platforms
+            ),
+        )
+
+    @property
+    def account_id(self) -> str:
+        """Get the identifier of the account, which includes the client."""
+        return get_account_id(
+            self.config_entry.data[CONF_USERNAME], self.config_entry.data[CONF_CLIENT]
+        )
+
+    @property
+    def availability_signal(self) -> str:
+        """Dispatcher signal sent when the API availability or freshness changes."""
+        return SIGNAL_AVAILABILITY.format(self.config_entry.entry_id)
+
+    @property
+    def _auth(self) -> AferoAuth:
+        """Get the aioafero authentication, which does not expose token expiry."""
+        return self.api._auth  # noqa: SLF001
+
+    @property
+    def _token_data(self) -> TokenData | None:
+        """Get the current token data from aioafero."""
+        return self._auth._token_data  # noqa: SLF001
+
+    @property
+    def token_expiration(self) -> float | None:
+        """Get when the access token expires, if one has been issued."""
+        token_data = self._token_data
+        if not token_data or not token_data.token:
+            return None
+        return token_data.expiration
+
+    @core.callback
+    def async_schedule_token_refresh(self, delay: float | None = None) -> None:
+        """Schedule the access token to be refreshed shortly before it expires."""
+        if self._cancel_token_refresh:
+            self._cancel_token_refresh()
+        if delay is None:
+            expiration = self.token_expiration or time.time()
+            delay = max(
+                expiration
+                - time.time()
+                - TOKEN_REFRESH_MARGIN_SEC
+                - random.uniform(0, TOKEN_REFRESH_JITTER_SEC),
+                0,
+            )
+        self._cancel_token_refresh = async_call_later(
+            self.hass, delay, self._async_scheduled_token_refresh
+        )
+
+    async def _async_scheduled_token_refresh(self, _now: datetime) -> None:
+        """Refresh the access token, retrying later if it fails."""
+        self._cancel_token_refresh = None
+        try:
+            await self.async_refresh_token()
+        except Exception as err:  # noqa: BLE001
+            self.logger.warning("Unable to refresh the access token: %s", err)
+            self.async_schedule_token_refresh(TOKEN_REFRESH_RETRY_SEC)
+
+    async def async_refresh_token(self) -> None:
+        """Refresh the access token, sharing a refresh that is in progress."""
+        if self._token_refresh is None or self._token_refresh.done():
+            self._token_refresh = self.config_entry.async_create_background_task(
+                self.hass,
+                self._async_refresh_token(),
+                f"{DOMAIN}_token_refresh_{self.config_entry.entry_id}",
+            )
+        await asyncio.shield(self._token_refresh)
+
+    async def _async_refresh_token(self) -> None:
+        """Generate a new access token through aioafero."""
+        token_data = self._token_data
+        forced = None
+        if token_data and token_data.token:
+            # aioafero only refreshes expired tokens
+            forced = token_data._replace(expiration=0)
+            self.api.set_token_data(forced)
+        try:
+            await self._auth.token()
+        except Exception:
+            if forced and self._token_data is forced:
+                # The current token is still valid until it really expires
+                self.api.set_token_data(token_data)
+            raise
+        self.logger.debug("Refreshed the access token")
+        self.async_check_token()
+        self.async_schedule_token_refresh()
+
+    async def async_ensure_token(self) -> None:
+        """Wait for a refresh in progress or an expired token to be refreshed.
+
+        Requests wait here rather than for aioafero, so the time spent on
+        authentication is not counted as request latency.
+        """
+        expiration = self.token_expiration
+        if (self._token_refresh and not self._token_refresh.done()) or (
+            expiration is not None and expiration <= time.time()
+        ):
+            await self.async_refresh_token()
+
+    @core.callback
+    def async_check_token(self) -> None:
+        """Schedule the refresh token to be saved if it has been rotated."""
+        token = self.api.refresh_token
+        if token and token != self.config_entry.data.get(CONF_TOKEN):
+            self._token_saver.async_schedule_call()
+
+    @core.callback
+    def _async_save_token(self) -> None:
+        """Save the current refresh token to the config entry."""
+        token = self.api.refresh_token
+        if not token or token == self.config_entry.data.get(CONF_TOKEN):
+            return
+        self.logger.debug("Saving the rotated refresh token")
+        self.hass.config_entries.async_update_entry(
+            self.config_entry, data={**self.config_entry.data, CONF_TOKEN: token}
+        )
+
+    @property
+    def health_signal(self) -> str:
+        """Dispatcher signal sent when the request counters change."""
+        return SIGNAL_HEALTH.format(self.config_entry.entry_id)
+
+    @core.callback
+    def _circuit_changed(self, state: CircuitState) -> None:
+        """Notify entities that the API availability has changed."""
+        async_dispatcher_send(self.hass, self.availability_signal)
+
+    async def async_get_account_id(self) -> str | None:
+        """Look up the account, unless starting from the snapshot.
+
+        The lookup is deferred until the first live request so setup does not
+        wait on the API.
+        """
+        if self._snapshot_devices is not None:
+            return self.api.account_id
+        return await self._get_live_account_id()
+
+    async def async_ensure_account_id(self) -> None:
+        """Look up the account if it was deferred during setup."""
+        if self.api.account_id is None:
+            await self._get_live_account_id()
+
+    async def async_fetch_discovery_data(self, version_poll: bool = False) -> list:
+        """Query the API for all device data.
+
+        The snapshot is used for the first discovery when available. Every
+        live discovery is saved as the new snapshot.
+        """
+        if self._snapshot_devices is not None:
+            devices, self._snapshot_devices = self._snapshot_devices, None
+            return devices
+        await self.async_ensure_account_id()
+        devices = await self._fetch_live_discovery_data(version_poll=version_poll)
+        self.snapshot.async_save(self.api.temperature_unit.value, devices)
+        # Discovery updates every device, so the next poll of each is compared
+        # against the discovered states rather than the last poll
+        self.fingerprints.clear()
+        if self.stale:
+            self.logger.debug("Reconciling the discovery snapshot with live data")
+            self.stale = False
+            async_dispatcher_send(self.hass, self.availability_signal)
+        return devices
+
+    async def async_fetch_due_states(self) -> list[AferoDevice]:
+        """Query the API for the states of all devices that are due a poll."""
+        try:
+            return await self._async_fetch_due_states()
+        finally:
+            async_dispatcher_send(self.hass, self.health_signal)
+            self.async_check_token()
+
+    async def _async_fetch_due_states(self) -> list[AferoDevice]:
+        """Poll the devices that are due and record the outcome."""
+        metadevice_ids = {
+            self.api.resolve_metadevice_id(device_id)
+            for device_id in self.api.tracked_devices
+        }
+        if not metadevice_ids or not self.circuit.allow():
+            return []
+        if self.circuit.state == CircuitState.HALF_OPEN:
+            # Probe with a single device before resuming polling
+            due = {min(metadevice_ids)}
+        else:
+            due = self.poll_scheduler.due_devices(
+                metadevice_ids,
+                {
+                    device_id: self.get_poll_tier(device_id)
+                    for device_id in metadevice_ids
+                },
+            )
+        if not due:
+            return []
+        await self.accounts.async_wait_for_turn(self.poll_scheduler.tick)
+        self.logger.debug("Polling states for %d devices", len(due))
+        due_ids = list(due)
+        start = time.monotonic()
+        results = await asyncio.gather(
+            *[self.async_fetch_device_states(device_id) for device_id in due_ids],
+            return_exceptions=True,
+        )
+        self.last_poll_duration = time.monotonic() - start
+        if all(isinstance(result, OUTAGE_ERRORS) for result in results):
+            self.circuit.record_failure()
+        else:
+            self.circuit.record_success()
+            self.last_poll = dt_util.utcnow()
+        updated_devices: list[AferoDevice] = []
+        pending_devices = self.expectations.pending_devices
+        for device_id, result in zip(due_ids, results, strict=True):
+            if isinstance(result, Exception):
+                self.logger.warning("Unable to fetch states: %s", result)
+                continue
+            fingerprint = get_states_fingerprint(result)
+            if (
+                device_id not in pending_devices
+                and self.fingerprints.get(device_id) == fingerprint
+            ):
+                self.polls_unchanged += 1
+                continue
+            try:
+                device = self.api.get_afero_device(device_id)
+            except DeviceNotFound:
+                self.logger.warning("Device %s not found in cache", device_id)
+                continue
+            self.fingerprints[device_id] = fingerprint
+            device.states = result
+            if device_id in pending_devices:
+                await self.async_force_forward(device)
+            else:
+                updated_devices.append(device)
+        if updated_devices:
+            self.state_writer.async_start_cycle()
+        return updated_devices
+
+    async def async_fetch_device_states(self, device_id: str) -> list:
+        """Query the API for the states of a device once the rate limit allows."""
+        await self.async_ensure_account_id()
+        await self.async_ensure_token()
+        await self.poll_limiter.async_acquire()
+        async with self.command_scheduler.async_slot(RequestPriority.POLL):
+            with self.poll_stats.measure():
+                return await self.api.fetch_device_states(device_id)
+
+    async def async_force_forward(self, device: AferoDevice) -> None:
+        """Forward polled states to entities even if they have not changed.
+
+        Entities with an optimistic state need to see every poll, otherwise
+        a poll that contradicts the expected state is never reported.
+        """
+        for split_device in await self.api.events.split_devices([device]):
+            self.api.events.add_job(
+                AferoEvent(
+                    type=EventType.RESOURCE_UPDATE_RESPONSE,
+                    device_id=split_device.id,
+                    device=split_device,
+                    force_forward=True,
+                )
+            )
+
+    def get_poll_tier(self, device_id: str) -> str | None:
+        """Get the polling tier for the given metadevice."""
+        if device_id not in self.poll_tiers:
+            try:
+                device = self.api.get_afero_device(device_id)
+            except DeviceNotFound:
+                return None
+            self.poll_tiers[device_id] = get_poll_tier(device)
+        return self.poll_tiers[device_id]
+
+    def batch_controller_updates(self, controller: BaseResourcesController) -> None:
+        """Send updates from the controller through the command batcher."""
+
+        async def send(device_id: str, states: list[dict]) -> Any:
+            await self.async_ensure_account_id()
+            await self.async_ensure_token()
+            # The device state no longer matches the last poll, so the next
+            # poll must be forwarded even if it reports the same values
+            self.fingerprints.pop(self.api.resolve_metadevice_id(device_id), None)
+            async with self.command_scheduler.async_device(device_id):
+                await self.command_limiter.async_acquire(COMMAND_RATE_MAX_WAIT_SEC)
+                async with self.command_scheduler.async_slot(RequestPriority.COMMAND):
+                    try:
+                        with self.command_stats.measure() as request:
+                            async_dispatcher_send(self.hass, self.health_signal)
+                            res = await type(controller).update_afero_api(
+                                controller, device_id, states
+                            )
+                            request.failed = not res
+                        # aioafero returns False rather than raising when the
+                        # API is overloaded (429 / 503 / 504) or rejects the
+                        # states. Successful polls reset the failure count, so
+                        # an occasional rejected command does not open the
+                        # circuit.
+                        if res:
+                            self.circuit.record_success()
+                        else:
+                            self.circuit.record_failure()
+                        return res
+                    finally:
+                        async_dispatcher_send(self.hass, self.health_signal)
+                        self.async_check_token()
+
+        async def update_afero_api(device_id: str, states: list[dict]) -> Any:
+            return await self.command_batcher.async_send(send, device_id, states)
+
+        controller.update_afero_api = update_afero_api
+
     async def async_request_call(self, task: Callable, *args, **kwargs) -> Any:
         """Send request to the bridge."""
-        try:
-            return await task(*args, **kwargs)
-        except aiohttp.ClientError as err:
+        if device_id := kwargs.get("device_id"):
+            self.poll_scheduler.command_sent(self.api.resolve_metadevice_id(device_id))
+        if not self.circuit.allow():
             raise HomeAssistantError(
-                f"Request failed due connection error: {err}"
-            ) from err
+                "Hubspace API is unavailable, retrying in "
+                f"{self.circuit.retry_in:.0f} seconds"
+            )
+        try:
+            result = await self.command_coalescer.async_call(task, *args, **kwargs)
+        except RateLimitExceeded as err:
+            raise HomeAssistantError(str(err)) from err
+        except OUTAGE_ERRORS as err:
+            self.circuit.record_failure()
+            if isinstance(err, aiohttp.ClientError):
+                raise HomeAssistantError(
+                    f"Request failed due connection error: {err}"
+                ) from err
+            raise HomeAssistantError(f"Request failed: {err}") from err
         except Exception as err:
+            # Failures that are not outages may happen before anything reaches
+            # Hubspace, so they say nothing about its availability
             msg = f"Request failed: {err}"
             raise HomeAssistantError(msg) from err
+        # The outcome of the request itself is recorded when it is sent, as
+        # aioafero does not raise when the API is overloaded
+        return result
 
     async def async_reset(self) -> bool:
         """Reset this bridge to default state.
@@ -153,16 +770,29 @@ class HubspaceBridge:
 
         while self.reset_jobs:
             self.reset_jobs.pop()()
+        if self._cancel_token_refresh:
+            self._cancel_token_refresh()
+            self._cancel_token_refresh = None
 
         # Unload platforms
         unload_success = await self.hass.config_entries.async_unload_platforms(
-            self.config_entry, PLATFORMS
+            self.config_entry, sort_platforms(self.platforms)
         )
 
+        # Save any rotated token now rather than losing it with the bridge
+        self._token_saver.async_shutdown()
+        self._async_save_token()
+        await self.command_coalescer.async_stop()
+        await self.command_batcher.async_stop()
+        self.expectations.stop()
+        self.router.stop()
+        self.state_writer.stop()
         try:
             await self.api.close()
         except Exception:
             self.logger.exception("Error closing Hubspace API connection")
+        await self.async_close_session()
+        self.accounts.unregister(self)
 
         if unload_success:
             self.hass.data[DOMAIN].pop(self.config_entry.entry_id)
@@ -170,8 +800,34 @@ class HubspaceBridge:
         return unload_success
 
 
+def get_resource_platforms(
+    controller: BaseResourcesController, resource: AferoModelResource
+) -> set[Platform]:
+    """Get the platforms that create entities for the resource."""
+    platforms = {
+        RESOURCE_TYPE_PLATFORMS[item_type.value]
+        for item_type in controller.ITEM_TYPES
+        if item_type.value in RESOURCE_TYPE_PLATFORMS
+    }
+    platforms.update(
+        platform
+        for feature, platform in RESOURCE_FEATURE_PLATFORMS.items()
+        if getattr(resource, feature, None)
+    )
+    return platforms
+
+
+def sort_platforms(platforms: set[Platform]) -> list[Platform]:
+    """Sort the platforms into the order they are set up."""
+    return [platform for platform in PLATFORMS if platform in platforms]
+
+
 async def _update_listener(hass: core.HomeAssistant, entry: ConfigEntry) -> None:
     """Handle ConfigEntry options update."""
+    bridge: HubspaceBridge | None = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if bridge and bridge.options == entry.options:
+        # Only the entry data changed, such as a rotated refresh token
+        return
     await hass.config_entries.async_reload(entry.entry_id)
 
 
@@ -10,7 +10,6 @@ from aioafero.v1 import AferoBridgeV1
 import aiofiles
 from homeassistant.components.button import ButtonEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_USERNAME
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -47,13 +46,11 @@ class DebugButton(ButtonEntity):
         self.logger = bridge.logger.getChild("debug-button")
         self._attr_has_entity_name = True
         self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, bridge.config_entry.data[CONF_USERNAME])},
+            identifiers={(DOMAIN, bridge.account_id)},
         )
         self.instance = instance
         self._attr_name = DEVICE_NAMES[instance]
-        self._attr_unique_id = (
-            f"{bridge.config_entry.data[CONF_USERNAME]}-{instance.value}"
-        )
+        self._attr_unique_id = f"{bridge.account_id}-{instance.value}"
 
     async def async_press(self) -> None:
         """Handle the button press."""
@@ -30,7 +30,22 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .bridge import HubspaceBridge
 from .const import DOMAIN
-from .entity import HubspaceBaseEntity
+from .entity import HubspaceBaseEntity, derived_property
+
+HVAC_ACTIONS_HS_TO_HA: dict[str, HVACAction] = {
+    "cooling": HVACAction.COOLING,
+    "heating": HVACAction.HEATING,
+    "off": HVACAction.OFF,
+}
+HVAC_MODES_HS_TO_HA: dict[str, HVACMode] = {
+    "cool": HVACMode.COOL,
+    "heat": HVACMode.HEAT,
+    "fan": HVACMode.FAN_ONLY,
+    "off": HVACMode.OFF,
+    "auto": HVACMode.HEAT_COOL,
+    "dehumidify": HVACMode.DRY,
+    "auto-cool": HVACMode.AUTO,
+}
 
 
 class HubspaceThermostat(HubspaceBaseEntity, ClimateEntity):
@@ -83,12 +98,7 @@ class HubspaceThermostat(HubspaceBaseEntity, ClimateEntity):
         """Returns the current state of hvac operation."""
         if not hasattr(self.resource, "hvac_action"):
             return None
-        mapping = {
-            "cooling": HVACAction.COOLING,
-            "heating": HVACAction.HEATING,
-            "off": HVACAction.OFF,
-        }
-        mapped = mapping.get(self.resource.hvac_action)
+        mapped = HVAC_ACTIONS_HS_TO_HA.get(self.resource.hvac_action)
         if mapped:
             return mapped
         if self.resource.hvac_mode.mode == "fan":
@@ -98,36 +108,18 @@ class HubspaceThermostat(HubspaceBaseEntity, ClimateEntity):
     @property
     def hvac_mode(self) -> HVACMode | None:
         """Returns the current hvac mode."""
-        mapping = {
-            "cool": HVACMode.COOL,
-            "heat": HVACMode.HEAT,
-            "fan": HVACMode.FAN_ONLY,
-            "off": HVACMode.OFF,
-            "auto": HVACMode.HEAT_COOL,
-            "dehumidify": HVACMode.DRY,
-            "auto-cool": HVACMode.AUTO,
-        }
-        mapped = mapping.get(self.resource.hvac_mode.mode)
+        mapped = HVAC_MODES_HS_TO_HA.get(self.resource.hvac_mode.mode)
         if not mapped:
             self.logger.warning("Unknown hvac mode: %s", self.resource.hvac_mode.mode)
             return None
         return mapped
 
-    @property
+    @derived_property
     def hvac_modes(self) -> list[HVACMode]:
         """Returns all available hvac modes."""
-        mapping = {
-            "cool": HVACMode.COOL,
-            "heat": HVACMode.HEAT,
-            "fan": HVACMode.FAN_ONLY,
-            "off": HVACMode.OFF,
-            "auto": HVACMode.HEAT_COOL,
-            "dehumidify": HVACMode.DRY,
-            "auto-cool": HVACMode.AUTO,
-        }
         return [
             val
-            for key, val in mapping.items()
+            for key, val in HVAC_MODES_HS_TO_HA.items()
             if key in self.resource.hvac_mode.supported_modes
         ]
 
@@ -0,0 +1,331 @@
+"""Control how commands are sent to the Afero API."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+import heapq
+import itertools
+from typing import Any, Final
+
+# Arguments that determine which part of a device is being controlled rather
+# than the value being sent
+IDENTITY_KWARGS: Final[frozenset[str]] = frozenset({"device_id", "instance", "channel"})
+
+
+@dataclass
+class PendingCommand:
+    """Latest command waiting to be sent for a given key."""
+
+    task: Callable
+    args: tuple
+    kwargs: dict[str, Any]
+    future: asyncio.Future = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+
+
+@dataclass
+class BatchedRequest:
+    """States sent by a single caller within a batch."""
+
+    send: Callable[[str, list[dict]], Awaitable[Any]]
+    states: list[dict]
+    future: asyncio.Future = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+
+
+def get_command_key(task: Callable, args: tuple, kwargs: dict) -> Hashable | None:
+    """Generate the key used to identify commands that supersede each other.
+
+    Commands share a key when they target the same device and element, and set
+    the same functions. ``None`` is returned for commands that cannot be
+    coalesced.
+
+    :param task: Callable that sends the command
+    :param args: Positional arguments for the callable
+    :param kwargs: Keyword arguments for the callable
+    """
+    if args or not kwargs.get("device_id"):
+        return None
+    functions: list[tuple] = []
+    for name, value in sorted(kwargs.items()):
+        if value is None:
+            continue
+        if name in IDENTITY_KWARGS:
+            functions.append((name, value))
+        elif isinstance(value, dict):
+            functions.append((name, *sorted(map(str, value))))
+        elif isinstance(value, list):
+            # Afero states, which are identified by the function they set
+            functions.append(
+                (
+                    name,
+                    *sorted(
+                        f"{state.get('functionClass')}/{state.get('functionInstance')}"
+                        for state in value
+                    ),
+                )
+            )
+        else:
+            functions.append((name,))
+    return task, tuple(functions)
+
+
+class CommandCoalescer:
+    """Last-write-wins coalescing of commands.
+
+    The first command for a key is sent immediately. Commands for the same key
+    that arrive while it is in-flight, or within the window after it finished,
+    replace each other so only the latest is sent. Every superseded caller
+    receives the result of the command that was actually sent.
+
+    Commands held for other functions of the device are sent before a new
+    command to it, so the last command issued for a device is always the last
+    one sent.
+    """
+
+    def __init__(self, window: float) -> None:
+        """Initialize the coalescer.
+
+        :param window: Seconds to hold a key after a command has been sent
+        """
+        self.window: float = window
+        self.coalesced: int = 0
+        self._active: set[Hashable] = set()
+        self._pending: dict[Hashable, PendingCommand] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def async_call(self, task: Callable, *args, **kwargs) -> Any:
+        """Send the command or queue it behind the in-flight command."""
+        key = get_command_key(task, args, kwargs)
+        if key is None or self.window <= 0:
+            return await task(*args, **kwargs)
+        await self._async_send_held(kwargs["device_id"], key)
+        if key in self._active:
+            if pending := self._pending.get(key):
+                self.coalesced += 1
+                pending.task, pending.args, pending.kwargs = task, args, kwargs
+            else:
+                pending = self._pending[key] = PendingCommand(task, args, kwargs)
+            return await asyncio.shield(pending.future)
+        self._active.add(key)
+        try:
+            return await task(*args, **kwargs)
+        finally:
+            drain = asyncio.create_task(self._async_drain(key))
+            self._tasks.add(drain)
+            drain.add_done_callback(self._tasks.discard)
+
+    async def _async_drain(self, key: Hashable) -> None:
+        """Send the latest pending command for the key once the window elapses."""
+        try:
+            while True:
+                await asyncio.sleep(self.window)
+                pending = self._pending.pop(key, None)
+                if pending is None:
+                    return
+                await self._async_send_pending(pending)
+        finally:
+            self._active.discard(key)
+
+    async def _async_send_held(self, device_id: str, key: Hashable) -> None:
+        """Send the commands held for the device under other keys."""
+        held = [
+            held_key
+            for held_key, pending in self._pending.items()
+            if held_key != key and pending.kwargs["device_id"] == device_id
+        ]
+        for held_key in held:
+            if pending := self._pending.pop(held_key, None):
+                await self._async_send_pending(pending)
+
+    @staticmethod
+    async def _async_send_pending(pending: PendingCommand) -> None:
+        """Send a held command and pass the outcome to its callers."""
+        try:
+            result = await pending.task(*pending.args, **pending.kwargs)
+        except Exception as err:  # noqa: BLE001
+            pending.future.set_exception(err)
+        else:
+            pending.future.set_result(result)
+
+    async def async_stop(self) -> None:
+        """Cancel any commands that have not been sent."""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for pending in self._pending.values():
+            pending.future.cancel()
+        self._pending.clear()
+
+
+def merge_states(batch: list[list[dict]]) -> list[dict]:
+    """Merge Afero states from multiple requests into a single request.
+
+    If multiple requests set the same function, the latest value wins.
+    """
+    merged: dict[tuple[str, str | None], dict] = {}
+    for states in batch:
+        for state in states:
+            merged[(state["functionClass"], state.get("functionInstance"))] = state
+    return list(merged.values())
+
+
+class CommandBatcher:
+    """Merge state updates for the same device into a single request.
+
+    Entities that share a physical device (fan / light combos, dual-channel
+    lights, multi-outlet strips) update the device independently. Updates that
+    arrive within the window are sent as one request, and every caller receives
+    its response. If the merged request is rejected, each update is retried
+    on its own so a single bad state does not fail the others.
+    """
+
+    def __init__(self, window: float) -> None:
+        """Initialize the batcher.
+
+        :param window: Seconds to wait for other updates to the device
+        """
+        self.window: float = window
+        self.batched: int = 0
+        self._batches: dict[str, list[BatchedRequest]] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def async_send(
+        self,
+        send: Callable[[str, list[dict]], Awaitable[Any]],
+        device_id: str,
+        states: list[dict],
+    ) -> Any:
+        """Queue the states to be sent with any other updates to the device."""
+        if self.window <= 0 or not states:
+            return await send(device_id, states)
+        request = BatchedRequest(send, states)
+        if batch := self._batches.get(device_id):
+            self.batched += 1
+            batch.append(request)
+        else:
+            self._batches[device_id] = [request]
+            flush = asyncio.create_task(self._async_flush(device_id))
+            self._tasks.add(flush)
+            flush.add_done_callback(self._tasks.discard)
+        return await asyncio.shield(request.future)
+
+    async def _async_flush(self, device_id: str) -> None:
+        """Send all queued states for the device once the window elapses."""
+        await asyncio.sleep(self.window)
+        batch = self._batches.pop(device_id)
+        try:
+            res = await batch[0].send(
+                device_id, merge_states([request.states for request in batch])
+            )
+        except Exception as err:  # noqa: BLE001
+            for request in batch:
+                request.future.set_exception(err)
+            return
+        if res or len(batch) == 1:
+            for request in batch:
+                request.future.set_result(res)
+            return
+        for request in batch:
+            try:
+                request.future.set_result(await request.send(device_id, request.states))
+            except Exception as err:  # noqa: BLE001
+                request.future.set_exception(err)
+
+    async def async_stop(self) -> None:
+        """Cancel any updates that have not been sent."""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for batch in self._batches.values():
+            for request in batch:
+                request.future.cancel()
+        self._batches.clear()
+
+
+class RequestPriority(IntEnum):
+    """Priority of a request waiting for a free slot. Lower runs first."""
+
+    COMMAND = 0
+    POLL = 1
+
+
+class CommandScheduler:
+    """Control the order and concurrency of requests to the Afero API.
+
+    Commands to the same device are sent one at a time, in the order they were
+    issued, so quick successive commands cannot race each other. Requests to
+    different devices run in parallel up to the concurrency cap, and when the
+    cap is reached, waiting commands are given the next free slot before any
+    waiting poll.
+    """
+
+    def __init__(self, max_concurrent: int) -> None:
+        """Initialize the scheduler.
+
+        :param max_concurrent: Maximum requests in-flight. 0 disables the cap
+        """
+        self.max_concurrent: int = max_concurrent
+        self.active: int = 0
+        self.queued: int = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        # device id -> (lock, number of commands holding or waiting on it)
+        self._devices: dict[str, tuple[asyncio.Lock, int]] = {}
+
+    @asynccontextmanager
+    async def async_device(self, device_id: str) -> AsyncIterator[None]:
+        """Wait for earlier commands to the device to finish."""
+        lock, users = self._devices.get(device_id, (asyncio.Lock(), 0))
+        self._devices[device_id] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._devices[device_id]
+            if users == 1:
+                self._devices.pop(device_id)
+            else:
+                self._devices[device_id] = (lock, users - 1)
+
+    @asynccontextmanager
+    async def async_slot(self, priority: RequestPriority) -> AsyncIterator[None]:
+        """Wait for a free slot under the concurrency cap."""
+        await self._async_acquire(priority)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _async_acquire(self, priority: RequestPriority) -> None:
+        """Take a slot, queueing by priority if none are free."""
+        if not self.max_concurrent or (
+            self.active < self.max_concurrent and not self._waiters
+        ):
+            self.active += 1
+            return
+        self.queued += 1
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # The slot may have been handed over just before the cancellation
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        """Hand the slot to the next waiter, or free it."""
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
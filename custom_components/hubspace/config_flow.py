@@ -12,6 +12,7 @@ from aioafero import InvalidAuth, InvalidOTP, OTPRequired
 from aioafero.v1 import AferoBridgeV1
 from aioafero.v1.v1_const import AFERO_CLIENTS
 from homeassistant.config_entries import (
+    SOURCE_REAUTH,
     ConfigEntry,
     ConfigFlow,
     ConfigFlowResult,
@@ -21,11 +22,32 @@ from homeassistant.const import CONF_PASSWORD, CONF_TIMEOUT, CONF_TOKEN, CONF_US
 from homeassistant.core import callback
 import voluptuous as vol
 
+from .accounts import get_account_id
 from .const import (
     CONF_CLIENT,
+    CONF_COALESCE_WRITES,
+    CONF_COMMAND_RATE_LIMIT,
+    CONF_COMMAND_WINDOW,
+    CONF_DEDICATED_SESSION,
+    CONF_MAX_CONCURRENT,
+    CONF_MIN_WRITE_INTERVAL,
+    CONF_OPTIMISTIC,
     CONF_OTP,
+    CONF_POLL_RATE_LIMIT,
+    CONF_POLLING_DECAY,
+    CONF_POLLING_MIN,
     DEFAULT_CLIENT,
+    DEFAULT_COALESCE_WRITES,
+    DEFAULT_COMMAND_RATE_LIMIT,
+    DEFAULT_COMMAND_WINDOW_MS,
+    DEFAULT_DEDICATED_SESSION,
+    DEFAULT_MAX_CONCURRENT,
+    DEFAULT_MIN_WRITE_INTERVAL_SEC,
+    DEFAULT_OPTIMISTIC,
+    DEFAULT_POLL_RATE_LIMIT,
+    DEFAULT_POLLING_DECAY_SEC,
     DEFAULT_POLLING_INTERVAL_SEC,
+    DEFAULT_POLLING_MIN_SEC,
     DEFAULT_TIMEOUT,
     DOMAIN,
     POLLING_TIME_STR,
@@ -121,8 +143,13 @@ class AferoConfigFlow(ConfigFlow, domain=DOMAIN):
 
     async def _async_create_entry(self) -> ConfigFlowResult:
         """Create the config entry."""
-        unique_id = self._username.lower()
-        existing_entry = await self.async_set_unique_id(unique_id)
+        unique_id = get_account_id(self._username, self._client).lower()
+        if self.source == SOURCE_REAUTH:
+            # Entries reauthenticated during a migration may not use the
+            # current unique ID yet
+            existing_entry = self._get_reauth_entry()
+        else:
+            existing_entry = await self.async_set_unique_id(unique_id)
         data = {
             CONF_USERNAME: self._username,
             CONF_PASSWORD: self._password,
@@ -133,14 +160,17 @@ class AferoConfigFlow(ConfigFlow, domain=DOMAIN):
             CONF_TIMEOUT: self._timeout or DEFAULT_TIMEOUT,
             POLLING_TIME_STR: self._polling or DEFAULT_POLLING_INTERVAL_SEC,
         }
+        if existing_entry and self.source == SOURCE_REAUTH:
+            return self.async_update_reload_and_abort(existing_entry, data=data)
         if existing_entry:
+            # Options that are not set when adding an account are kept
             return self.async_update_reload_and_abort(
-                existing_entry, data=data, options=options
+                existing_entry, data=data, options={**existing_entry.options, **options}
             )
         with suppress(Exception):
             await self._conn.close()
         return self.async_create_entry(
-            title=unique_id,
+            title=self._username.lower(),
             data=data,
             options=options,
         )
@@ -239,12 +269,54 @@ class AferoOptionsFlowHandler(OptionsFlow):
             POLLING_TIME_STR, DEFAULT_POLLING_INTERVAL_SEC
         )
         tmout = self.config_entry.options.get(CONF_TIMEOUT, DEFAULT_TIMEOUT)
+        poll_min = self.config_entry.options.get(
+            CONF_POLLING_MIN, DEFAULT_POLLING_MIN_SEC
+        )
+        poll_decay = self.config_entry.options.get(
+            CONF_POLLING_DECAY, DEFAULT_POLLING_DECAY_SEC
+        )
+        command_window = self.config_entry.options.get(
+            CONF_COMMAND_WINDOW, DEFAULT_COMMAND_WINDOW_MS
+        )
+        optimistic = self.config_entry.options.get(CONF_OPTIMISTIC, DEFAULT_OPTIMISTIC)
+        poll_rate = self.config_entry.options.get(
+            CONF_POLL_RATE_LIMIT, DEFAULT_POLL_RATE_LIMIT
+        )
+        command_rate = self.config_entry.options.get(
+            CONF_COMMAND_RATE_LIMIT, DEFAULT_COMMAND_RATE_LIMIT
+        )
+        max_concurrent = self.config_entry.options.get(
+            CONF_MAX_CONCURRENT, DEFAULT_MAX_CONCURRENT
+        )
+        dedicated_session = self.config_entry.options.get(
+            CONF_DEDICATED_SESSION, DEFAULT_DEDICATED_SESSION
+        )
+        coalesce_writes = self.config_entry.options.get(
+            CONF_COALESCE_WRITES, DEFAULT_COALESCE_WRITES
+        )
+        min_write_interval = self.config_entry.options.get(
+            CONF_MIN_WRITE_INTERVAL, DEFAULT_MIN_WRITE_INTERVAL_SEC
+        )
         return self.async_show_form(
             step_id="init",
             data_schema=vol.Schema(
                 {
                     vol.Optional(CONF_TIMEOUT, default=tmout): int,
                     vol.Optional(POLLING_TIME_STR, default=poll_time): int,
+                    vol.Optional(CONF_POLLING_MIN, default=poll_min): int,
+                    vol.Optional(CONF_POLLING_DECAY, default=poll_decay): int,
+                    vol.Optional(CONF_COMMAND_WINDOW, default=command_window): int,
+                    vol.Optional(CONF_OPTIMISTIC, default=optimistic): bool,
+                    vol.Optional(CONF_POLL_RATE_LIMIT, default=poll_rate): int,
+                    vol.Optional(CONF_COMMAND_RATE_LIMIT, default=command_rate): int,
+                    vol.Optional(CONF_MAX_CONCURRENT, default=max_concurrent): int,
+                    vol.Optional(
+                        CONF_DEDICATED_SESSION, default=dedicated_session
+                    ): bool,
+                    vol.Optional(CONF_COALESCE_WRITES, default=coalesce_writes): bool,
+                    vol.Optional(
+                        CONF_MIN_WRITE_INTERVAL, default=min_write_interval
+                    ): int,
                 },
             ),
             errors=errors,
@@ -260,4 +332,26 @@ def validate_options(user_input: dict[str, Any]) -> dict[str, str]:
     }
     if validated[POLLING_TIME_STR] < 2:
         raise ValueError("polling_too_short")
+    if CONF_POLLING_MIN in user_input:
+        validated[CONF_POLLING_MIN] = min(
+            user_input[CONF_POLLING_MIN] or DEFAULT_POLLING_MIN_SEC,
+            validated[POLLING_TIME_STR],
+        )
+        if validated[CONF_POLLING_MIN] < 2:
+            raise ValueError("polling_too_short")
+    if CONF_POLLING_DECAY in user_input:
+        validated[CONF_POLLING_DECAY] = max(user_input[CONF_POLLING_DECAY], 0)
+    if CONF_COMMAND_WINDOW in user_input:
+        validated[CONF_COMMAND_WINDOW] = max(user_input[CONF_COMMAND_WINDOW], 0)
+    if CONF_OPTIMISTIC in user_input:
+        validated[CONF_OPTIMISTIC] = bool(user_input[CONF_OPTIMISTIC])
+    if CONF_DEDICATED_SESSION in user_input:
+        validated[CONF_DEDICATED_SESSION] = bool(user_input[CONF_DEDICATED_SESSION])
+    if CONF_COALESCE_WRITES in user_input:
+        validated[CONF_COALESCE_WRITES] = bool(user_input[CONF_COALESCE_WRITES])
+    if CONF_MIN_WRITE_INTERVAL in user_input:
+        validated[CONF_MIN_WRITE_INTERVAL] = max(user_input[CONF_MIN_WRITE_INTERVAL], 0)
+    for limit in (CONF_POLL_RATE_LIMIT, CONF_COMMAND_RATE_LIMIT, CONF_MAX_CONCURRENT):
+        if limit in user_input:
+            validated[limit] = max(user_input[limit], 0)
     return validated
@@ -30,11 +30,61 @@ HUB_IDENTIFIER: Final[str] = "hubspace_debug"
 DEFAULT_TIMEOUT: Final[int] = 10000
 DEFAULT_POLLING_INTERVAL_SEC: Final[int] = 30
 POLLING_TIME_STR: Final[str] = "polling_time"
+CONF_POLLING_MIN: Final[str] = "polling_time_min"
+DEFAULT_POLLING_MIN_SEC: Final[int] = 5
+CONF_POLLING_DECAY: Final[str] = "polling_decay"
+DEFAULT_POLLING_DECAY_SEC: Final[int] = 60
+CONF_COMMAND_WINDOW: Final[str] = "command_window"
+DEFAULT_COMMAND_WINDOW_MS: Final[int] = 250
+COMMAND_BATCH_WINDOW_SEC: Final[float] = 0.05
+CONF_OPTIMISTIC: Final[str] = "optimistic"
+DEFAULT_OPTIMISTIC: Final[bool] = False
+OPTIMISTIC_TIMEOUT_SEC: Final[int] = 30
+CIRCUIT_FAILURE_THRESHOLD: Final[int] = 3
+CIRCUIT_MIN_BACKOFF_SEC: Final[int] = 15
+CIRCUIT_MAX_BACKOFF_SEC: Final[int] = 600
+SIGNAL_AVAILABILITY: Final[str] = f"{DOMAIN}_availability_{{}}"
+SIGNAL_HEALTH: Final[str] = f"{DOMAIN}_health_{{}}"
+HEALTH_WINDOW_SEC: Final[int] = 60
+# Rate limits are in requests per minute
+CONF_POLL_RATE_LIMIT: Final[str] = "poll_rate_limit"
+DEFAULT_POLL_RATE_LIMIT: Final[int] = 0
+POLL_RATE_BURST: Final[int] = 60
+CONF_COMMAND_RATE_LIMIT: Final[str] = "command_rate_limit"
+DEFAULT_COMMAND_RATE_LIMIT: Final[int] = 0
+COMMAND_RATE_BURST: Final[int] = 10
+COMMAND_RATE_MAX_WAIT_SEC: Final[int] = 10
+ACCOUNTS_DATA: Final[str] = f"{DOMAIN}_accounts"
+CONF_MAX_CONCURRENT: Final[str] = "max_concurrent_requests"
+DEFAULT_MAX_CONCURRENT: Final[int] = 8
+CONF_DEDICATED_SESSION: Final[str] = "dedicated_session"
+DEFAULT_DEDICATED_SESSION: Final[bool] = False
+# Connection pool settings for the separate session. Connections are kept alive
+# longer than the default polling interval so polls reuse them.
+SESSION_KEEPALIVE_SEC: Final[int] = 60
+SESSION_DNS_CACHE_SEC: Final[int] = 300
+CONF_COALESCE_WRITES: Final[str] = "coalesce_writes"
+DEFAULT_COALESCE_WRITES: Final[bool] = False
+CONF_MIN_WRITE_INTERVAL: Final[str] = "min_write_interval"
+DEFAULT_MIN_WRITE_INTERVAL_SEC: Final[int] = 0
+# Writes from a poll are collected for this long after the poll returns, then
+# written this many entities per loop iteration
+WRITE_FLUSH_DELAY_SEC: Final[float] = 0.5
+WRITE_BATCH_SIZE: Final[int] = 50
+SNAPSHOT_VERSION: Final[int] = 1
+SNAPSHOT_SAVE_DELAY_SEC: Final[int] = 30
+TOKEN_SAVE_DELAY_SEC: Final[int] = 60
+# Access tokens are refreshed this long before they expire, less up to the
+# jitter, so requests never wait for authentication
+TOKEN_REFRESH_MARGIN_SEC: Final[int] = 20
+TOKEN_REFRESH_JITTER_SEC: Final[int] = 10
+TOKEN_REFRESH_RETRY_SEC: Final[int] = 30
+LATENCY_SAMPLES: Final[int] = 500
 DEFAULT_CLIENT: Final[str] = "hubspace"
 CONF_CLIENT: Final[str] = "client"
 CONF_OTP: Final[str] = "otp_code"
 
-VERSION_MAJOR: Final[int] = 5
+VERSION_MAJOR: Final[int] = 6
 VERSION_MINOR: Final[int] = 0
 
 
@@ -53,6 +103,31 @@ PLATFORMS: Final[list[Platform]] = [
     Platform.ALARM_CONTROL_PANEL,
 ]
 
+# Platforms that are always set up, regardless of the devices on the account
+PLATFORMS_ALWAYS: Final[set[Platform]] = {Platform.BUTTON, Platform.SENSOR}
+
+# Platform for the main entity of each resource type
+RESOURCE_TYPE_PLATFORMS: Final[dict[str, Platform]] = {
+    "door-lock": Platform.LOCK,
+    "fan": Platform.FAN,
+    "landscape-transformer": Platform.SWITCH,
+    "light": Platform.LIGHT,
+    "portable-air-conditioner": Platform.CLIMATE,
+    "power-outlet": Platform.SWITCH,
+    "security-system": Platform.ALARM_CONTROL_PANEL,
+    "switch": Platform.SWITCH,
+    "thermostat": Platform.CLIMATE,
+    "water-timer": Platform.VALVE,
+}
+
+# Platform for the additional entities a resource can expose
+RESOURCE_FEATURE_PLATFORMS: Final[dict[str, Platform]] = {
+    "binary_sensors": Platform.BINARY_SENSOR,
+    "numbers": Platform.NUMBER,
+    "selects": Platform.SELECT,
+    "sensors": Platform.SENSOR,
+}
+
 
 ENTITY_BINARY_SENSOR: Final[str] = "binary_sensor"
 ENTITY_CLIMATE: Final[str] = "climate"
@@ -83,6 +158,31 @@ DEVICE_CLASS_TO_ENTITY_MAP: Final[dict[str, str]] = {
     DEVICE_CLASS_WATER_TIMER: ENTITY_VALVE,
 }
 
+POLLING_TIER_FAST: Final[str] = "fast"
+POLLING_TIER_SLOW: Final[str] = "slow"
+
+# Polling cadence of each tier as a multiple of the configured polling time.
+# Devices that are not part of a tier are polled on the configured polling time.
+POLLING_TIER_MULTIPLIERS: Final[dict[str, float]] = {
+    POLLING_TIER_FAST: 0.5,
+    POLLING_TIER_SLOW: 4,
+}
+
+DEVICE_CLASS_POLLING_TIERS: Final[dict[str, str]] = {
+    DEVICE_CLASS_FREEZER: POLLING_TIER_SLOW,
+    DEVICE_CLASS_DOOR_LOCK: POLLING_TIER_SLOW,
+    DEVICE_CLASS_LANDSCAPE_TRANSFORMER: POLLING_TIER_SLOW,
+}
+
+# Binary sensors that must stay fresh, regardless of the device class
+BINARY_SENSOR_POLLING_TIERS: Final[dict[str, str]] = {
+    "motion-detection|motion-detection": POLLING_TIER_FAST,
+    "humidity-threshold-met|humidity-threshold-met": POLLING_TIER_FAST,
+    "tampered|None": POLLING_TIER_FAST,
+    "tamper-detection|None": POLLING_TIER_FAST,
+    "triggered|None": POLLING_TIER_FAST,
+}
+
 UNMAPPED_DEVICE_CLASSES: Final[list[str]] = [
     # Parent device for a fan / light combo
     "ceiling-fan",
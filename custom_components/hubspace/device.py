@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 import contextlib
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from aioafero import EventType
+from aioafero.errors import DeviceNotFound
 from aioafero.v1 import AferoBridgeV1, DeviceController
+from aioafero.v1.controllers.event import AferoEvent
 from aioafero.v1.models import Device
 from homeassistant.const import CONF_USERNAME
 from homeassistant.core import callback
@@ -28,30 +30,23 @@ async def async_setup_devices(bridge: HubspaceBridge):
 
     @callback
     def add_device(hs_device: Device) -> dr.DeviceEntry:
-        """Register a Hubspace device in device registry."""
-        connections = []
-        if hs_device.device_information.wifi_mac:
-            connections.append(
-                (dr.CONNECTION_NETWORK_MAC, hs_device.device_information.wifi_mac)
-            )
-        if hs_device.device_information.ble_mac:
-            connections.append(
-                (dr.CONNECTION_BLUETOOTH, hs_device.device_information.ble_mac)
-            )
-        return dev_reg.async_get_or_create(
-            config_entry_id=entry.entry_id,
-            identifiers={(DOMAIN, hs_device.device_information.parent_id)},
-            name=hs_device.device_information.name,
-            model=hs_device.device_information.model
-            or hs_device.device_information.default_name,
-            manufacturer=hs_device.device_information.manufacturer,
-            connections=connections,
-            sw_version=hs_device.device_information.version_data.get(
-                "applicationVersionString"
-            )
-            if hs_device.device_information.version_data
-            else None,
+        """Register a Hubspace device, only writing to the registry on change."""
+        info = get_device_info(api, hs_device)
+        device = dev_reg.async_get_device(
+            identifiers={(DOMAIN, hs_device.device_information.parent_id)}
         )
+        if device is None:
+            return dev_reg.async_get_or_create(
+                config_entry_id=entry.entry_id,
+                identifiers={(DOMAIN, hs_device.device_information.parent_id)},
+                **info,
+            )
+        changes = get_device_changes(device, info)
+        if entry.entry_id not in device.config_entries:
+            changes["add_config_entry_id"] = entry.entry_id
+        if not changes:
+            return device
+        return dev_reg.async_update_device(device.id, **changes) or device
 
     @callback
     def remove_device(device_id: str) -> None:
@@ -66,26 +61,85 @@ async def async_setup_devices(bridge: HubspaceBridge):
         if evt_type == EventType.RESOURCE_DELETED:
             with contextlib.suppress(KeyError, AttributeError):
                 remove_device(hs_device.device_information.parent_id)
-        elif evt_type == EventType.RESOURCE_ADDED:
+        elif evt_type in (EventType.RESOURCE_ADDED, EventType.RESOURCE_UPDATED):
+            add_device(hs_device)
+
+    @callback
+    def handle_polled_devices(
+        evt_type: EventType, evt_data: AferoEvent | None = None
+    ) -> None:
+        """Bring the registry up to date after each discovery.
+
+        aioafero only emits an update when the state of a device changes, so
+        changes to the firmware alone are picked up here.
+        """
+        for hs_device in dev_controller:
             add_device(hs_device)
 
     # create/update all current devices found in controllers
-    known_devices = [add_device(hs_device) for hs_device in dev_controller]
+    known_devices = {add_device(hs_device).id for hs_device in dev_controller}
 
     # Create the hub device
     hub_device = dev_reg.async_get_or_create(
         config_entry_id=entry.entry_id,
-        identifiers={(DOMAIN, bridge.config_entry.data[CONF_USERNAME])},
+        identifiers={(DOMAIN, bridge.account_id)},
         name=f"Hubspace API - {bridge.config_entry.data[CONF_USERNAME]}",
-        model="cloud",
         manufacturer="Hubspace",
+        model="Cloud API",
     )
-    known_devices.append(hub_device)
+    known_devices.add(hub_device.id)
 
     # Check for nodes that no longer exist and remove them
     for device in dr.async_entries_for_config_entry(dev_reg, entry.entry_id):
-        if device not in known_devices:
+        if device.id not in known_devices:
             dev_reg.async_remove_device(device.id)
 
     # add listener for updates on Hubspace controllers
     entry.async_on_unload(dev_controller.subscribe(handle_device_event))
+    entry.async_on_unload(
+        api.events.subscribe(
+            handle_polled_devices, event_filter=EventType.POLLED_DEVICES
+        )
+    )
+
+
+def get_device_info(api: AferoBridgeV1, hs_device: Device) -> dict[str, Any]:
+    """Get the attributes of a Hubspace device for the device registry.
+
+    Firmware versions are refreshed by each discovery, so are read from the
+    latest data for the device rather than when the device was added.
+    """
+    info = hs_device.device_information
+    version_data = info.version_data
+    with contextlib.suppress(DeviceNotFound):
+        version_data = (
+            getattr(api.get_afero_device(hs_device.id), "version_data", None)
+            or version_data
+        )
+    connections: set[tuple[str, str]] = set()
+    if info.wifi_mac:
+        connections.add((dr.CONNECTION_NETWORK_MAC, info.wifi_mac))
+    if info.ble_mac:
+        connections.add((dr.CONNECTION_BLUETOOTH, info.ble_mac))
+    return {
+        "name": info.name,
+        "model": info.model or info.default_name,
+        "manufacturer": info.manufacturer,
+        "connections": connections,
+        "sw_version": version_data.get("applicationVersionString")
+        if version_data
+        else None,
+    }
+
+
+def get_device_changes(device: dr.DeviceEntry, info: dict[str, Any]) -> dict[str, Any]:
+    """Get the arguments needed to bring a registered device up to date."""
+    changes = {
+        name: value
+        for name, value in info.items()
+        if name != "connections" and getattr(device, name) != value
+    }
+    # Connections are merged, as when the device is created
+    if info["connections"] - device.connections:
+        changes["merge_connections"] = info["connections"]
+    return changes
@@ -0,0 +1,125 @@
+"""Diagnostics support for Hubspace."""
+
+from __future__ import annotations
+
+import copy
+from typing import Any
+
+from aioafero import AferoDevice, anonymize_devices
+from aioafero.errors import DeviceNotFound
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .bridge import HubspaceBridge
+from .const import DOMAIN
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    bridge: HubspaceBridge = hass.data[DOMAIN][entry.entry_id]
+    previous_modes, was_on = redact_device_ids(
+        bridge.night_light_previous_modes, bridge.night_light_was_on
+    )
+    return {
+        "options": dict(entry.options),
+        "startup": {
+            "phases": bridge.startup_phases,
+            "platforms": sorted(bridge.platforms),
+            "entities": bridge.get_entity_counts(),
+        },
+        "requests": {
+            "polls": bridge.poll_stats.as_dict(),
+            "commands": bridge.command_stats.as_dict(),
+            "unchanged_polls": bridge.polls_unchanged,
+            "coalesced": bridge.command_coalescer.coalesced,
+            "batched": bridge.command_batcher.batched,
+            "active": bridge.command_scheduler.active,
+            "queued": bridge.command_scheduler.queued,
+        },
+        "routing": {
+            "resources": bridge.router.resource_count,
+            "routed": bridge.router.routed,
+            "skipped": bridge.router.skipped,
+        },
+        "writes": {
+            "deferred": bridge.state_writer.deferred,
+            "written": bridge.state_writer.written,
+            "dirty": bridge.state_writer.dirty,
+        },
+        "rate_limits": {
+            "polls": get_limiter_diagnostics(bridge.poll_limiter),
+            "commands": get_limiter_diagnostics(bridge.command_limiter),
+        },
+        "accounts": {
+            "loaded": len(bridge.accounts.accounts),
+            "staggered": bridge.accounts.staggered,
+        },
+        "circuit": {
+            "state": bridge.circuit.state,
+            "failures": bridge.circuit.failures,
+            "rejected": bridge.circuit.rejected,
+        },
+        "controllers": {
+            type(controller).__name__: {
+                "resources": len(controller.items),
+                "subscriptions": sum(
+                    len(subscribers) for subscribers in controller.subscribers.values()
+                ),
+            }
+            for controller in bridge.api.controllers
+        },
+        "bridge": {
+            "stale": bridge.stale,
+            "tracked_devices": len(bridge.api.tracked_devices),
+            "night_light_previous_modes": previous_modes,
+            "night_light_was_on": was_on,
+        },
+        "devices": anonymize_devices(get_tracked_devices(bridge)),
+    }
+
+
+def get_limiter_diagnostics(limiter) -> dict[str, Any]:
+    """Get the counters of a rate limiter."""
+    return {
+        "enabled": limiter.enabled,
+        "sent": limiter.sent,
+        "delayed": limiter.delayed,
+        "throttled": limiter.throttled,
+        "delay_total": round(limiter.delay_total, 3),
+    }
+
+
+def redact_device_ids(*mappings: dict[str, Any]) -> list[dict[str, Any]]:
+    """Replace the device IDs used as keys with placeholders.
+
+    A device has the same placeholder in every mapping, so the values can
+    still be compared.
+    """
+    device_ids = sorted({device_id for mapping in mappings for device_id in mapping})
+    aliases = {
+        device_id: f"device-{index}" for index, device_id in enumerate(device_ids)
+    }
+    return [
+        {aliases[device_id]: value for device_id, value in mapping.items()}
+        for mapping in mappings
+    ]
+
+
+def get_tracked_devices(bridge: HubspaceBridge) -> list[AferoDevice]:
+    """Get a copy of every device polled from the API.
+
+    The devices are copied as anonymizing them rewrites their IDs.
+    """
+    devices: list[AferoDevice] = []
+    metadevice_ids = {
+        bridge.api.resolve_metadevice_id(device_id)
+        for device_id in bridge.api.tracked_devices
+    }
+    for device_id in sorted(metadevice_ids):
+        try:
+            devices.append(copy.deepcopy(bridge.api.get_afero_device(device_id)))
+        except DeviceNotFound:
+            continue
+    return devices
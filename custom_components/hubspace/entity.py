@@ -2,20 +2,56 @@
 
 from __future__ import annotations
 
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from functools import partial, wraps
+from typing import Any
+
 from aioafero.v1 import AferoController, AferoModelResource
 from aioafero.v1.controllers.event import EventType
 from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import Entity
 
 from .bridge import HubspaceBridge
 from .const import DOMAIN
+from .routing import Function
+
+
+def optimistic_property[T](func: Callable[[Any], T]) -> property:
+    """Property that reports the expected value while a command is pending."""
+
+    @wraps(func)
+    def _get(self: HubspaceBaseEntity) -> T:
+        expected = self.bridge.expectations.get(self.unique_id)
+        if expected and func.__name__ in expected.values:
+            return expected.values[func.__name__]
+        return func(self)
+
+    return property(_get)
+
+
+def derived_property[T](func: Callable[[Any], T]) -> property:
+    """Property that is computed once per update of the resource."""
+
+    @wraps(func)
+    def _get(self: HubspaceBaseEntity) -> T:
+        try:
+            return self._derived[func.__name__]
+        except KeyError:
+            value = self._derived[func.__name__] = func(self)
+            return value
+
+    return property(_get)
 
 
 class HubspaceBaseEntity(Entity):  # pylint: disable=hass-enforce-class-module
     """Generic Entity Class for a Hubspace resource."""
 
     _attr_should_poll = False
+    # Functions of the resource rendered by the entity. None for all.
+    functions: frozenset[Function] | None = None
 
     def __init__(
         self,
@@ -47,34 +83,164 @@ class HubspaceBaseEntity(Entity):  # pylint: disable=hass-enforce-class-module
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, self.resource.device_information.parent_id)},
         )
+        # Fingerprint of the state last written to Home Assistant, and of the
+        # state after the last update while it waits to be written
+        self._written_fingerprint: int | None = None
+        self._pending_fingerprint: int | None = None
+        self._state_written: bool = False
+        # Values of derived properties, until the resource is next updated
+        self._derived: dict[str, Any] = {}
 
     async def async_added_to_hass(self) -> None:
         """Call when an entity is added."""
         self.async_on_remove(
-            self.controller.subscribe(
-                self.handle_event,
-                id_filter=self.resource.id,
-                event_filter=EventType.RESOURCE_UPDATED,
+            self.bridge.router.subscribe(
+                self.controller, self.resource.id, self.functions, self.handle_event
             )
         )
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, self.bridge.availability_signal, self.async_write_ha_state
+            )
+        )
+        self.async_on_remove(partial(self.bridge.state_writer.discard, self))
 
     @property
     def available(self) -> bool:
         """Return entity availability."""
+        if not self.bridge.circuit.available:
+            return False
         # entities without a device attached should be always available
         if self.resource is None:
             return True
         return self.resource.available
 
+    @property
+    def assumed_state(self) -> bool:
+        """Return if the state is from the snapshot and not yet confirmed."""
+        return self.bridge.stale
+
     @callback
     def on_update(self) -> None:
         """Call on update event."""
         # a subclass can override this is required, but its probably
         # not needed
 
+    @asynccontextmanager
+    async def optimistic(self, **expected: Any) -> AsyncIterator[None]:
+        """Report the expected state while the wrapped command is sent.
+
+        Only applies when optimistic mode is enabled. The expectation is
+        dropped if the command fails, when Hubspace reports a different value,
+        or when it has not been confirmed before the timeout.
+
+        :param expected: Name of an optimistic property -> expected value
+        """
+        if not self.bridge.optimistic:
+            yield
+            return
+        pending = self.bridge.expectations.expect(
+            self.unique_id,
+            self.bridge.api.resolve_metadevice_id(self.resource.id),
+            expected,
+            self._expectation_expired,
+        )
+        self.async_write_ha_state()
+        try:
+            yield
+        except Exception:
+            self.bridge.expectations.clear(self.unique_id)
+            self.async_write_ha_state()
+            raise
+        pending.sent = True
+
+    @callback
+    def _expectation_expired(self) -> None:
+        """Revert to the reported state when an expectation is not confirmed."""
+        self.logger.warning(
+            "State for %s was not confirmed by Hubspace, reverting", self.entity_id
+        )
+        self.async_write_ha_state()
+
+    @callback
+    def _check_expected(self) -> None:
+        """Confirm or reject the pending expectation against reported state."""
+        expected = self.bridge.expectations.get(self.unique_id)
+        if not expected or not expected.sent:
+            return
+        for name, value in list(expected.values.items()):
+            actual = getattr(type(self), name).fget.__wrapped__(self)
+            if actual == value:
+                expected.values.pop(name)
+                continue
+            self.logger.warning(
+                "Expected %s of %s to be %s but Hubspace reported %s, reverting",
+                name,
+                self.entity_id,
+                value,
+                actual,
+            )
+            self.bridge.expectations.clear(self.unique_id)
+            return
+        if not expected.values:
+            self.bridge.expectations.clear(self.unique_id)
+
+    def get_state_fingerprint(self) -> int:
+        """Get a fingerprint of the state and attributes this entity reports."""
+        if not self.available:
+            return hash(False)
+        return hash(
+            repr(
+                (
+                    self.state,
+                    self.assumed_state,
+                    self.capability_attributes,
+                    self.state_attributes,
+                    self.extra_state_attributes,
+                )
+            )
+        )
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state to Home Assistant.
+
+        Only the first write is fingerprinted, so unchanged entities are not
+        written by the first update after setup. Later writes that are not
+        started by an update clear the fingerprint, so the next update is
+        always written.
+        """
+        self._pending_fingerprint = None
+        self._written_fingerprint = (
+            None if self._state_written else self.get_state_fingerprint()
+        )
+        self._state_written = True
+        super().async_write_ha_state()
+
+    @callback
+    def async_write_changed_state(self) -> None:
+        """Write the state if it differs from the state last written.
+
+        The fingerprint computed when the update was handled is reused, as
+        nothing has changed the state since without clearing it.
+        """
+        fingerprint = self._pending_fingerprint
+        self._pending_fingerprint = None
+        if fingerprint is None:
+            fingerprint = self.get_state_fingerprint()
+        if fingerprint != self._written_fingerprint:
+            self._written_fingerprint = fingerprint
+            super().async_write_ha_state()
+
     @callback
     def handle_event(self, event_type: EventType, resource) -> None:
         """Handle status event for this resource (or it's parent)."""
         self.logger.debug("Received status update for %s", self.entity_id)
+        self._derived.clear()
         self.on_update()
-        self.async_write_ha_state()
+        self._check_expected()
+        # Other entities on the device may have changed rather than this one
+        self._pending_fingerprint = self.get_state_fingerprint()
+        if self._pending_fingerprint == self._written_fingerprint:
+            return
+        self.bridge.state_writer.async_write(self)
@@ -0,0 +1,95 @@
+"""Create the entities for the features a resource exposes."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from dataclasses import fields
+
+from aioafero.v1 import AferoController, AferoModelResource
+from homeassistant.core import callback
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import RESOURCE_FEATURE_PLATFORMS
+
+EntityBuilder = Callable[[AferoController, AferoModelResource], list[Entity]]
+
+
+def controller_has_feature(controller: AferoController, feature: str) -> bool:
+    """Determine if the resources of a controller can expose the feature."""
+    if feature == "sensors":
+        return bool(controller.ITEM_SENSORS)
+    if feature == "binary_sensors":
+        return bool(controller.ITEM_BINARY_SENSORS)
+    return feature in {field.name for field in fields(controller.ITEM_CLS)}
+
+
+class EntityFactory:
+    """Create the entities for features such as sensors and numbers.
+
+    The controllers that can expose each feature are indexed once. Each
+    platform registers how to build its entities, and receives every entity
+    for the current resources in a single batch. Resources added later are
+    passed in by the bridge, so platforms do not need to subscribe to every
+    controller themselves.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the factory."""
+        # feature -> controllers whose resources can expose it
+        self.index: dict[str, list[AferoController]] = {}
+        # feature -> platform callbacks
+        self._platforms: dict[str, tuple[EntityBuilder, AddEntitiesCallback]] = {}
+
+    @callback
+    def async_index(self, controllers: Iterable[AferoController]) -> None:
+        """Index the controllers that can expose each feature."""
+        controllers = list(controllers)
+        self.index = {
+            feature: [
+                controller
+                for controller in controllers
+                if controller_has_feature(controller, feature)
+            ]
+            for feature in RESOURCE_FEATURE_PLATFORMS
+        }
+
+    @callback
+    def async_register(
+        self,
+        feature: str,
+        builder: EntityBuilder,
+        async_add_entities: AddEntitiesCallback,
+    ) -> Callable[[], None]:
+        """Add the entities for a feature, now and as resources are added.
+
+        :param feature: Resource feature, such as sensors
+        :param builder: Creates the entities for a resource
+        :param async_add_entities: Adds entities to the platform
+        :return: Function to stop adding entities
+        """
+        self._platforms[feature] = (builder, async_add_entities)
+        entities = [
+            entity
+            for controller in self.index.get(feature, [])
+            for resource in controller
+            for entity in builder(controller, resource)
+        ]
+        if entities:
+            async_add_entities(entities)
+
+        def unregister() -> None:
+            self._platforms.pop(feature, None)
+
+        return unregister
+
+    @callback
+    def async_resource_added(
+        self, controller: AferoController, resource: AferoModelResource
+    ) -> None:
+        """Add the entities for a new resource to each registered platform."""
+        for feature, (builder, async_add_entities) in list(self._platforms.items()):
+            if controller not in self.index.get(feature, []):
+                continue
+            if entities := builder(controller, resource):
+                async_add_entities(entities)
@@ -4,6 +4,10 @@ from functools import partial
 from typing import Any
 
 from aioafero import EventType
+from aioafero.util import (
+    ordered_list_item_to_percentage,
+    percentage_to_ordered_list_item,
+)
 from aioafero.v1 import AferoBridgeV1, FanController
 from aioafero.v1.models import Fan
 from homeassistant.components.fan import FanEntity, FanEntityFeature
@@ -13,7 +17,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .bridge import HubspaceBridge
 from .const import DOMAIN
-from .entity import HubspaceBaseEntity
+from .entity import HubspaceBaseEntity, optimistic_property
 
 PRESET_HS_TO_HA = {"comfort-breeze": "breeze"}
 
@@ -46,7 +50,7 @@ class HubspaceFan(HubspaceBaseEntity, FanEntity):
         """Get all supported fan features."""
         return self._supported_features
 
-    @property
+    @optimistic_property
     def is_on(self) -> bool | None:
         """Return true if fan is spinning."""
         return (
@@ -55,12 +59,12 @@ class HubspaceFan(HubspaceBaseEntity, FanEntity):
             else None
         )
 
-    @property
+    @optimistic_property
     def current_direction(self) -> str:
         """Returns the current direction of the fan."""
         return "forward" if self.resource.current_direction else "reverse"
 
-    @property
+    @optimistic_property
     def percentage(self) -> int | None:
         """Current percentage of spinning."""
         return (
@@ -69,7 +73,7 @@ class HubspaceFan(HubspaceBaseEntity, FanEntity):
             else None
         )
 
-    @property
+    @optimistic_property
     def preset_mode(self) -> str | None:
         """Current preset for the fan."""
         return (
@@ -106,50 +110,70 @@ class HubspaceFan(HubspaceBaseEntity, FanEntity):
         **kwargs: Any,
     ) -> None:
         """Turn on the entity."""
-        await self.bridge.async_request_call(
-            self.controller.set_state,
-            device_id=self.resource.id,
-            on=True,
-            speed=percentage,
-            preset=bool(preset_mode),
-        )
+        expected = {"is_on": True, "preset_mode": preset_mode or None}
+        if percentage:
+            expected["percentage"] = self._expected_percentage(percentage)
+        async with self.optimistic(**expected):
+            await self.bridge.async_request_call(
+                self.controller.set_state,
+                device_id=self.resource.id,
+                on=True,
+                speed=percentage,
+                preset=bool(preset_mode),
+            )
 
     async def async_turn_off(
         self,
         **kwargs: Any,
     ) -> None:
         """Turn off the fan."""
-        await self.bridge.async_request_call(
-            self.controller.set_state,
-            device_id=self.resource.id,
-            on=False,
-        )
+        async with self.optimistic(is_on=False):
+            await self.bridge.async_request_call(
+                self.controller.set_state,
+                device_id=self.resource.id,
+                on=False,
+            )
 
     async def async_set_percentage(self, percentage: int) -> None:
         """Set the speed percentage of the fan."""
-        await self.bridge.async_request_call(
-            self.controller.set_state,
-            device_id=self.resource.id,
-            on=True,
-            speed=percentage,
-        )
+        expected = {"is_on": bool(percentage)}
+        if percentage:
+            expected["percentage"] = self._expected_percentage(percentage)
+        async with self.optimistic(**expected):
+            await self.bridge.async_request_call(
+                self.controller.set_state,
+                device_id=self.resource.id,
+                on=True,
+                speed=percentage,
+            )
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set the preset mode of the fan."""
-        await self.bridge.async_request_call(
-            self.controller.set_state,
-            device_id=self.resource.id,
-            on=True,
-            preset=bool(preset_mode),
-        )
+        async with self.optimistic(is_on=True, preset_mode=preset_mode or None):
+            await self.bridge.async_request_call(
+                self.controller.set_state,
+                device_id=self.resource.id,
+                on=True,
+                preset=bool(preset_mode),
+            )
 
     async def async_set_direction(self, direction: str) -> None:
         """Set the direction of the fan."""
-        await self.bridge.async_request_call(
-            self.controller.set_state,
-            device_id=self.resource.id,
-            on=True,
-            forward=direction == "forward",
+        async with self.optimistic(is_on=True, current_direction=direction):
+            await self.bridge.async_request_call(
+                self.controller.set_state,
+                device_id=self.resource.id,
+                on=True,
+                forward=direction == "forward",
+            )
+
+    def _expected_percentage(self, percentage: int) -> int | None:
+        """Percentage reported once the fan has snapped to the nearest speed."""
+        if not self.supported_features & FanEntityFeature.SET_SPEED:
+            return None
+        speeds = self.resource.speed.speeds
+        return ordered_list_item_to_percentage(
+            speeds, percentage_to_ordered_list_item(speeds, percentage)
         )
 
 
@@ -23,7 +23,7 @@ from homeassistant.util.color import brightness_to_value, value_to_brightness
 
 from .bridge import HubspaceBridge
 from .const import DOMAIN
-from .entity import HubspaceBaseEntity
+from .entity import HubspaceBaseEntity, derived_property, optimistic_property
 
 NIGHT_LIGHT_MODE = "night-light"
 
@@ -72,6 +72,17 @@ class HubspaceLight(HubspaceBaseEntity, LightEntity):
         self._attr_supported_color_modes = filter_supported_color_modes(
             supported_color_modes
         )
+        # Capabilities of the light do not change, so are only computed once
+        self._attr_effect_list = self._get_effect_list()
+        self._attr_min_color_temp_kelvin = None
+        self._attr_max_color_temp_kelvin = None
+        if self._supports_color_temp() and self.resource.color_temperature:
+            self._attr_min_color_temp_kelvin = min(
+                self.resource.color_temperature.supported
+            )
+            self._attr_max_color_temp_kelvin = max(
+                self.resource.color_temperature.supported
+            )
 
     def _supports_rgb(self) -> bool:
         if self._channel == "white":
@@ -83,7 +94,16 @@ class HubspaceLight(HubspaceBaseEntity, LightEntity):
             return False
         return self.resource.supports_color_temperature
 
-    @property
+    def _get_effect_list(self) -> list[str] | None:
+        """Get all available effects for the light."""
+        if self._channel == "white" or not self.resource.effect:
+            return None
+        all_effects = []
+        for effects in self.resource.effect.effects.values() or []:
+            all_effects.extend(effects)
+        return all_effects or None
+
+    @optimistic_property
     def brightness(self) -> int | None:
         """The brightness of this light between 1..255."""
         pct = displayed_brightness_pct(self.resource, channel=self._channel)
@@ -91,7 +111,7 @@ class HubspaceLight(HubspaceBaseEntity, LightEntity):
             return None
         return value_to_brightness((1, 100), pct)
 
-    @property
+    @derived_property
     def extra_state_attributes(self) -> dict[str, int | str]:
         """Expose dual-channel brightness and API mode for automations."""
         attrs: dict[str, int | str] = {}
@@ -128,17 +148,7 @@ class HubspaceLight(HubspaceBaseEntity, LightEntity):
             else None
         )
 
-    @property
-    def effect_list(self) -> list[str] | None:
-        """Get all available effects for the light."""
-        if self._channel == "white" or not self.resource.effect:
-            return None
-        all_effects = []
-        for effects in self.resource.effect.effects.values() or []:
-            all_effects.extend(effects)
-        return all_effects or None
-
-    @property
+    @optimistic_property
     def is_on(self) -> bool | None:
         """Determine if the light is currently on.
 
@@ -156,20 +166,6 @@ class HubspaceLight(HubspaceBaseEntity, LightEntity):
                 return channel_on
         return self.resource.is_on
 
-    @property
-    def max_color_temp_kelvin(self) -> int | None:
-        """Get the lights maximum temperature color."""
-        if not self._supports_color_temp() or not self.resource.color_temperature:
-            return None
-        return max(self.resource.color_temperature.supported)
-
-    @property
-    def min_color_temp_kelvin(self) -> int | None:
-        """Get the lights minimum temperature color."""
-        if not self._supports_color_temp() or not self.resource.color_temperature:
-            return None
-        return min(self.resource.color_temperature.supported)
-
     @property
     def rgb_color(self) -> tuple[int, int, int] | None:
         """Get the lights current RGB colors."""
@@ -238,39 +234,45 @@ class HubspaceLight(HubspaceBaseEntity, LightEntity):
             color_mode = self.bridge.night_light_previous_modes.get(
                 self.resource.id, "white"
             )
-        # aioafero only mode-before-powers for no-brightness *targets*; restoring
-        # to white/color/sequence while off needs an explicit mode PUT first.
-        if (
-            leaving_night_light
-            and not self.resource.is_on
-            and color_mode
-            and color_mode != NIGHT_LIGHT_MODE
-        ):
+        expected = {"is_on": True}
+        if brightness is not None:
+            expected["brightness"] = value_to_brightness((1, 100), brightness)
+        async with self.optimistic(**expected):
+            # aioafero only mode-before-powers for no-brightness *targets*;
+            # restoring to white/color/sequence while off needs an explicit mode
+            # PUT first.
+            if (
+                leaving_night_light
+                and not self.resource.is_on
+                and color_mode
+                and color_mode != NIGHT_LIGHT_MODE
+            ):
+                await self.bridge.async_request_call(
+                    self.controller.set_state,
+                    device_id=self.resource.id,
+                    color_mode=color_mode,
+                )
             await self.bridge.async_request_call(
                 self.controller.set_state,
                 device_id=self.resource.id,
+                on=True,
+                brightness=brightness,
+                temperature=temperature,
+                color=color,
                 color_mode=color_mode,
+                effect=effect,
+                channel=self._channel,
             )
-        await self.bridge.async_request_call(
-            self.controller.set_state,
-            device_id=self.resource.id,
-            on=True,
-            brightness=brightness,
-            temperature=temperature,
-            color=color,
-            color_mode=color_mode,
-            effect=effect,
-            channel=self._channel,
-        )
 
     async def async_turn_off(self, **kwargs) -> None:
         """Turn device off."""
-        await self.bridge.async_request_call(
-            self.controller.set_state,
-            device_id=self.resource.id,
-            on=False,
-            channel=self._channel,
-        )
+        async with self.optimistic(is_on=False):
+            await self.bridge.async_request_call(
+                self.controller.set_state,
+                device_id=self.resource.id,
+                on=False,
+                channel=self._channel,
+            )
 
 
 class HubspaceNightLight(HubspaceBaseEntity, LightEntity):
@@ -0,0 +1,141 @@
+"""Track how long requests to the Afero API take."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+import math
+import time
+from typing import Any
+
+PERCENTILES: tuple[int, ...] = (50, 90, 99)
+
+
+@dataclass(frozen=True, slots=True)
+class RequestSample:
+    """Outcome of a single request."""
+
+    completed: float
+    latency: float
+    error: bool
+
+
+@dataclass(slots=True)
+class Measurement:
+    """Outcome of a request that is being measured."""
+
+    failed: bool = False
+
+
+class LatencyStats:
+    """Latency of the most recent requests of a single kind.
+
+    Samples are kept in a fixed-size ring buffer so memory use is constant,
+    and the percentiles reflect the current behavior of the API rather than
+    the entire uptime. Rates are counted separately for each second, so they
+    are not capped by the number of samples.
+    """
+
+    def __init__(
+        self,
+        max_samples: int,
+        window: float = 60,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the stats.
+
+        :param max_samples: Number of recent requests to keep
+        :param window: Longest window, in seconds, that rates are reported for
+        :param clock: Source of time, in seconds
+        """
+        self._samples: deque[RequestSample] = deque(maxlen=max_samples)
+        self._window = window
+        # [second, requests, errors] for each second with completed requests
+        self._counts: deque[list[int]] = deque()
+        self._clock = clock
+        self.requests: int = 0
+        self.errors: int = 0
+        self.in_flight: int = 0
+
+    def record(self, latency: float, error: bool = False) -> None:
+        """Record the latency of a completed request.
+
+        :param latency: Time taken by the request, in seconds
+        :param error: If the request failed
+        """
+        now = self._clock()
+        self._samples.append(RequestSample(now, latency, error))
+        self.requests += 1
+        if error:
+            self.errors += 1
+        second = int(now)
+        if not self._counts or self._counts[-1][0] != second:
+            self._counts.append([second, 0, 0])
+        self._counts[-1][1] += 1
+        self._counts[-1][2] += error
+        while self._counts[0][0] < now - self._window:
+            self._counts.popleft()
+
+    @contextmanager
+    def measure(self) -> Iterator[Measurement]:
+        """Record the time taken by the wrapped request.
+
+        Requests that raise are failures. Requests that fail without raising
+        can set ``failed`` on the yielded measurement.
+        """
+        start = self._clock()
+        measurement = Measurement()
+        self.in_flight += 1
+        try:
+            yield measurement
+        except BaseException:
+            measurement.failed = True
+            raise
+        finally:
+            self.in_flight -= 1
+            self.record(self._clock() - start, measurement.failed)
+
+    def percentile(self, percent: float) -> float | None:
+        """Get the latency, in seconds, that the given percent of requests beat."""
+        if not self._samples:
+            return None
+        ordered = sorted(sample.latency for sample in self._samples)
+        rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+        return ordered[rank - 1]
+
+    def count(self, window: float) -> tuple[int, int]:
+        """Get the requests and errors completed within the last window seconds."""
+        since = self._clock() - window
+        recent = [counts for counts in self._counts if counts[0] >= since]
+        return sum(counts[1] for counts in recent), sum(counts[2] for counts in recent)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Summarize the stats, with latencies in milliseconds."""
+        latency_ms: dict[str, float | None] = {}
+        for percent in PERCENTILES:
+            latency = self.percentile(percent)
+            latency_ms[f"p{percent}"] = (
+                None if latency is None else round(latency * 1000, 1)
+            )
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "samples": len(self._samples),
+            "latency_ms": latency_ms,
+        }
+
+
+def get_request_rate(stats: list[LatencyStats], window: float) -> int:
+    """Get the number of requests completed within the last window seconds."""
+    return sum(stat.count(window)[0] for stat in stats)
+
+
+def get_error_rate(stats: list[LatencyStats], window: float) -> float | None:
+    """Get the percent of requests within the last window seconds that failed."""
+    counts = [stat.count(window) for stat in stats]
+    requests = sum(requests for requests, _ in counts)
+    if not requests:
+        return None
+    return round(sum(errors for _, errors in counts) / requests * 100, 1)
@@ -1,12 +1,11 @@
 """Home Assistant entity for interacting with Afero Number."""
 
-from dataclasses import fields
+from functools import partial
 
 from aioafero.v1 import AferoController, AferoModelResource
-from aioafero.v1.controllers.event import EventType
 from homeassistant.components.number import NumberEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .bridge import HubspaceBridge
@@ -27,6 +26,7 @@ class AferoNumberEntity(HubspaceBaseEntity, NumberEntity):
         """Initialize an Afero Number."""
         super().__init__(bridge, controller, resource, instance=str(identifier))
         self._identifier: tuple[str, str] = identifier
+        self.functions = frozenset({identifier})
         self._attr_name = resource.numbers[identifier].name
 
     @property
@@ -72,52 +72,18 @@ async def async_setup_entry(
 ) -> None:
     """Set up entities."""
     bridge: HubspaceBridge = hass.data[DOMAIN][config_entry.entry_id]
-
-    # add all current items in controller
-    entities = []
-    for controller in bridge.api.controllers:
-        if "numbers" not in [x.name for x in fields(controller.ITEM_CLS)]:
-            continue
-        # Listen for new devices
-        config_entry.async_on_unload(
-            controller.subscribe(
-                await generate_callback(bridge, controller, async_add_entities),
-                event_filter=EventType.RESOURCE_ADDED,
-            )
-        )
-        # Add any currently tracked entities
-        entities.extend(
-            [
-                AferoNumberEntity(bridge, controller, resource, number)
-                for resource in controller
-                for number in resource.numbers
-            ]
+    config_entry.async_on_unload(
+        bridge.entity_factory.async_register(
+            "numbers", partial(get_numbers, bridge), async_add_entities
         )
-    async_add_entities(entities)
-
-
-async def generate_callback(bridge, controller, async_add_entities: callback):
-    """Generate a callback function for handling new number entities.
-
-    Args:
-        bridge: HubspaceBridge instance for managing device communication
-        controller: AferoController instance managing the device
-        async_add_entities: Callback function to register new entities
+    )
 
-    Returns:
-        Callback function that adds new number entities when resources are added
-
-    """
-
-    async def add_entity_controller(
-        event_type: EventType, resource: AferoModelResource
-    ) -> None:
-        """Add an entity."""
-        async_add_entities(
-            [
-                AferoNumberEntity(bridge, controller, resource, number)
-                for number in resource.numbers
-            ]
-        )
 
-    return add_entity_controller
+def get_numbers(
+    bridge: HubspaceBridge, controller: AferoController, resource: AferoModelResource
+) -> list[AferoNumberEntity]:
+    """Get all numbers for a given resource."""
+    return [
+        AferoNumberEntity(bridge, controller, resource, number)
+        for number in resource.numbers
+    ]
@@ -0,0 +1,94 @@
+"""Track states that entities expect after sending a command."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+
+@dataclass
+class ExpectedState:
+    """Values an entity expects Hubspace to report."""
+
+    device_id: str
+    values: dict[str, Any]
+    cancel: CALLBACK_TYPE
+    # Set once the command has been accepted. Updates received while the
+    # command is in-flight may predate it and are not treated as contradicting.
+    sent: bool = False
+
+
+class ExpectationTracker:
+    """Pending expectations for entities in optimistic mode."""
+
+    def __init__(self, hass: HomeAssistant, timeout: float) -> None:
+        """Initialize the tracker.
+
+        :param hass: Home Assistant instance
+        :param timeout: Seconds to wait for Hubspace to confirm an expectation
+        """
+        self.hass = hass
+        self.timeout: float = timeout
+        self._expected: dict[str, ExpectedState] = {}
+
+    def __len__(self) -> int:
+        """Get the number of pending expectations."""
+        return len(self._expected)
+
+    @property
+    def pending_devices(self) -> set[str]:
+        """Metadevices with an expectation waiting on a poll."""
+        return {
+            expected.device_id for expected in self._expected.values() if expected.sent
+        }
+
+    def get(self, unique_id: str) -> ExpectedState | None:
+        """Get the pending expectation for the entity."""
+        return self._expected.get(unique_id)
+
+    @callback
+    def expect(
+        self,
+        unique_id: str,
+        device_id: str,
+        values: dict[str, Any],
+        on_expire: Callable[[], None],
+    ) -> ExpectedState:
+        """Track the expected values for the entity, replacing any pending.
+
+        :param unique_id: Unique ID of the entity
+        :param device_id: Metadevice ID that reports the entity state
+        :param values: Entity property name -> expected value
+        :param on_expire: Called if the expectation is not confirmed in time
+        """
+        self.clear(unique_id)
+
+        @callback
+        def _expire(_now) -> None:
+            if self._expected.get(unique_id) is expected:
+                self._expected.pop(unique_id)
+                on_expire()
+
+        expected = ExpectedState(
+            device_id=device_id,
+            values=dict(values),
+            cancel=async_call_later(self.hass, self.timeout, _expire),
+        )
+        self._expected[unique_id] = expected
+        return expected
+
+    @callback
+    def clear(self, unique_id: str) -> None:
+        """Stop tracking the expectation for the entity."""
+        if expected := self._expected.pop(unique_id, None):
+            expected.cancel()
+
+    @callback
+    def stop(self) -> None:
+        """Stop tracking all expectations."""
+        for unique_id in list(self._expected):
+            self.clear(unique_id)
@@ -0,0 +1,145 @@
+"""Decide which Afero devices are due for a state poll."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+import time
+
+from aioafero import AferoDevice, AferoState
+
+from .const import (
+    BINARY_SENSOR_POLLING_TIERS,
+    DEVICE_CLASS_POLLING_TIERS,
+    POLLING_TIER_FAST,
+)
+
+
+@dataclass
+class BoostedDevice:
+    """Polling state for a device that recently received a command."""
+
+    commanded: float
+    interval: float
+    polled: float
+
+
+class PollScheduler:
+    """Adaptive polling scheduler.
+
+    aioafero polls on a short, fixed tick and the scheduler decides which
+    devices are actually queried. Devices are grouped into tiers that are
+    polled on their own interval, and devices without a tier are polled on the
+    idle interval. A device that received a command is polled on the short
+    interval for the length of the decay window, after which its interval
+    doubles on every poll until it is back on the idle interval.
+    """
+
+    def __init__(
+        self,
+        min_interval: int,
+        max_interval: int,
+        decay: int,
+        tier_intervals: Mapping[str, int] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the scheduler."""
+        self.max_interval: int = max_interval
+        self.min_interval: int = min(min_interval, max_interval)
+        self.decay: int = decay
+        self.tier_intervals: dict[str, int] = dict(tier_intervals or {})
+        self._clock = clock
+        # Discovery performs the initial fetch so the first poll of each tier
+        # is a full interval away.
+        self._started: float = clock()
+        self._tier_polled: dict[str | None, float] = {}
+        self._boosted: dict[str, BoostedDevice] = {}
+
+    @property
+    def tick(self) -> int:
+        """Seconds between checks for due devices."""
+        return min([self.min_interval, *self.tier_intervals.values()])
+
+    @property
+    def boosted_devices(self) -> set[str]:
+        """Devices currently polled faster than the idle interval."""
+        return set(self._boosted)
+
+    def command_sent(self, device_id: str) -> None:
+        """Poll the device on the short interval for the decay window."""
+        now = self._clock()
+        self._boosted[device_id] = BoostedDevice(
+            commanded=now, interval=self.min_interval, polled=now
+        )
+
+    def due_devices(
+        self,
+        device_ids: Iterable[str],
+        tiers: Mapping[str, str | None] | None = None,
+    ) -> set[str]:
+        """Return the devices that should be polled now and record the poll.
+
+        :param device_ids: All metadevice IDs that are currently tracked
+        :param tiers: Polling tier for each device. Devices without a tier are
+            polled on the idle interval.
+        """
+        now = self._clock()
+        tiers = tiers or {}
+        device_ids = set(device_ids)
+        due_tiers: set[str | None] = set()
+        for tier in {tiers.get(device_id) for device_id in device_ids}:
+            interval = self.tier_intervals.get(tier, self.max_interval)
+            if now - self._tier_polled.get(tier, self._started) >= interval:
+                self._tier_polled[tier] = now
+                due_tiers.add(tier)
+        due = {
+            device_id for device_id in device_ids if tiers.get(device_id) in due_tiers
+        }
+        due |= {
+            device_id
+            for device_id, boost in self._boosted.items()
+            if device_id in device_ids and now - boost.polled >= boost.interval
+        }
+        for device_id in due & self._boosted.keys():
+            self._decay(device_id, now)
+        return due
+
+    def _decay(self, device_id: str, now: float) -> None:
+        """Record a poll for a boosted device and relax its interval."""
+        boost = self._boosted[device_id]
+        boost.polled = now
+        if now - boost.commanded < self.decay:
+            return
+        boost.interval *= 2
+        if boost.interval >= self.max_interval:
+            self._boosted.pop(device_id)
+
+
+def get_poll_tier(device: AferoDevice) -> str | None:
+    """Determine the polling tier for the device.
+
+    Binary sensors that must stay fresh take priority over the device class.
+    """
+    tiers = {
+        BINARY_SENSOR_POLLING_TIERS.get(
+            f"{state.functionClass}|{state.functionInstance}"
+        )
+        for state in device.states
+    }
+    if POLLING_TIER_FAST in tiers:
+        return POLLING_TIER_FAST
+    return DEVICE_CLASS_POLLING_TIERS.get(device.device_class)
+
+
+def get_states_fingerprint(states: Iterable[AferoState]) -> int:
+    """Get a compact fingerprint of the values reported for a device.
+
+    The update time is ignored, so a poll that only reports the same values
+    again has the same fingerprint.
+    """
+    return hash(
+        frozenset(
+            (state.functionClass, state.functionInstance, repr(state.value))
+            for state in states
+        )
+    )
@@ -0,0 +1,215 @@
+"""Protect the Afero API from requests it is unable to serve."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from enum import StrEnum
+import logging
+import random
+import time
+
+from aioafero.errors import ExceededMaximumRetries
+import aiohttp
+
+_LOGGER = logging.getLogger(__name__)
+
+# Errors that indicate the Afero API is unreachable or overloaded rather than
+# a problem with the request itself
+OUTAGE_ERRORS: tuple[type[Exception], ...] = (
+    aiohttp.ClientError,
+    ExceededMaximumRetries,
+    TimeoutError,
+)
+
+
+class RateLimitExceeded(Exception):
+    """Request was not sent as it would exceed the rate limit."""
+
+
+class CircuitState(StrEnum):
+    """State of the circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Circuit breaker shared by polling and commands.
+
+    The circuit opens after a number of consecutive failures and rejects all
+    requests until the backoff has elapsed. A single probe request is then
+    allowed through: if it succeeds the circuit closes, otherwise it re-opens
+    with double the backoff. Jitter is applied so multiple accounts do not
+    retry in lockstep.
+    """
+
+    def __init__(
+        self,
+        threshold: int,
+        min_backoff: float,
+        max_backoff: float,
+        on_change: Callable[[CircuitState], None] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the circuit breaker.
+
+        :param threshold: Consecutive failures before the circuit opens
+        :param min_backoff: Seconds to wait after the circuit first opens
+        :param max_backoff: Maximum seconds to wait between probes
+        :param on_change: Called whenever the state changes
+        :param clock: Monotonic clock
+        """
+        self.threshold: int = threshold
+        self.min_backoff: float = min_backoff
+        self.max_backoff: float = max_backoff
+        self._on_change = on_change
+        self._clock = clock
+        self.state: CircuitState = CircuitState.CLOSED
+        self.failures: int = 0
+        self.rejected: int = 0
+        self._opened: int = 0
+        self._retry_at: float = 0
+
+    @property
+    def available(self) -> bool:
+        """Determine if the API is considered reachable."""
+        return self.state == CircuitState.CLOSED
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until the next probe is allowed."""
+        if self.state == CircuitState.CLOSED:
+            return 0
+        return max(self._retry_at - self._clock(), 0)
+
+    def allow(self) -> bool:
+        """Determine if a request can be sent.
+
+        When the backoff has elapsed the caller that receives ``True`` is the
+        probe, and all other requests are rejected until it completes.
+        """
+        if self.state == CircuitState.CLOSED:
+            return True
+        if self._clock() >= self._retry_at:
+            # Allow another probe if the previous one never reported back
+            self._retry_at = self._clock() + self.min_backoff
+            if self.state == CircuitState.OPEN:
+                self._set_state(CircuitState.HALF_OPEN)
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        self.failures = 0
+        self._opened = 0
+        if self.state != CircuitState.CLOSED:
+            _LOGGER.info("Connection to the Hubspace API has been restored")
+            self._set_state(CircuitState.CLOSED)
+
+    def record_failure(self) -> None:
+        """Track a failed request and open the circuit if required."""
+        self.failures += 1
+        if self.state == CircuitState.HALF_OPEN or (
+            self.state == CircuitState.CLOSED and self.failures >= self.threshold
+        ):
+            self._open()
+
+    def _open(self) -> None:
+        """Reject requests until the backoff has elapsed."""
+        self._opened += 1
+        backoff = min(self.min_backoff * 2 ** (self._opened - 1), self.max_backoff)
+        # Equal jitter keeps at least half of the backoff
+        backoff = backoff / 2 + random.uniform(0, backoff / 2)
+        self._retry_at = self._clock() + backoff
+        _LOGGER.warning(
+            "Unable to reach the Hubspace API after %d failures, retrying in %d seconds",
+            self.failures,
+            backoff,
+        )
+        self._set_state(CircuitState.OPEN)
+
+    def _set_state(self, state: CircuitState) -> None:
+        """Update the state and notify the listener."""
+        self.state = state
+        if self._on_change:
+            self._on_change(state)
+
+
+class TokenBucket:
+    """Token bucket that limits the rate of requests to the Afero API.
+
+    Tokens are refilled continuously up to the burst size and every request
+    consumes one. A request that arrives when the bucket is empty reserves the
+    next token and waits for it, so queued requests are sent in order at the
+    configured rate.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the token bucket.
+
+        :param rate: Requests per minute. 0 disables the limit
+        :param burst: Maximum number of requests sent without waiting
+        :param clock: Monotonic clock
+        """
+        self.rate: float = rate / 60
+        self.burst: int = max(burst, 1)
+        self._clock = clock
+        self.tokens: float = self.burst
+        self._updated: float = clock()
+        # Requests sent immediately, after waiting, or not at all
+        self.sent: int = 0
+        self.delayed: int = 0
+        self.throttled: int = 0
+        self.delay_total: float = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Determine if requests are limited."""
+        return self.rate > 0
+
+    def set_rate(self, rate: float) -> None:
+        """Change the rate, keeping the tokens accrued at the previous rate.
+
+        :param rate: Requests per minute. 0 disables the limit
+        """
+        self._refill()
+        self.rate = rate / 60
+
+    def _refill(self) -> None:
+        """Add the tokens accrued since the last request."""
+        now = self._clock()
+        self.tokens = min(self.tokens + (now - self._updated) * self.rate, self.burst)
+        self._updated = now
+
+    async def async_acquire(self, max_wait: float | None = None) -> None:
+        """Wait until a request can be sent.
+
+        :param max_wait: Maximum seconds to wait for a token
+
+        :raises RateLimitExceeded: If a token is not available within max_wait
+        """
+        if not self.enabled:
+            self.sent += 1
+            return
+        self._refill()
+        wait = max((1 - self.tokens) / self.rate, 0)
+        if max_wait is not None and wait > max_wait:
+            self.throttled += 1
+            raise RateLimitExceeded(
+                f"Too many requests to the Hubspace API, retry in {wait:.0f} seconds"
+            )
+        self.tokens -= 1
+        self.sent += 1
+        if wait:
+            self.delayed += 1
+            self.delay_total += wait
+            _LOGGER.debug("Delaying request by %.2f seconds due to rate limit", wait)
+            await asyncio.sleep(wait)
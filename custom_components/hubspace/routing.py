@@ -0,0 +1,179 @@
+"""Route resource updates to the entities whose functions changed."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from functools import partial
+
+from aioafero import AferoState, EventType
+from aioafero.errors import DeviceNotFound
+from aioafero.v1 import AferoBridgeV1, AferoController, AferoModelResource
+
+# functionClass, functionInstance. An instance of None in an entity's
+# functions matches every instance of the class.
+Function = tuple[str, str | None]
+UpdateCallback = Callable[[EventType, AferoModelResource], None]
+
+# Functions that affect every entity of a resource
+SHARED_FUNCTION_CLASSES: frozenset[str] = frozenset({"available"})
+
+
+@dataclass(slots=True)
+class RoutedEntity:
+    """Entity waiting for updates to a resource."""
+
+    functions: frozenset[Function] | None
+    callback: UpdateCallback
+
+
+@dataclass(slots=True)
+class RoutedResource:
+    """Entities and last known function values for a single resource."""
+
+    entities: list[RoutedEntity]
+    values: dict[Function, int] | None
+
+
+class UpdateRouter:
+    """Route resource updates to the entities that render the changed functions.
+
+    A single subscription is made to each aioafero controller, and updates
+    are looked up by resource ID, so the cost of an update does not grow with
+    the number of entities. The states of the device are compared against
+    those from the previous update, and only the entities that render a
+    changed function are called. If no change can be found, such as when
+    aioafero updates the resource after a command, every entity is called.
+    """
+
+    def __init__(self, api: AferoBridgeV1) -> None:
+        """Initialize the router.
+
+        :param api: Connection used to look up the states of a device
+        """
+        self._api = api
+        # id(controller) -> unsubscribe from the controller
+        self._controllers: dict[int, Callable[[], None]] = {}
+        # Resources are tracked per controller as the device controller
+        # shares IDs with the controller for the device type
+        self._resources: dict[tuple[int, str], RoutedResource] = {}
+        self.routed: int = 0
+        self.skipped: int = 0
+
+    @property
+    def resource_count(self) -> int:
+        """Get the number of resources with entities waiting for updates."""
+        return len(self._resources)
+
+    def subscribe(
+        self,
+        controller: AferoController,
+        resource_id: str,
+        functions: Iterable[Function] | None,
+        callback: UpdateCallback,
+    ) -> Callable[[], None]:
+        """Call back when any of the functions of a resource change.
+
+        :param controller: Controller that manages the resource
+        :param resource_id: ID of the resource
+        :param functions: Functions rendered by the entity. None for all
+        :param callback: Called with the event type and updated resource
+        :return: Function to unsubscribe
+        """
+        if id(controller) not in self._controllers:
+            self._controllers[id(controller)] = controller.subscribe(
+                partial(self._async_handle_update, id(controller)),
+                event_filter=EventType.RESOURCE_UPDATED,
+            )
+        key = (id(controller), resource_id)
+        if (resource := self._resources.get(key)) is None:
+            resource = RoutedResource(entities=[], values=self._get_values(resource_id))
+            self._resources[key] = resource
+        entity = RoutedEntity(
+            None if functions is None else frozenset(functions), callback
+        )
+        resource.entities.append(entity)
+
+        def unsubscribe() -> None:
+            resource.entities.remove(entity)
+            if not resource.entities:
+                self._resources.pop(key, None)
+
+        return unsubscribe
+
+    def stop(self) -> None:
+        """Unsubscribe from every controller."""
+        while self._controllers:
+            self._controllers.popitem()[1]()
+        self._resources.clear()
+
+    def _get_values(self, resource_id: str) -> dict[Function, int] | None:
+        """Get a fingerprint of each function value reported for the resource."""
+        try:
+            device = self._api.get_afero_device(resource_id)
+        except DeviceNotFound:
+            return None
+        return get_function_values(device.states)
+
+    def _async_handle_update(
+        self,
+        controller_id: int,
+        event_type: EventType,
+        item: AferoModelResource,
+    ) -> None:
+        """Call the entities that render the functions that changed."""
+        if (resource := self._resources.get((controller_id, item.id))) is None:
+            return
+        values = self._get_values(item.id)
+        changed = get_changed_functions(resource.values, values)
+        resource.values = values
+        for entity in list(resource.entities):
+            if changed is None or entity_changed(entity.functions, changed):
+                self.routed += 1
+                entity.callback(event_type, item)
+            else:
+                self.skipped += 1
+
+
+def get_function_values(states: Iterable[AferoState]) -> dict[Function, int]:
+    """Get a fingerprint of the value of each function."""
+    return {
+        (state.functionClass, state.functionInstance): hash(repr(state.value))
+        for state in states
+    }
+
+
+def get_changed_functions(
+    previous: dict[Function, int] | None, current: dict[Function, int] | None
+) -> set[Function] | None:
+    """Get the functions whose values differ, or None if it cannot be determined."""
+    if previous is None or current is None:
+        return None
+    changed = {
+        function
+        for function, value in current.items()
+        if previous.get(function) != value
+    }
+    changed.update(previous.keys() - current.keys())
+    if not changed:
+        # The resource was updated without its device states changing, so
+        # it is unknown what changed
+        return None
+    return changed
+
+
+def entity_changed(
+    functions: frozenset[Function] | None, changed: set[Function]
+) -> bool:
+    """Determine if an entity renders any of the changed functions."""
+    if functions is None:
+        return True
+    for function_class, function_instance in changed:
+        if function_class in SHARED_FUNCTION_CLASSES:
+            return True
+        if (function_class, function_instance) in functions or (
+            function_class,
+            None,
+        ) in functions:
+            return True
+    return False
@@ -1,18 +1,29 @@
 """Home Assistant entity for getting state from Afero sensors."""
 
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
 import logging
 from typing import Any
 
 from aioafero.v1 import AferoController, AferoModelResource
-from aioafero.v1.controllers.event import EventType
-from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .bridge import HubspaceBridge
-from .const import DOMAIN, SENSORS_GENERAL
+from .const import DOMAIN, HEALTH_WINDOW_SEC, SENSORS_GENERAL
 from .entity import HubspaceBaseEntity
+from .metrics import get_error_rate, get_request_rate
 
 LOGGER = logging.getLogger(__name__)
 
@@ -31,6 +42,8 @@ class AferoSensorEntity(HubspaceBaseEntity, SensorEntity):
         super().__init__(bridge, controller, resource, instance=sensor)
         self.entity_description: SensorEntityDescription = SENSORS_GENERAL.get(sensor)
         self._attr_name = sensor
+        # Sensors are tracked by function class
+        self.functions = frozenset({(sensor, None)})
 
     @property
     def native_value(self) -> Any:
@@ -38,6 +51,88 @@ class AferoSensorEntity(HubspaceBaseEntity, SensorEntity):
         return self.resource.sensors[self._attr_name].value
 
 
+@dataclass(frozen=True, kw_only=True)
+class HubspaceHealthSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor reporting the health of the Hubspace API."""
+
+    value_fn: Callable[[HubspaceBridge], Any]
+
+
+HEALTH_SENSORS: tuple[HubspaceHealthSensorEntityDescription, ...] = (
+    HubspaceHealthSensorEntityDescription(
+        key="last-poll-duration",
+        name="Last poll duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda bridge: bridge.last_poll_duration,
+    ),
+    HubspaceHealthSensorEntityDescription(
+        key="last-poll",
+        name="Last successful poll",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda bridge: bridge.last_poll,
+    ),
+    HubspaceHealthSensorEntityDescription(
+        key="requests-per-minute",
+        name="Requests per minute",
+        native_unit_of_measurement="requests/min",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda bridge: get_request_rate(
+            [bridge.poll_stats, bridge.command_stats], HEALTH_WINDOW_SEC
+        ),
+    ),
+    HubspaceHealthSensorEntityDescription(
+        key="error-rate",
+        name="Error rate",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda bridge: get_error_rate(
+            [bridge.poll_stats, bridge.command_stats], HEALTH_WINDOW_SEC
+        ),
+    ),
+    HubspaceHealthSensorEntityDescription(
+        key="commands-in-flight",
+        name="Commands in flight",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda bridge: bridge.command_stats.in_flight,
+    ),
+)
+
+
+class HubspaceHealthSensor(SensorEntity):
+    """Representation of the health of the Hubspace API."""
+
+    _attr_should_poll = False
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self,
+        bridge: HubspaceBridge,
+        description: HubspaceHealthSensorEntityDescription,
+    ) -> None:
+        """Initialize a Hubspace health sensor."""
+        self.bridge = bridge
+        self.entity_description: HubspaceHealthSensorEntityDescription = description
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, bridge.account_id)})
+        self._attr_unique_id = f"{bridge.account_id}-{description.key}"
+
+    async def async_added_to_hass(self) -> None:
+        """Update the sensor whenever the request counters change."""
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, self.bridge.health_signal, self.async_write_ha_state
+            )
+        )
+
+    @property
+    def native_value(self) -> Any:
+        """Return the current value."""
+        return self.entity_description.value_fn(self.bridge)
+
+
 def get_sensors(
     bridge: HubspaceBridge, controller: AferoController, resource: AferoModelResource
 ) -> list[AferoSensorEntity]:
@@ -63,41 +158,12 @@ async def async_setup_entry(
 ) -> None:
     """Set up entities."""
     bridge: HubspaceBridge = hass.data[DOMAIN][config_entry.entry_id]
+    async_add_entities(
+        HubspaceHealthSensor(bridge, description) for description in HEALTH_SENSORS
+    )
 
-    for controller in bridge.api.controllers:
-        # Listen for new devices
-        if not controller.ITEM_SENSORS:
-            continue
-        config_entry.async_on_unload(
-            controller.subscribe(
-                await generate_callback(bridge, controller, async_add_entities),
-                event_filter=EventType.RESOURCE_ADDED,
-            )
+    config_entry.async_on_unload(
+        bridge.entity_factory.async_register(
+            "sensors", partial(get_sensors, bridge), async_add_entities
         )
-        # Add any currently tracked entities
-        for resource in controller:
-            if sensors := get_sensors(bridge, controller, resource):
-                async_add_entities(sensors)
-
-
-async def generate_callback(bridge, controller, async_add_entities: callback):
-    """Generate a callback function for handling new sensor entities.
-
-    Args:
-        bridge: HubspaceBridge instance for managing device communication
-        controller: AferoController instance managing the device
-        async_add_entities: Callback function to register new entities
-
-    Returns:
-        Callback function that adds new sensor entities when resources are added
-
-    """
-
-    async def add_entity_controller(
-        event_type: EventType, resource: AferoModelResource
-    ) -> None:
-        """Add an entity."""
-        if sensors := get_sensors(bridge, controller, resource):
-            async_add_entities(sensors)
-
-    return add_entity_controller
+    )
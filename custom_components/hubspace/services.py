@@ -6,7 +6,7 @@ import logging
 from typing import Final
 
 from homeassistant.const import CONF_USERNAME
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, ServiceCall, callback
 from homeassistant.helpers import entity_registry as er
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.service import verify_domain_control
@@ -49,7 +49,7 @@ async def send_command(call: ServiceCall) -> None:
     """Send command to Hubspace device(s).
 
     Sends a specified command with parameters to one or more Hubspace devices.
-    Commands are sent through the appropriate bridge based on account.
+    Commands are sent through the bridge of the account that owns each entity.
 
     Args:
         call: Service call containing command parameters
@@ -65,14 +65,20 @@ async def send_command(call: ServiceCall) -> None:
     )
     entity_reg = er.async_get(call.hass)
     tasks = []
-    account = call.data.get("account")
+    account = call.data.get(SERVICE_SEND_COMMAND_ACCOUNT)
     for entity_name in call.data.get("entity_id", []):
         entity = entity_reg.async_get(entity_name)
-        bridge = await find_bridge(call.hass, account)
+        bridge = find_bridge(call.hass, entity, account)
         if bridge:
-            tasks.append(bridge.api.send_service_request(entity.unique_id, states))
+            tasks.append(
+                bridge.async_request_call(
+                    bridge.api.send_service_request,
+                    device_id=entity.unique_id,
+                    states=states,
+                )
+            )
         else:
-            LOGGER.warning("No bridge using account %s", account)
+            LOGGER.warning("No bridge using account %s for %s", account, entity_name)
             return
     await asyncio.gather(*tasks)
 
@@ -108,20 +114,26 @@ def async_register_services(hass: HomeAssistant) -> None:
         )
 
 
-async def find_bridge(hass: HomeAssistant, username: str) -> HubspaceBridge | None:
-    """Find the bridge for the given username.
+@callback
+def find_bridge(
+    hass: HomeAssistant, entity: er.RegistryEntry | None, username: str | None
+) -> HubspaceBridge | None:
+    """Find the bridge of the account that owns the entity.
 
     Args:
         hass: HomeAssistant instance containing bridges
-        username: Username to find bridge for
+        entity: Registry entry of the entity
+        username: Only use the bridge if it belongs to this username
 
     Returns:
         HubspaceBridge if found, None otherwise
 
     """
-    for bridge in hass.data[DOMAIN].values():
-        if username is None:
-            return bridge
-        if bridge.config_entry.data[CONF_USERNAME] == username:
-            return bridge
-    return None
+    if entity is None:
+        return None
+    bridge = hass.data[DOMAIN].get(entity.config_entry_id)
+    if bridge is None or (
+        username is not None and bridge.config_entry.data[CONF_USERNAME] != username
+    ):
+        return None
+    return bridge
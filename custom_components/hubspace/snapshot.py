@@ -0,0 +1,57 @@
+"""Persist the last discovery payload so setup does not wait on the cloud."""
+
+from __future__ import annotations
+
+from typing import Any, TypedDict
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, SNAPSHOT_SAVE_DELAY_SEC, SNAPSHOT_VERSION
+
+
+class SnapshotData(TypedDict):
+    """Stored discovery payload."""
+
+    temperature_unit: str
+    devices: list[dict[str, Any]]
+
+
+class DiscoverySnapshot:
+    """Last good discovery payload for an account."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the snapshot.
+
+        :param hass: Home Assistant instance
+        :param entry_id: Config entry that owns the snapshot
+        """
+        self._store: Store[SnapshotData] = Store(
+            hass, SNAPSHOT_VERSION, f"{DOMAIN}.{entry_id}.discovery"
+        )
+        self._data: SnapshotData | None = None
+
+    async def async_load(self, temperature_unit: str) -> SnapshotData | None:
+        """Load the snapshot if it was taken with the same temperature unit."""
+        data = await self._store.async_load()
+        if not data or data.get("temperature_unit") != temperature_unit:
+            return None
+        return data
+
+    @callback
+    def async_save(self, temperature_unit: str, devices: list[dict[str, Any]]) -> None:
+        """Schedule the payload to be written to storage."""
+        self._data = SnapshotData(
+            temperature_unit=temperature_unit,
+            devices=devices,
+        )
+        self._store.async_delay_save(self._get_data, SNAPSHOT_SAVE_DELAY_SEC)
+
+    @callback
+    def _get_data(self) -> SnapshotData:
+        """Get the payload to write."""
+        return self._data
+
+    async def async_remove(self) -> None:
+        """Remove the snapshot from storage."""
+        await self._store.async_remove()
@@ -14,7 +14,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .bridge import HubspaceBridge
 from .const import DOMAIN
-from .entity import HubspaceBaseEntity
+from .entity import HubspaceBaseEntity, optimistic_property
 
 
 class HubspaceSwitch(HubspaceBaseEntity, SwitchEntity):
@@ -31,7 +31,7 @@ class HubspaceSwitch(HubspaceBaseEntity, SwitchEntity):
         super().__init__(bridge, controller, resource, instance=instance)
         self.instance = instance
 
-    @property
+    @optimistic_property
     def is_on(self) -> bool | None:
         """Determines if the switch is on."""
         feature = self.resource.on.get(self.instance, None)
@@ -45,12 +45,13 @@ class HubspaceSwitch(HubspaceBaseEntity, SwitchEntity):
     ) -> None:
         """Turn on the entity."""
         self.logger.debug("Adjusting entity %s with %s", self.resource.id, kwargs)
-        await self.bridge.async_request_call(
-            self.controller.set_state,
-            device_id=self.resource.id,
-            on=True,
-            instance=self.instance,
-        )
+        async with self.optimistic(is_on=True):
+            await self.bridge.async_request_call(
+                self.controller.set_state,
+                device_id=self.resource.id,
+                on=True,
+                instance=self.instance,
+            )
 
     async def async_turn_off(
         self,
@@ -58,12 +59,13 @@ class HubspaceSwitch(HubspaceBaseEntity, SwitchEntity):
     ) -> None:
         """Turn off the entity."""
         self.logger.debug("Adjusting entity %s with %s", self.resource.id, kwargs)
-        await self.bridge.async_request_call(
-            self.controller.set_state,
-            device_id=self.resource.id,
-            on=False,
-            instance=self.instance,
-        )
+        async with self.optimistic(is_on=False):
+            await self.bridge.async_request_call(
+                self.controller.set_state,
+                device_id=self.resource.id,
+                on=False,
+                instance=self.instance,
+            )
 
 
 async def async_setup_entry(
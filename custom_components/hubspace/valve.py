@@ -13,7 +13,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .bridge import HubspaceBridge
 from .const import DOMAIN
-from .entity import HubspaceBaseEntity
+from .entity import HubspaceBaseEntity, optimistic_property
 
 
 class HubspaceValve(HubspaceBaseEntity, ValveEntity):
@@ -48,7 +48,7 @@ class HubspaceValve(HubspaceBaseEntity, ValveEntity):
         """Determines if the Valve reports its position."""
         return self.resource.open.get(self.instance) is not None
 
-    @property
+    @optimistic_property
     def current_valve_position(self) -> int | None:
         """Current position of the valve.
 
@@ -62,22 +62,24 @@ class HubspaceValve(HubspaceBaseEntity, ValveEntity):
     async def async_open_valve(self, **kwargs) -> None:
         """Open the valve."""
         self.logger.info("Opening valve on %s", self._attr_name)
-        await self.bridge.async_request_call(
-            self.controller.set_state,
-            device_id=self.resource.id,
-            valve_open=True,
-            instance=self.instance,
-        )
+        async with self.optimistic(current_valve_position=100):
+            await self.bridge.async_request_call(
+                self.controller.set_state,
+                device_id=self.resource.id,
+                valve_open=True,
+                instance=self.instance,
+            )
 
     async def async_close_valve(self, **kwargs) -> None:
         """Close valve."""
         self.logger.info("Closing valve on %s", self._attr_name)
-        await self.bridge.async_request_call(
-            self.controller.set_state,
-            device_id=self.resource.id,
-            valve_open=False,
-            instance=self.instance,
-        )
+        async with self.optimistic(current_valve_position=0):
+            await self.bridge.async_request_call(
+                self.controller.set_state,
+                device_id=self.resource.id,
+                valve_open=False,
+                instance=self.instance,
+            )
 
 
 async def async_setup_entry(
@@ -0,0 +1,156 @@
+"""Coalesce the state writes of entities updated by a poll."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import math
+import time
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+if TYPE_CHECKING:
+    from .entity import HubspaceBaseEntity
+
+
+class StateWriter:
+    """Write entity states in batches rather than one update at a time.
+
+    Once a poll returns, entities updated by it are marked dirty rather than
+    writing their state. When the poll has been processed, the dirty entities
+    are written a batch at a time, yielding to the event loop between
+    batches. Each entity is also written at most once per min_interval, so a
+    chatty sensor does not flood the recorder.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        enabled: bool,
+        min_interval: float,
+        *,
+        delay: float,
+        batch_size: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the writer.
+
+        :param hass: Home Assistant instance
+        :param enabled: If writes from a poll are collected
+        :param min_interval: Minimum seconds between writes of an entity
+        :param delay: Seconds to collect writes after a poll returns
+        :param batch_size: Maximum entities written per loop iteration
+        :param clock: Source of time, in seconds
+        """
+        self._hass = hass
+        self.enabled: bool = enabled
+        self.min_interval: float = min_interval
+        self.delay: float = delay
+        self.batch_size: int = batch_size
+        self._clock = clock
+        self.collecting: bool = False
+        self.deferred: int = 0
+        self.written: int = 0
+        # Insertion ordered so entities are written in the order they changed
+        self._dirty: dict[HubspaceBaseEntity, None] = {}
+        self._last_written: dict[HubspaceBaseEntity, float] = {}
+        self._flush_at: float | None = None
+        self._cancel_flush: Callable[[], None] | None = None
+
+    @property
+    def dirty(self) -> int:
+        """Get the number of entities waiting to be written."""
+        return len(self._dirty)
+
+    @callback
+    def async_start_cycle(self) -> None:
+        """Collect writes until the poll that just returned has been processed."""
+        if not self.enabled:
+            return
+        self.collecting = True
+        self._async_schedule_flush(self.delay)
+
+    @callback
+    def async_write(self, entity: HubspaceBaseEntity) -> None:
+        """Write the state of the entity now, or with the next flush."""
+        if entity in self._dirty:
+            return
+        now = self._clock()
+        wait = self._get_wait(entity, now)
+        if not self.collecting and wait <= 0:
+            self._async_write_entity(entity, now)
+            return
+        self._dirty[entity] = None
+        self.deferred += 1
+        if not self.collecting:
+            self._async_schedule_flush(wait)
+
+    @callback
+    def discard(self, entity: HubspaceBaseEntity) -> None:
+        """Forget an entity that has been removed."""
+        self._dirty.pop(entity, None)
+        self._last_written.pop(entity, None)
+
+    @callback
+    def stop(self) -> None:
+        """Cancel any pending flush without writing."""
+        self._async_cancel_flush()
+        self.collecting = False
+        self._dirty.clear()
+        self._last_written.clear()
+
+    def _get_wait(self, entity: HubspaceBaseEntity, now: float) -> float:
+        """Get the seconds until the entity may be written again."""
+        return self._last_written.get(entity, -math.inf) + self.min_interval - now
+
+    @callback
+    def _async_write_entity(self, entity: HubspaceBaseEntity, now: float) -> None:
+        """Write the state of the entity."""
+        if self.min_interval > 0:
+            self._last_written[entity] = now
+        self.written += 1
+        entity.async_write_changed_state()
+
+    @callback
+    def _async_schedule_flush(self, delay: float) -> None:
+        """Flush after the delay, unless a flush is already due sooner."""
+        flush_at = self._clock() + delay
+        if self._flush_at is not None and self._flush_at <= flush_at:
+            return
+        self._async_cancel_flush()
+        self._flush_at = flush_at
+        self._cancel_flush = async_call_later(self._hass, delay, self._async_flush)
+
+    @callback
+    def _async_cancel_flush(self) -> None:
+        """Cancel the scheduled flush."""
+        if self._cancel_flush:
+            self._cancel_flush()
+        self._cancel_flush = None
+        self._flush_at = None
+
+    @callback
+    def _async_flush(self, *_: object) -> None:
+        """Write a batch of dirty entities that are not limited."""
+        self._cancel_flush = None
+        self._flush_at = None
+        self.collecting = False
+        now = self._clock()
+        retry: float | None = None
+        written = 0
+        for entity in list(self._dirty):
+            if written >= self.batch_size:
+                # Let other work run before writing the next batch
+                handle = self._hass.loop.call_soon(self._async_flush)
+                self._cancel_flush = handle.cancel
+                self._flush_at = now
+                return
+            if (wait := self._get_wait(entity, now)) > 0:
+                retry = wait if retry is None else min(retry, wait)
+                continue
+            del self._dirty[entity]
+            self._async_write_entity(entity, now)
+            written += 1
+        if retry is not None:
+            self._async_schedule_flush(retry)
@@ -0,0 +1,139 @@
+"""Test sharing polling and request budgets between accounts."""
+
+from types import SimpleNamespace
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+import pytest
+
+from custom_components.hubspace.accounts import (
+    AccountScheduler,
+    async_get_accounts,
+    get_share,
+)
+from custom_components.hubspace.resilience import TokenBucket
+
+from .test_polling import FakeClock
+
+
+def create_account(entry_id: str, poll_rate: int, command_rate: int):
+    """Create an account with its own request limits."""
+    return SimpleNamespace(
+        config_entry=SimpleNamespace(entry_id=entry_id),
+        poll_rate_limit=poll_rate,
+        command_rate_limit=command_rate,
+        poll_limiter=TokenBucket(poll_rate, 1),
+        command_limiter=TokenBucket(command_rate, 1),
+    )
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Clock used by the scheduler."""
+    return FakeClock()
+
+
+@pytest.fixture
+def sleeps(clock, mocker) -> list[float]:
+    """Advance the clock instead of sleeping."""
+    waits: list[float] = []
+
+    async def sleep(delay: float) -> None:
+        waits.append(delay)
+        clock.now += delay
+
+    mocker.patch("custom_components.hubspace.accounts.asyncio.sleep", sleep)
+    return waits
+
+
+def test_budget_shared(hass, clock):
+    """Ensure accounts with a limit split the highest limit between them."""
+    scheduler = AccountScheduler(hass, clock=clock)
+    first = create_account("first", 240, 0)
+    second = create_account("second", 60, 120)
+    third = create_account("third", 240, 120)
+    scheduler.register(first)
+    # A single account keeps its own limits
+    assert first.poll_limiter.rate * 60 == 240
+    assert not first.command_limiter.enabled
+    scheduler.register(second)
+    assert first.poll_limiter.rate * 60 == 120
+    assert second.poll_limiter.rate * 60 == 60
+    # Unlimited accounts are not limited by the other accounts
+    assert not first.command_limiter.enabled
+    assert second.command_limiter.rate * 60 == 120
+    scheduler.register(third)
+    assert first.poll_limiter.rate * 60 == 80
+    assert third.command_limiter.rate * 60 == 60
+    scheduler.unregister(second)
+    scheduler.unregister(third)
+    assert first.poll_limiter.rate * 60 == 240
+    assert not first.command_limiter.enabled
+
+
+@pytest.mark.parametrize(
+    ("limit", "limits", "expected"),
+    [
+        # Unlimited accounts stay unlimited
+        (0, [0, 240], 0),
+        # The only account with a limit keeps it
+        (240, [0, 240], 240),
+        # Limited accounts split the highest limit
+        (240, [240, 240], 120),
+        (60, [60, 240], 60),
+        (240, [60, 240, 0], 120),
+    ],
+)
+def test_get_share(limit, limits, expected):
+    """Ensure only limits set on the accounts are split between them."""
+    assert get_share(limit, limits) == expected
+
+
+@pytest.mark.asyncio
+async def test_polls_staggered(hass, clock, sleeps):
+    """Ensure polls from different accounts do not start together."""
+    scheduler = AccountScheduler(hass, clock=clock)
+    scheduler.register(create_account("first", 240, 120))
+    await scheduler.async_wait_for_turn(30)
+    assert sleeps == []
+    for entry_id in ("second", "third"):
+        scheduler.register(create_account(entry_id, 240, 120))
+    for _ in range(3):
+        await scheduler.async_wait_for_turn(30)
+    assert sleeps == [10, 10]
+    assert scheduler.staggered == 2
+    # Polls already apart are not delayed
+    clock.now += 30
+    await scheduler.async_wait_for_turn(30)
+    assert sleeps == [10, 10]
+
+
+@pytest.mark.asyncio
+async def test_shared_session(hass):
+    """Ensure accounts share a session that is closed with the last user."""
+    scheduler = AccountScheduler(hass)
+    session = scheduler.acquire_session("first")
+    assert scheduler.acquire_session("second") is session
+    # Each account caps its own requests rather than the pool
+    assert session.connector.limit_per_host == 0
+    await scheduler.async_release_session("first")
+    assert not session.closed
+    await scheduler.async_release_session("second")
+    assert session.closed
+    # A new session is created once the previous one has been closed
+    session = scheduler.acquire_session("first")
+    assert not session.closed
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+    await hass.async_block_till_done()
+    assert session.closed
+
+
+@pytest.mark.asyncio
+async def test_accounts_registered(mocked_entry):
+    """Ensure loaded accounts are tracked by the shared scheduler."""
+    hass, entry, bridge = mocked_entry
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    scheduler = async_get_accounts(hass)
+    assert scheduler.accounts == {entry.entry_id: hass.data["hubspace"][entry.entry_id]}
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    assert scheduler.accounts == {}
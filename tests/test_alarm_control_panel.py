@@ -74,6 +74,8 @@ async def test_alarm_state(panel_state, expected, mocked_entry):
     )
     await bridge.generate_devices_from_data([alarm_panel])
     await bridge.async_block_until_done()
+    # The platform is set up when the first alarm panel is added
+    await hass.async_block_till_done()
     entity = hass.states.get(alarm_panel_id)
     assert entity is not None
     assert entity.state == expected
@@ -1,10 +1,38 @@
 """Test the bridge between Home Assistant and Afero."""
 
+import asyncio
+from datetime import timedelta
+import time
+
+from aioafero import AferoState
+from aioafero.v1.auth import TokenData
 from aiohttp import ClientError
+from homeassistant.const import CONF_TOKEN, EVENT_HOMEASSISTANT_CLOSE, Platform
 from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
+from homeassistant.util import dt as dt_util
 import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.hubspace import bridge as bridge_module
+from custom_components.hubspace.bridge import (
+    HubspaceBridge,
+    InvalidAuth,
+    get_resource_platforms,
+)
+from custom_components.hubspace.const import (
+    CONF_DEDICATED_SESSION,
+    CONF_MAX_CONCURRENT,
+    POLLING_TIER_SLOW,
+    POLLING_TIME_STR,
+    TOKEN_REFRESH_RETRY_SEC,
+    TOKEN_SAVE_DELAY_SEC,
+)
+from custom_components.hubspace.resilience import CircuitState
+
+from .utils import create_devices_from_data, hs_raw_from_device, modify_state
 
-from custom_components.hubspace.bridge import HubspaceBridge, InvalidAuth
+light_a21 = create_devices_from_data("light-a21.json")
+freezer = create_devices_from_data("freezer.json")
 
 
 @pytest.mark.asyncio
@@ -67,3 +95,515 @@ async def test_request_call(result, side_effect, msg, caplog, mocker, mocked_ent
             await bridge.async_request_call(task)
     else:
         await bridge.async_request_call(task)
+
+
+@pytest.mark.asyncio
+async def test_request_call_boosts_polling(mocked_entry, mocker):
+    """Ensure commands speed up polling for the device."""
+    hass, entry, mocked_bridge = mocked_entry
+    bridge = HubspaceBridge(hass, entry)
+    task = mocker.AsyncMock(return_value=None)
+    await bridge.async_request_call(task, device_id="dev-1")
+    assert bridge.poll_scheduler.boosted_devices == {"dev-1"}
+    await bridge.async_request_call(task)
+    assert bridge.poll_scheduler.boosted_devices == {"dev-1"}
+    await bridge.command_coalescer.async_stop()
+
+
+@pytest.mark.asyncio
+async def test_request_call_coalesced(mocked_entry, mocker):
+    """Ensure a burst of commands only sends the latest value."""
+    hass, entry, mocked_bridge = mocked_entry
+    bridge = HubspaceBridge(hass, entry)
+    task = mocker.AsyncMock(side_effect=[None, ValueError("bad value")])
+    await bridge.async_request_call(task, device_id="dev-1", brightness=10)
+    results = await asyncio.gather(
+        bridge.async_request_call(task, device_id="dev-1", brightness=20),
+        bridge.async_request_call(task, device_id="dev-1", brightness=30),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, HomeAssistantError) for result in results)
+    assert task.call_count == 2
+    task.assert_called_with(device_id="dev-1", brightness=30)
+    await bridge.command_coalescer.async_stop()
+
+
+@pytest.mark.asyncio
+async def test_batch_controller_updates(mocked_entry, mocker):
+    """Ensure updates from multiple entities on a device are sent together."""
+    hass, entry, mocked_bridge = mocked_entry
+    bridge = HubspaceBridge(hass, entry)
+    controller = mocked_bridge.switches
+    send = mocker.patch(
+        "aioafero.v1.controllers.base.BaseResourcesController.update_afero_api",
+        return_value="response",
+    )
+    bridge.batch_controller_updates(controller)
+    zone_1 = [{"functionClass": "toggle", "functionInstance": "zone-1", "value": "off"}]
+    zone_2 = [{"functionClass": "toggle", "functionInstance": "zone-2", "value": "off"}]
+    assert await asyncio.gather(
+        controller.update_afero_api("dev-1", zone_1),
+        controller.update_afero_api("dev-1", zone_2),
+    ) == ["response", "response"]
+    send.assert_called_once_with(controller, "dev-1", zone_1 + zone_2)
+    assert bridge.command_stats.requests == 1
+
+
+@pytest.mark.asyncio
+async def test_command_rate_limit(mocked_entry, mocker):
+    """Ensure commands that exceed the rate limit are rejected."""
+    hass, entry, mocked_bridge = mocked_entry
+    bridge = HubspaceBridge(hass, entry)
+    controller = mocked_bridge.switches
+    send = mocker.patch(
+        "aioafero.v1.controllers.base.BaseResourcesController.update_afero_api",
+        return_value="response",
+    )
+    bridge.batch_controller_updates(controller)
+    bridge.command_limiter.tokens = 0
+    bridge.command_limiter.rate = 0.01
+    states = [{"functionClass": "power", "functionInstance": None, "value": "on"}]
+    with pytest.raises(HomeAssistantError, match="Too many requests"):
+        await bridge.async_request_call(
+            controller.update_afero_api, device_id="dev-1", states=states
+        )
+    send.assert_not_called()
+    assert bridge.command_limiter.throttled == 1
+    assert bridge.circuit.available
+
+
+@pytest.mark.asyncio
+async def test_fetch_due_states(mocked_entry, mocker):
+    """Ensure only devices that are due are polled."""
+    hass, entry, mocked_bridge = mocked_entry
+    await mocked_bridge.generate_devices_from_data(light_a21)
+    bridge = HubspaceBridge(hass, entry)
+    assert mocked_bridge.fetch_all_device_states == bridge.async_fetch_due_states
+    fetch = mocker.patch.object(
+        mocked_bridge, "fetch_device_states", return_value=light_a21[0].states
+    )
+    assert await bridge.async_fetch_due_states() == []
+    fetch.assert_not_called()
+    mocker.patch.object(
+        bridge.poll_scheduler, "due_devices", return_value={light_a21[0].id}
+    )
+    assert await bridge.async_fetch_due_states() == [
+        mocked_bridge.get_afero_device(light_a21[0].id)
+    ]
+    fetch.assert_called_once_with(light_a21[0].id)
+    assert bridge.poll_limiter.sent == 1
+    assert bridge.poll_stats.requests == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_due_states_errors(mocked_entry, mocker, caplog):
+    """Ensure failed polls do not prevent other devices from updating."""
+    hass, entry, mocked_bridge = mocked_entry
+    await mocked_bridge.generate_devices_from_data(light_a21)
+    bridge = HubspaceBridge(hass, entry)
+    mocker.patch.object(
+        bridge.poll_scheduler, "due_devices", return_value={"not-tracked"}
+    )
+    mocker.patch.object(mocked_bridge, "fetch_device_states", return_value=[])
+    assert await bridge.async_fetch_due_states() == []
+    assert "Device not-tracked not found in cache" in caplog.text
+    mocker.patch.object(
+        mocked_bridge, "fetch_device_states", side_effect=ClientError("boom")
+    )
+    mocker.patch.object(
+        bridge.poll_scheduler, "due_devices", return_value={light_a21[0].id}
+    )
+    assert await bridge.async_fetch_due_states() == []
+    assert "Unable to fetch states: boom" in caplog.text
+    assert bridge.poll_stats.errors == 1
+
+
+@pytest.mark.asyncio
+async def test_initialize_bridge_snapshot(mocked_entry, hass_storage, mocker):
+    """Ensure setup starts from the snapshot and reconciles with live data."""
+    hass, entry, mocked_bridge = mocked_entry
+    light = create_devices_from_data("light-a21.json")[0]
+    snapshot = [hs_raw_from_device(light)]
+    modify_state(
+        light,
+        AferoState(functionClass="power", functionInstance=None, value="off"),
+    )
+    live = [hs_raw_from_device(light)]
+    hass_storage[f"hubspace.{entry.entry_id}.discovery"] = {
+        "version": 1,
+        "key": f"hubspace.{entry.entry_id}.discovery",
+        "data": {
+            "temperature_unit": mocked_bridge.temperature_unit.value,
+            "devices": snapshot,
+        },
+    }
+    fetch = mocker.patch.object(
+        mocked_bridge, "fetch_discovery_data", return_value=live
+    )
+
+    async def gather_discovery_data() -> list[dict]:
+        return await mocked_bridge.fetch_discovery_data(version_poll=False)
+
+    mocker.patch.object(
+        mocked_bridge.events, "gather_discovery_data", new=gather_discovery_data
+    )
+    # The discovery loop does not run in tests, so the first discovery is
+    # performed by the reconcile scheduled during setup
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    bridge = hass.data["hubspace"][entry.entry_id]
+    state = hass.states.get("light.friendly_device_53")
+    assert state.state == "on"
+    assert state.attributes["assumed_state"] is True
+    fetch.assert_not_called()
+    # Live discovery
+    await mocked_bridge.events.perform_discovery_poll()
+    await mocked_bridge.async_block_until_done()
+    await hass.async_block_till_done()
+    fetch.assert_called_once_with(version_poll=False)
+    assert not bridge.stale
+    state = hass.states.get("light.friendly_device_53")
+    assert state.state == "off"
+    assert "assumed_state" not in state.attributes
+
+
+@pytest.mark.asyncio
+async def test_get_resource_platforms(mocked_bridge):
+    """Ensure the platforms are determined from the resource."""
+    await mocked_bridge.generate_devices_from_data(
+        light_a21 + create_devices_from_data("fan-exhaust-fan.json")
+    )
+    light = mocked_bridge.lights[light_a21[0].id]
+    assert get_resource_platforms(mocked_bridge.lights, light) == {
+        Platform.LIGHT,
+        Platform.NUMBER,
+    }
+    exhaust_fan = next(iter(mocked_bridge.exhaust_fans))
+    assert get_resource_platforms(mocked_bridge.exhaust_fans, exhaust_fan) == {
+        Platform.BINARY_SENSOR,
+        Platform.NUMBER,
+        Platform.SELECT,
+    }
+
+
+@pytest.mark.asyncio
+async def test_forward_platforms(mocked_entry):
+    """Ensure only platforms with resources are forwarded."""
+    hass, entry, mocked_bridge = mocked_entry
+    await mocked_bridge.generate_devices_from_data(light_a21)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    bridge = hass.data["hubspace"][entry.entry_id]
+    expected = {Platform.BUTTON, Platform.LIGHT, Platform.NUMBER, Platform.SENSOR}
+    assert bridge.platforms == expected
+    # Platforms are forwarded when the first resource is added
+    await mocked_bridge.generate_devices_from_data(
+        light_a21 + create_devices_from_data("switch-HPSA11CWB.json")
+    )
+    await hass.async_block_till_done()
+    assert bridge.platforms == expected | {Platform.SWITCH}
+    assert hass.states.async_entity_ids("switch")
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.asyncio
+async def test_request_call_circuit_open(mocked_entry, mocker):
+    """Ensure commands are rejected while the API is unreachable."""
+    hass, entry, mocked_bridge = mocked_entry
+    bridge = HubspaceBridge(hass, entry)
+    task = mocker.AsyncMock(side_effect=ClientError("boom"))
+    for _ in range(3):
+        with pytest.raises(HomeAssistantError, match="connection error"):
+            await bridge.async_request_call(task)
+    with pytest.raises(HomeAssistantError, match="Hubspace API is unavailable"):
+        await bridge.async_request_call(task)
+    assert task.call_count == 3
+    # Errors caused by the request do not count as an outage
+    bridge = HubspaceBridge(hass, entry)
+    task = mocker.AsyncMock(side_effect=ValueError("bad value"))
+    for _ in range(4):
+        with pytest.raises(HomeAssistantError, match="bad value"):
+            await bridge.async_request_call(task)
+    assert bridge.circuit.available
+    # Nor do they close the circuit before a probe has reached Hubspace
+    bridge.circuit.state = CircuitState.HALF_OPEN
+    with pytest.raises(HomeAssistantError, match="bad value"):
+        await bridge.async_request_call(task)
+    assert bridge.circuit.state == CircuitState.HALF_OPEN
+
+
+@pytest.mark.asyncio
+async def test_request_call_overloaded(mocked_entry, mocker):
+    """Ensure commands that aioafero reports as failed open the circuit."""
+    hass, entry, mocked_bridge = mocked_entry
+    await mocked_bridge.generate_devices_from_data(light_a21)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    bridge = hass.data["hubspace"][entry.entry_id]
+    entity_id = hass.states.async_entity_ids("light")[0]
+    # aioafero returns False once retries for 429 / 503 / 504 are exhausted
+    update = mocker.patch.object(
+        type(mocked_bridge.lights), "update_afero_api", return_value=False
+    )
+    for brightness in (10, 20, 30):
+        await hass.services.async_call(
+            "light",
+            "turn_on",
+            {"entity_id": entity_id, "brightness_pct": brightness},
+            blocking=True,
+        )
+    assert update.call_count == 3
+    assert bridge.command_stats.errors == 3
+    assert not bridge.circuit.available
+    await hass.async_block_till_done()
+    assert hass.states.get(entity_id).state == "unavailable"
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.asyncio
+async def test_fetch_due_states_circuit_open(mocked_entry, mocker):
+    """Ensure polling stops during an outage and resumes with a single probe."""
+    hass, entry, mocked_bridge = mocked_entry
+    await mocked_bridge.generate_devices_from_data(light_a21 + freezer)
+    bridge = HubspaceBridge(hass, entry)
+    bridge.circuit.min_backoff = 0
+    mocker.patch.object(
+        bridge.poll_scheduler,
+        "due_devices",
+        return_value={light_a21[0].id, freezer[0].id},
+    )
+    fetch = mocker.patch.object(
+        mocked_bridge, "fetch_device_states", side_effect=ClientError("boom")
+    )
+    for _ in range(3):
+        assert await bridge.async_fetch_due_states() == []
+    assert not bridge.circuit.available
+    assert fetch.call_count == 6
+    # Recover with a single probe
+    fetch.reset_mock(side_effect=True)
+    fetch.return_value = []
+    assert len(await bridge.async_fetch_due_states()) == 1
+    assert fetch.call_count == 1
+    assert bridge.circuit.available
+    # Both devices are polled again, but the probed device has not changed
+    assert len(await bridge.async_fetch_due_states()) == 1
+    assert fetch.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_get_poll_tier(mocked_entry):
+    """Ensure polling tiers are determined from the cached Afero device."""
+    hass, entry, mocked_bridge = mocked_entry
+    await mocked_bridge.generate_devices_from_data(freezer)
+    bridge = HubspaceBridge(hass, entry)
+    assert bridge.get_poll_tier(freezer[0].id) == POLLING_TIER_SLOW
+    assert bridge.poll_tiers == {freezer[0].id: POLLING_TIER_SLOW}
+    assert bridge.get_poll_tier("not-tracked") is None
+    assert "not-tracked" not in bridge.poll_tiers
+
+
+@pytest.mark.asyncio
+async def test_save_rotated_token(mocked_entry, mocker):
+    """Ensure a rotated refresh token is saved without reloading the entry."""
+    hass, entry, mocked_bridge = mocked_entry
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=TOKEN_SAVE_DELAY_SEC)
+    )
+    await hass.async_block_till_done()
+    reload = mocker.patch.object(hass.config_entries, "async_reload")
+    bridge = hass.data["hubspace"][entry.entry_id]
+    mocked_bridge.set_token_data(
+        TokenData("token", "access", "rotated-token", time.time() + 120)
+    )
+    bridge.async_check_token()
+    assert entry.data[CONF_TOKEN] != "rotated-token"
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=TOKEN_SAVE_DELAY_SEC * 2)
+    )
+    await hass.async_block_till_done()
+    assert entry.data[CONF_TOKEN] == "rotated-token"
+    reload.assert_not_called()
+    # Options changes still reload the entry
+    hass.config_entries.async_update_entry(
+        entry, options={**entry.options, POLLING_TIME_STR: 60}
+    )
+    await hass.async_block_till_done()
+    reload.assert_called_once_with(entry.entry_id)
+
+
+@pytest.mark.asyncio
+async def test_save_rotated_token_on_unload(mocked_entry):
+    """Ensure a rotated token is saved when the entry is unloaded."""
+    hass, entry, mocked_bridge = mocked_entry
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    mocked_bridge.set_token_data(
+        TokenData("token", "access", "rotated-token", time.time() + 120)
+    )
+    hass.data["hubspace"][entry.entry_id].async_check_token()
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    assert entry.data[CONF_TOKEN] == "rotated-token"
+
+
+@pytest.mark.asyncio
+async def test_token_refresh_scheduled(mocked_entry, mocker):
+    """Ensure the access token is refreshed in the background before it expires."""
+    hass, entry, mocked_bridge = mocked_entry
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    bridge = hass.data["hubspace"][entry.entry_id]
+    mocker.patch(
+        "custom_components.hubspace.bridge.random.uniform",
+        side_effect=lambda low, high: high,
+    )
+    mocked_bridge.set_token_data(
+        TokenData("token", "access", "refresh", time.time() + 60)
+    )
+    bridge.async_schedule_token_refresh()
+    new_token = TokenData("new-token", "new-access", "new-refresh", time.time() + 118)
+    generate = mocker.patch(
+        "aioafero.v1.auth.AferoAuth.generate_refresh_token", return_value=new_token
+    )
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=25))
+    await hass.async_block_till_done()
+    generate.assert_not_called()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=31))
+    await hass.async_block_till_done()
+    generate.assert_called_once()
+    assert bridge.token_expiration == new_token.expiration
+    # No refreshes are made once unloaded
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=200))
+    await hass.async_block_till_done()
+    generate.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_token_refresh_single_flight(mocked_entry, mocker):
+    """Ensure concurrent callers share a single refresh."""
+    hass, entry, mocked_bridge = mocked_entry
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    bridge = hass.data["hubspace"][entry.entry_id]
+    release = asyncio.Event()
+    new_token = TokenData("new-token", "new-access", "new-refresh", time.time() + 118)
+
+    async def generate_refresh_token(*args, **kwargs):
+        await release.wait()
+        return new_token
+
+    generate = mocker.patch(
+        "aioafero.v1.auth.AferoAuth.generate_refresh_token",
+        side_effect=generate_refresh_token,
+    )
+    refreshes = asyncio.gather(
+        bridge.async_refresh_token(),
+        bridge.async_refresh_token(),
+        bridge.async_ensure_token(),
+    )
+    await asyncio.sleep(0)
+    release.set()
+    await refreshes
+    generate.assert_called_once()
+    assert bridge.token_expiration == new_token.expiration
+
+
+@pytest.mark.asyncio
+async def test_token_refresh_failed(mocked_entry, mocker, caplog):
+    """Ensure a failed refresh keeps the current token and is retried."""
+    hass, entry, mocked_bridge = mocked_entry
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    bridge = hass.data["hubspace"][entry.entry_id]
+    expiration = bridge.token_expiration
+    generate = mocker.patch(
+        "aioafero.v1.auth.AferoAuth.generate_refresh_token",
+        side_effect=ClientError("boom"),
+    )
+    bridge.async_schedule_token_refresh(0)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    assert "Unable to refresh the access token: boom" in caplog.text
+    assert bridge.token_expiration == expiration
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=TOKEN_REFRESH_RETRY_SEC + 1)
+    )
+    await hass.async_block_till_done()
+    assert generate.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_dedicated_session(mocked_entry):
+    """Ensure each account can use its own connection pool."""
+    hass, entry, mocked_bridge = mocked_entry
+    assert HubspaceBridge(hass, entry).session is None
+    hass.config_entries.async_update_entry(
+        entry,
+        options={**entry.options, CONF_DEDICATED_SESSION: True, CONF_MAX_CONCURRENT: 4},
+    )
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    bridge = hass.data["hubspace"][entry.entry_id]
+    session = bridge.session
+    # Requests are capped by the account rather than the shared pool
+    assert session.connector.limit_per_host == 0
+    assert bridge.command_scheduler.max_concurrent == 4
+    assert bridge_module.AferoBridgeV1.call_args.kwargs["session"] is session
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    assert session.closed
+    # The session is also closed if Home Assistant stops while it is loaded
+    bridge = HubspaceBridge(hass, entry)
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+    await hass.async_block_till_done()
+    assert bridge.session.closed
+
+
+@pytest.mark.asyncio
+async def test_fetch_due_states_unchanged(mocked_entry, mocker):
+    """Ensure polls that report the same values are not forwarded."""
+    hass, entry, mocked_bridge = mocked_entry
+    await mocked_bridge.generate_devices_from_data(light_a21)
+    bridge = HubspaceBridge(hass, entry)
+    controller = mocked_bridge.lights
+    mocker.patch(
+        "aioafero.v1.controllers.base.BaseResourcesController.update_afero_api",
+        return_value="response",
+    )
+    bridge.batch_controller_updates(controller)
+    device_id = light_a21[0].id
+    mocker.patch.object(bridge.poll_scheduler, "due_devices", return_value={device_id})
+    states = light_a21[0].states
+    fetch = mocker.patch.object(
+        mocked_bridge, "fetch_device_states", return_value=states
+    )
+    device = mocked_bridge.get_afero_device(device_id)
+    assert await bridge.async_fetch_due_states() == [device]
+    # Only the update time changed
+    fetch.return_value = [
+        AferoState(
+            functionClass=state.functionClass,
+            functionInstance=state.functionInstance,
+            value=state.value,
+            lastUpdateTime=state.lastUpdateTime + 1000,
+        )
+        for state in reversed(states)
+    ]
+    assert await bridge.async_fetch_due_states() == []
+    assert bridge.polls_unchanged == 1
+    # A value changed
+    changed = create_devices_from_data("light-a21.json")[0]
+    modify_state(
+        changed,
+        AferoState(functionClass="power", functionInstance=None, value="off"),
+    )
+    fetch.return_value = changed.states
+    assert await bridge.async_fetch_due_states() == [device]
+    assert await bridge.async_fetch_due_states() == []
+    # A command invalidates the fingerprint
+    await controller.update_afero_api(device_id, [])
+    assert await bridge.async_fetch_due_states() == [device]
+    # As does discovery
+    await bridge.async_fetch_discovery_data()
+    assert await bridge.async_fetch_due_states() == [device]
@@ -13,9 +13,12 @@ from homeassistant.components.climate import (
     HVACMode,
 )
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.util.unit_system import IMPERIAL_SYSTEM
 import pytest
 
+from custom_components.hubspace.const import DOMAIN
+
 from .utils import create_devices_from_data, hs_raw_from_dump, modify_state
 
 thermostat = create_devices_from_data("thermostat.json")[0]
@@ -492,3 +495,29 @@ async def test_set_temperature_portable_ac(mocked_portable_ac_entity):
     assert entity is not None
     assert entity.state == HVACMode.DRY
     assert entity.attributes[ATTR_TEMPERATURE] is None
+
+
+@pytest.mark.asyncio
+async def test_derived_properties_cached(mocked_entity):
+    """Ensure derived values are only recomputed when the resource updates."""
+    hass, entry, bridge = mocked_entity
+    hubspace_bridge = hass.data[DOMAIN][entry.entry_id]
+    bridge.thermostats[thermostat.id].hvac_mode.supported_modes.discard("cool")
+    # Writes that are not caused by an update use the cached values
+    async_dispatcher_send(hass, hubspace_bridge.availability_signal)
+    await hass.async_block_till_done()
+    assert HVACMode.COOL in hass.states.get(thermostat_id).attributes["hvac_modes"]
+    updated = create_devices_from_data("thermostat.json")[0]
+    modify_state(
+        updated,
+        AferoState(
+            functionClass="temperature",
+            functionInstance="current-temp",
+            value=20,
+        ),
+    )
+    await bridge.generate_devices_from_data([updated])
+    await hass.async_block_till_done()
+    entity = hass.states.get(thermostat_id)
+    assert entity.attributes["current_temperature"] == 20
+    assert HVACMode.COOL not in entity.attributes["hvac_modes"]
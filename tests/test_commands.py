@@ -0,0 +1,491 @@
+"""Test how commands are sent to the Afero API."""
+
+import asyncio
+
+import pytest
+
+from custom_components.hubspace.commands import (
+    CommandBatcher,
+    CommandCoalescer,
+    CommandScheduler,
+    RequestPriority,
+    get_command_key,
+    merge_states,
+)
+
+
+class FakeController:
+    """Record the commands that reach the API."""
+
+    def __init__(self) -> None:
+        """Initialize the controller."""
+        self.calls: list[dict] = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def set_state(self, **kwargs) -> int:
+        """Send the command."""
+        await self.release.wait()
+        self.calls.append(kwargs)
+        if kwargs.get("fail"):
+            raise ValueError("bad command")
+        return len(self.calls)
+
+
+async def set_state(**kwargs) -> None:
+    """Send a command."""
+
+
+async def set_other(**kwargs) -> None:
+    """Send a command with a different task."""
+
+
+@pytest.mark.parametrize(
+    ("first", "second", "same"),
+    [
+        # Same function, different value
+        (
+            (set_state, {"device_id": "1", "brightness": 10, "on": None}),
+            (set_state, {"device_id": "1", "brightness": 20}),
+            True,
+        ),
+        # Different device
+        (
+            (set_state, {"device_id": "1", "brightness": 10}),
+            (set_state, {"device_id": "2", "brightness": 10}),
+            False,
+        ),
+        # Different function
+        (
+            (set_state, {"device_id": "1", "brightness": 10}),
+            (set_state, {"device_id": "1", "on": True}),
+            False,
+        ),
+        # Different element
+        (
+            (set_state, {"device_id": "1", "on": True, "instance": "light-1"}),
+            (set_state, {"device_id": "1", "on": True, "instance": "light-2"}),
+            False,
+        ),
+        # Same number
+        (
+            (set_state, {"device_id": "1", "numbers": {("speed", None): 1}}),
+            (set_state, {"device_id": "1", "numbers": {("speed", None): 2}}),
+            True,
+        ),
+        # Different number
+        (
+            (set_state, {"device_id": "1", "numbers": {("speed", None): 1}}),
+            (set_state, {"device_id": "1", "numbers": {("timer", None): 1}}),
+            False,
+        ),
+        # Different task
+        (
+            (set_state, {"device_id": "1", "on": True}),
+            (set_other, {"device_id": "1", "on": True}),
+            False,
+        ),
+        # Same Afero state
+        (
+            (
+                set_state,
+                {
+                    "device_id": "1",
+                    "states": [
+                        {
+                            "functionClass": "power",
+                            "functionInstance": None,
+                            "value": "on",
+                        }
+                    ],
+                },
+            ),
+            (
+                set_state,
+                {
+                    "device_id": "1",
+                    "states": [
+                        {
+                            "functionClass": "power",
+                            "functionInstance": None,
+                            "value": "off",
+                        }
+                    ],
+                },
+            ),
+            True,
+        ),
+        # Different Afero state
+        (
+            (
+                set_state,
+                {
+                    "device_id": "1",
+                    "states": [
+                        {
+                            "functionClass": "power",
+                            "functionInstance": None,
+                            "value": "on",
+                        }
+                    ],
+                },
+            ),
+            (
+                set_state,
+                {
+                    "device_id": "1",
+                    "states": [
+                        {"functionClass": "timer", "functionInstance": None, "value": 1}
+                    ],
+                },
+            ),
+            False,
+        ),
+    ],
+)
+def test_get_command_key(first, second, same):
+    """Ensure only commands for the same function share a key."""
+    first_key = get_command_key(first[0], (), first[1])
+    second_key = get_command_key(second[0], (), second[1])
+    assert (first_key == second_key) is same
+
+
+def test_get_command_key_not_coalesced():
+    """Ensure commands without a device are never coalesced."""
+    assert get_command_key(set_state, ("1",), {}) is None
+    assert get_command_key(set_state, (), {"on": True}) is None
+
+
+@pytest.mark.asyncio
+async def test_async_call_last_write_wins():
+    """Ensure a burst of commands only sends the first and last value."""
+    controller = FakeController()
+    coalescer = CommandCoalescer(0.01)
+    controller.release.clear()
+    first = asyncio.create_task(
+        coalescer.async_call(controller.set_state, device_id="1", brightness=10)
+    )
+    await asyncio.sleep(0)
+    burst = [
+        asyncio.create_task(
+            coalescer.async_call(controller.set_state, device_id="1", brightness=val)
+        )
+        for val in (20, 30, 40)
+    ]
+    await asyncio.sleep(0)
+    controller.release.set()
+    assert await first == 1
+    assert await asyncio.gather(*burst) == [2, 2, 2]
+    assert controller.calls == [
+        {"device_id": "1", "brightness": 10},
+        {"device_id": "1", "brightness": 40},
+    ]
+    assert coalescer.coalesced == 2
+    await coalescer.async_stop()
+
+
+@pytest.mark.asyncio
+async def test_async_call_separate_keys():
+    """Ensure commands for different functions are all sent."""
+    controller = FakeController()
+    coalescer = CommandCoalescer(0.01)
+    results = await asyncio.gather(
+        coalescer.async_call(controller.set_state, device_id="1", brightness=10),
+        coalescer.async_call(controller.set_state, device_id="1", on=True),
+        coalescer.async_call(controller.set_state, device_id="2", brightness=10),
+    )
+    assert sorted(results) == [1, 2, 3]
+    assert len(controller.calls) == 3
+    await coalescer.async_stop()
+
+
+@pytest.mark.asyncio
+async def test_async_call_device_order():
+    """Ensure a held command is not sent after a newer command to the device."""
+    controller = FakeController()
+    coalescer = CommandCoalescer(0.01)
+    controller.release.clear()
+    first = asyncio.create_task(
+        coalescer.async_call(
+            controller.set_state, device_id="1", on=True, brightness=50
+        )
+    )
+    await asyncio.sleep(0)
+    held = asyncio.create_task(
+        coalescer.async_call(
+            controller.set_state, device_id="1", on=True, brightness=60
+        )
+    )
+    await asyncio.sleep(0)
+    off = asyncio.create_task(
+        coalescer.async_call(controller.set_state, device_id="1", on=False)
+    )
+    await asyncio.sleep(0)
+    controller.release.set()
+    assert await asyncio.gather(first, held, off) == [1, 2, 3]
+    assert controller.calls == [
+        {"device_id": "1", "on": True, "brightness": 50},
+        {"device_id": "1", "on": True, "brightness": 60},
+        {"device_id": "1", "on": False},
+    ]
+    await coalescer.async_stop()
+
+
+@pytest.mark.asyncio
+async def test_async_call_disabled():
+    """Ensure every command is sent when the window is disabled."""
+    controller = FakeController()
+    coalescer = CommandCoalescer(0)
+    for val in (10, 20, 30):
+        await coalescer.async_call(controller.set_state, device_id="1", brightness=val)
+    assert len(controller.calls) == 3
+    await coalescer.async_stop()
+
+
+@pytest.mark.asyncio
+async def test_async_call_error_shared():
+    """Ensure every superseded caller receives the error."""
+    controller = FakeController()
+    coalescer = CommandCoalescer(0.01)
+    await coalescer.async_call(controller.set_state, device_id="1", fail=False)
+    burst = [
+        coalescer.async_call(controller.set_state, device_id="1", fail=val)
+        for val in (False, True)
+    ]
+    results = await asyncio.gather(*burst, return_exceptions=True)
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(controller.calls) == 2
+    await coalescer.async_stop()
+
+
+@pytest.mark.asyncio
+async def test_async_stop():
+    """Ensure pending commands are cancelled when stopping."""
+    controller = FakeController()
+    coalescer = CommandCoalescer(60)
+    await coalescer.async_call(controller.set_state, device_id="1", brightness=10)
+    pending = asyncio.create_task(
+        coalescer.async_call(controller.set_state, device_id="1", brightness=20)
+    )
+    await asyncio.sleep(0)
+    await coalescer.async_stop()
+    with pytest.raises(asyncio.CancelledError):
+        await pending
+    assert len(controller.calls) == 1
+
+
+def test_merge_states():
+    """Ensure the latest value for a function is sent."""
+    assert merge_states(
+        [
+            [
+                {"functionClass": "power", "functionInstance": None, "value": "on"},
+                {"functionClass": "toggle", "functionInstance": "a", "value": "on"},
+            ],
+            [
+                {"functionClass": "toggle", "functionInstance": "b", "value": "on"},
+                {"functionClass": "power", "functionInstance": None, "value": "off"},
+            ],
+        ]
+    ) == [
+        {"functionClass": "power", "functionInstance": None, "value": "off"},
+        {"functionClass": "toggle", "functionInstance": "a", "value": "on"},
+        {"functionClass": "toggle", "functionInstance": "b", "value": "on"},
+    ]
+
+
+class FakeApi:
+    """Record the state updates that reach the API."""
+
+    def __init__(self, rejected: tuple[str, ...] = ()) -> None:
+        """Initialize the API."""
+        self.calls: list[tuple[str, list[dict]]] = []
+        self.rejected = rejected
+
+    async def update_afero_api(self, device_id: str, states: list[dict]) -> str | bool:
+        """Send the states."""
+        self.calls.append((device_id, states))
+        if any(state["value"] in self.rejected for state in states):
+            return False
+        if any(state["value"] == "error" for state in states):
+            raise ValueError("bad request")
+        return f"response-{len(self.calls)}"
+
+
+def state(instance: str, value: str) -> dict:
+    """Generate an Afero state."""
+    return {"functionClass": "toggle", "functionInstance": instance, "value": value}
+
+
+@pytest.mark.asyncio
+async def test_async_send_batched():
+    """Ensure updates to the same device are sent as a single request."""
+    api = FakeApi()
+    batcher = CommandBatcher(0.01)
+    results = await asyncio.gather(
+        batcher.async_send(api.update_afero_api, "1", [state("a", "on")]),
+        batcher.async_send(api.update_afero_api, "1", [state("b", "on")]),
+        batcher.async_send(api.update_afero_api, "2", [state("a", "on")]),
+    )
+    assert results[0] == results[1]
+    assert results[0] != results[2]
+    assert sorted(api.calls) == [
+        ("1", [state("a", "on"), state("b", "on")]),
+        ("2", [state("a", "on")]),
+    ]
+    assert batcher.batched == 1
+    await batcher.async_stop()
+
+
+@pytest.mark.asyncio
+async def test_async_send_disabled():
+    """Ensure updates are sent immediately when the window is disabled."""
+    api = FakeApi()
+    batcher = CommandBatcher(0)
+    await asyncio.gather(
+        batcher.async_send(api.update_afero_api, "1", [state("a", "on")]),
+        batcher.async_send(api.update_afero_api, "1", [state("b", "on")]),
+    )
+    assert len(api.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_async_send_rejected():
+    """Ensure a rejected batch is retried per caller."""
+    api = FakeApi(rejected=("bad",))
+    batcher = CommandBatcher(0.01)
+    results = await asyncio.gather(
+        batcher.async_send(api.update_afero_api, "1", [state("a", "on")]),
+        batcher.async_send(api.update_afero_api, "1", [state("b", "bad")]),
+    )
+    assert results == ["response-2", False]
+    assert api.calls == [
+        ("1", [state("a", "on"), state("b", "bad")]),
+        ("1", [state("a", "on")]),
+        ("1", [state("b", "bad")]),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_async_send_error():
+    """Ensure every caller in the batch receives the error."""
+    api = FakeApi()
+    batcher = CommandBatcher(0.01)
+    results = await asyncio.gather(
+        batcher.async_send(api.update_afero_api, "1", [state("a", "on")]),
+        batcher.async_send(api.update_afero_api, "1", [state("b", "error")]),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(api.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_async_send_stop():
+    """Ensure queued updates are cancelled when stopping."""
+    api = FakeApi()
+    batcher = CommandBatcher(60)
+    pending = asyncio.create_task(
+        batcher.async_send(api.update_afero_api, "1", [state("a", "on")])
+    )
+    await asyncio.sleep(0)
+    await batcher.async_stop()
+    with pytest.raises(asyncio.CancelledError):
+        await pending
+    assert api.calls == []
+
+
+@pytest.mark.asyncio
+async def test_async_device_in_order():
+    """Ensure commands to the same device never overlap."""
+    scheduler = CommandScheduler(0)
+    events: list[str] = []
+
+    async def command(device_id: str, name: str) -> None:
+        async with scheduler.async_device(device_id):
+            events.append(f"start-{name}")
+            await asyncio.sleep(0.01)
+            events.append(f"end-{name}")
+
+    await asyncio.gather(
+        command("1", "a"), command("1", "b"), command("2", "c"), command("1", "d")
+    )
+    assert [event for event in events if not event.endswith("c")] == [
+        "start-a",
+        "end-a",
+        "start-b",
+        "end-b",
+        "start-d",
+        "end-d",
+    ]
+    # Other devices are not blocked
+    assert events.index("start-c") < events.index("end-a")
+
+
+@pytest.mark.asyncio
+async def test_async_slot_priority():
+    """Ensure waiting commands are sent before waiting polls."""
+    scheduler = CommandScheduler(1)
+    order: list[str] = []
+    release = asyncio.Event()
+
+    async def request(name: str, priority: RequestPriority) -> None:
+        async with scheduler.async_slot(priority):
+            order.append(name)
+            await release.wait()
+
+    first = asyncio.create_task(request("poll-1", RequestPriority.POLL))
+    await asyncio.sleep(0)
+    waiting = [
+        asyncio.create_task(request("poll-2", RequestPriority.POLL)),
+        asyncio.create_task(request("command-1", RequestPriority.COMMAND)),
+        asyncio.create_task(request("command-2", RequestPriority.COMMAND)),
+    ]
+    await asyncio.sleep(0)
+    assert scheduler.active == 1
+    assert scheduler.queued == 3
+    release.set()
+    await asyncio.gather(first, *waiting)
+    assert order == ["poll-1", "command-1", "command-2", "poll-2"]
+    assert scheduler.active == 0
+
+
+@pytest.mark.asyncio
+async def test_async_slot_cancelled():
+    """Ensure a cancelled request does not hold a slot."""
+    scheduler = CommandScheduler(1)
+    release = asyncio.Event()
+
+    async def request() -> None:
+        async with scheduler.async_slot(RequestPriority.COMMAND):
+            await release.wait()
+
+    first = asyncio.create_task(request())
+    await asyncio.sleep(0)
+    cancelled = asyncio.create_task(request())
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    release.set()
+    await first
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    assert scheduler.active == 0
+    await asyncio.wait_for(request(), 1)
+
+
+@pytest.mark.asyncio
+async def test_async_slot_disabled():
+    """Ensure requests are never queued without a cap."""
+    scheduler = CommandScheduler(0)
+    release = asyncio.Event()
+
+    async def request() -> None:
+        async with scheduler.async_slot(RequestPriority.POLL):
+            await release.wait()
+
+    tasks = [asyncio.create_task(request()) for _ in range(20)]
+    await asyncio.sleep(0)
+    assert scheduler.active == 20
+    assert scheduler.queued == 0
+    release.set()
+    await asyncio.gather(*tasks)
@@ -189,6 +189,39 @@ async def test_HubspaceConfigFlow_async_step_user(
         assert result["errors"]["base"] == expected_code
 
 
+@pytest.mark.asyncio
+async def test_HubspaceConfigFlow_async_step_user_other_client(
+    mocked_config_flow, hass
+):
+    """Ensure the same account can be added for each client."""
+    MockConfigEntry(
+        domain=const.DOMAIN,
+        data={
+            CONF_USERNAME: "cool",
+            CONF_PASSWORD: "beans",
+            const.CONF_CLIENT: "myko",
+        },
+        unique_id="myko-cool",
+    ).add_to_hass(hass)
+    await setup.async_setup_component(hass, const.DOMAIN, {})
+    result = await hass.config_entries.flow.async_init(
+        const.DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        user_input={
+            CONF_USERNAME: "cool",
+            CONF_PASSWORD: "beans",
+            POLLING_TIME_STR: const.DEFAULT_POLLING_INTERVAL_SEC,
+            CONF_TIMEOUT: const.DEFAULT_TIMEOUT,
+            const.CONF_CLIENT: const.DEFAULT_CLIENT,
+        },
+    )
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["result"].unique_id == "hubspace-cool"
+    assert len(hass.config_entries.async_entries(const.DOMAIN)) == 2
+
+
 @pytest.mark.parametrize(
     (
         "config_dict",
@@ -276,6 +309,84 @@ async def test_HubspaceConfigFlow_async_step_user_reauth(
         assert entry.options == expected_options
 
 
+CUSTOM_OPTIONS = {
+    POLLING_TIME_STR: 60,
+    CONF_TIMEOUT: 20,
+    const.CONF_POLLING_MIN: 10,
+    const.CONF_OPTIMISTIC: True,
+    const.CONF_POLL_RATE_LIMIT: 30,
+    const.CONF_MAX_CONCURRENT: 2,
+    const.CONF_DEDICATED_SESSION: True,
+    const.CONF_COALESCE_WRITES: True,
+}
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(sys.version_info <= (3, 13), reason="DNS issues on 3.12")
+async def test_HubspaceConfigFlow_reauth_keeps_options(mocked_config_flow, hass):
+    """Ensure options are unchanged by re-auth."""
+    await setup.async_setup_component(hass, const.DOMAIN, {})
+    entry = MockConfigEntry(
+        domain=const.DOMAIN,
+        data={
+            CONF_USERNAME: "cool",
+            CONF_PASSWORD: "beans",
+            const.CONF_CLIENT: const.DEFAULT_CLIENT,
+        },
+        options=CUSTOM_OPTIONS,
+        unique_id="hubspace-cool",
+        version=const.VERSION_MAJOR,
+    )
+    entry.add_to_hass(hass)
+    result = await hass.config_entries.flow.async_init(
+        const.DOMAIN,
+        context={"source": config_entries.SOURCE_REAUTH, "entry_id": entry.entry_id},
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], user_input={CONF_PASSWORD: "beans2"}
+    )
+    assert result["reason"] == "reauth_successful"
+    assert entry.data[CONF_PASSWORD] == "beans2"
+    assert entry.options == CUSTOM_OPTIONS
+
+
+@pytest.mark.asyncio
+async def test_HubspaceConfigFlow_add_again_keeps_options(mocked_config_flow, hass):
+    """Ensure adding an account again only updates the options of the form."""
+    await setup.async_setup_component(hass, const.DOMAIN, {})
+    entry = MockConfigEntry(
+        domain=const.DOMAIN,
+        data={
+            CONF_USERNAME: "cool",
+            CONF_PASSWORD: "beans",
+            const.CONF_CLIENT: const.DEFAULT_CLIENT,
+        },
+        options=CUSTOM_OPTIONS,
+        unique_id="hubspace-cool",
+        version=const.VERSION_MAJOR,
+    )
+    entry.add_to_hass(hass)
+    result = await hass.config_entries.flow.async_init(
+        const.DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        user_input={
+            CONF_USERNAME: "cool",
+            CONF_PASSWORD: "beans",
+            POLLING_TIME_STR: const.DEFAULT_POLLING_INTERVAL_SEC,
+            CONF_TIMEOUT: const.DEFAULT_TIMEOUT,
+            const.CONF_CLIENT: const.DEFAULT_CLIENT,
+        },
+    )
+    assert result["type"] is FlowResultType.ABORT
+    assert entry.options == {
+        **CUSTOM_OPTIONS,
+        POLLING_TIME_STR: const.DEFAULT_POLLING_INTERVAL_SEC,
+        CONF_TIMEOUT: const.DEFAULT_TIMEOUT,
+    }
+
+
 @pytest.mark.parametrize(
     (
         "config_dict",
@@ -301,8 +412,76 @@ async def test_HubspaceConfigFlow_async_step_user_reauth(
             {
                 POLLING_TIME_STR: const.DEFAULT_POLLING_INTERVAL_SEC,
                 CONF_TIMEOUT: const.DEFAULT_TIMEOUT,
+                const.CONF_POLLING_MIN: const.DEFAULT_POLLING_MIN_SEC,
+                const.CONF_POLLING_DECAY: const.DEFAULT_POLLING_DECAY_SEC,
+                const.CONF_COMMAND_WINDOW: const.DEFAULT_COMMAND_WINDOW_MS,
+                const.CONF_OPTIMISTIC: const.DEFAULT_OPTIMISTIC,
+                const.CONF_POLL_RATE_LIMIT: const.DEFAULT_POLL_RATE_LIMIT,
+                const.CONF_COMMAND_RATE_LIMIT: const.DEFAULT_COMMAND_RATE_LIMIT,
+                const.CONF_MAX_CONCURRENT: const.DEFAULT_MAX_CONCURRENT,
+                const.CONF_DEDICATED_SESSION: const.DEFAULT_DEDICATED_SESSION,
+                const.CONF_COALESCE_WRITES: const.DEFAULT_COALESCE_WRITES,
+                const.CONF_MIN_WRITE_INTERVAL: const.DEFAULT_MIN_WRITE_INTERVAL_SEC,
+            },
+            None,
+        ),
+        # Command polling is slower than idle polling
+        (
+            {
+                "data": {CONF_USERNAME: "cool", CONF_PASSWORD: "beans"},
+                "options": {
+                    POLLING_TIME_STR: const.DEFAULT_POLLING_INTERVAL_SEC,
+                    CONF_TIMEOUT: const.DEFAULT_TIMEOUT,
+                },
+                "unique_id": "cool",
+            },
+            {
+                POLLING_TIME_STR: 20,
+                CONF_TIMEOUT: const.DEFAULT_TIMEOUT,
+                const.CONF_POLLING_MIN: 45,
+                const.CONF_POLLING_DECAY: 120,
+                const.CONF_COMMAND_WINDOW: -50,
+                const.CONF_OPTIMISTIC: True,
+                const.CONF_POLL_RATE_LIMIT: 30,
+                const.CONF_COMMAND_RATE_LIMIT: -1,
+                const.CONF_MAX_CONCURRENT: 2,
+                const.CONF_DEDICATED_SESSION: True,
+                const.CONF_COALESCE_WRITES: True,
+                const.CONF_MIN_WRITE_INTERVAL: -5,
+            },
+            {
+                POLLING_TIME_STR: 20,
+                CONF_TIMEOUT: const.DEFAULT_TIMEOUT,
+                const.CONF_POLLING_MIN: 20,
+                const.CONF_POLLING_DECAY: 120,
+                const.CONF_COMMAND_WINDOW: 0,
+                const.CONF_OPTIMISTIC: True,
+                const.CONF_POLL_RATE_LIMIT: 30,
+                const.CONF_COMMAND_RATE_LIMIT: 0,
+                const.CONF_MAX_CONCURRENT: 2,
+                const.CONF_DEDICATED_SESSION: True,
+                const.CONF_COALESCE_WRITES: True,
+                const.CONF_MIN_WRITE_INTERVAL: 0,
+            },
+            None,
+        ),
+        # Command polling is too short
+        (
+            {
+                "data": {CONF_USERNAME: "cool", CONF_PASSWORD: "beans"},
+                "options": {
+                    POLLING_TIME_STR: const.DEFAULT_POLLING_INTERVAL_SEC,
+                    CONF_TIMEOUT: const.DEFAULT_TIMEOUT,
+                },
+                "unique_id": "cool",
+            },
+            {
+                POLLING_TIME_STR: const.DEFAULT_POLLING_INTERVAL_SEC,
+                CONF_TIMEOUT: const.DEFAULT_TIMEOUT,
+                const.CONF_POLLING_MIN: 1,
             },
             None,
+            "polling_too_short",
         ),
         # Too short
         (
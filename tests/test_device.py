@@ -4,6 +4,7 @@ from homeassistant.helpers import device_registry as dr
 import pytest
 
 from custom_components.hubspace import const
+from custom_components.hubspace.device import async_setup_devices
 
 from .utils import create_devices_from_data, hs_raw_from_dump
 
@@ -137,3 +138,47 @@ async def test_remove_on_startup(mocked_entry):
     await hass.config_entries.async_setup(entry.entry_id)
     device = device_reg.async_get_device(identifiers={(const.DOMAIN, "cool-beans")})
     assert device is None
+
+
+@pytest.mark.asyncio
+async def test_unchanged_devices_not_written(mocked_entry):
+    """Ensure the registry is only written when a device has changed."""
+    try:
+        hass, entry, bridge = mocked_entry
+        await bridge.generate_devices_from_data(fan_zandra)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        updates = []
+        hass.bus.async_listen(dr.EVENT_DEVICE_REGISTRY_UPDATED, updates.append)
+        await async_setup_devices(hass.data[const.DOMAIN][entry.entry_id])
+        await hass.async_block_till_done()
+        assert updates == []
+    finally:
+        await bridge.close()
+
+
+@pytest.mark.asyncio
+async def test_firmware_updated(mocked_entry):
+    """Ensure firmware changes reported after setup update the device."""
+    try:
+        hass, entry, bridge = mocked_entry
+        await bridge.generate_devices_from_data(fan_zandra)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        device_reg = dr.async_get(hass)
+        identifiers = {(const.DOMAIN, "2a3572cb-3fbf-4094-846e-f2ebcb10521a")}
+        device = device_reg.async_get_device(identifiers=identifiers)
+        assert device.sw_version == "1.0.0"
+        updated = next(
+            device
+            for device in create_devices_from_data("fan-ZandraFan.json")
+            if device.version_data
+        )
+        # Only the firmware changes, so aioafero does not emit an update
+        updated.version_data = {"applicationVersionString": "1.1.0"}
+        await bridge.generate_devices_from_data([updated])
+        await hass.async_block_till_done()
+        device = device_reg.async_get_device(identifiers=identifiers)
+        assert device.sw_version == "1.1.0"
+    finally:
+        await bridge.close()
@@ -0,0 +1,76 @@
+"""Test the diagnostics for a Hubspace account."""
+
+import logging
+
+import pytest
+
+from custom_components.hubspace.const import DOMAIN
+from custom_components.hubspace.diagnostics import async_get_config_entry_diagnostics
+
+from .utils import create_devices_from_data
+
+light_a21 = create_devices_from_data("light-a21.json")
+
+
+@pytest.mark.asyncio
+async def test_startup_diagnostics(mocked_entry, caplog):
+    """Ensure the time spent in each phase of setup is reported."""
+    hass, entry, bridge = mocked_entry
+    await bridge.generate_devices_from_data(light_a21)
+    with caplog.at_level(logging.DEBUG, logger="custom_components.hubspace"):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    startup = diagnostics["startup"]
+    assert list(startup["phases"]) == [
+        "snapshot",
+        "login",
+        "first_poll",
+        "devices",
+        "platforms",
+        "total",
+    ]
+    assert all(duration >= 0 for duration in startup["phases"].values())
+    assert startup["platforms"] == ["button", "light", "number", "sensor"]
+    assert startup["entities"]["light"] == 1
+    assert startup["entities"]["button"] == 2
+    assert f"Setup of {entry.title} took" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_performance_diagnostics(mocked_entry, mocker):
+    """Ensure runtime counters and anonymized devices are reported."""
+    hass, entry, bridge = mocked_entry
+    await bridge.generate_devices_from_data(light_a21)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    hs_bridge = hass.data[DOMAIN][entry.entry_id]
+    mocker.patch.object(bridge, "fetch_device_states", return_value=[])
+    mocker.patch.object(
+        hs_bridge.poll_scheduler, "due_devices", return_value={light_a21[0].id}
+    )
+    await hs_bridge.async_fetch_due_states()
+    hs_bridge.night_light_previous_modes[light_a21[0].id] = "color"
+    hs_bridge.night_light_was_on[light_a21[0].id] = True
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    polls = diagnostics["requests"]["polls"]
+    assert polls["requests"] == 1
+    assert polls["errors"] == 0
+    assert polls["latency_ms"]["p50"] is not None
+    assert diagnostics["requests"]["commands"]["requests"] == 0
+    assert diagnostics["rate_limits"]["polls"]["sent"] == 1
+    assert diagnostics["circuit"]["state"] == "closed"
+    assert diagnostics["routing"]["resources"] > 0
+    assert diagnostics["accounts"]["loaded"] == 1
+    lights = diagnostics["controllers"]["LightController"]
+    assert lights["resources"] == 1
+    assert lights["subscriptions"] > 0
+    # Device IDs are only reported anonymized
+    assert diagnostics["bridge"]["night_light_previous_modes"] == {"device-0": "color"}
+    assert diagnostics["bridge"]["night_light_was_on"] == {"device-0": True}
+    assert light_a21[0].id not in str(diagnostics)
+    assert len(diagnostics["devices"]) == 1
+    assert diagnostics["devices"][0]["id"] != light_a21[0].id
+    # The cached device must not be altered by the anonymization
+    assert bridge.get_afero_device(light_a21[0].id).id == light_a21[0].id
+    assert "password" not in str(diagnostics)
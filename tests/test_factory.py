@@ -0,0 +1,82 @@
+"""Test creating the entities for resource features."""
+
+from dataclasses import dataclass, field
+
+import pytest
+
+from custom_components.hubspace.factory import EntityFactory, controller_has_feature
+
+
+@dataclass
+class NumberResource:
+    """Resource that exposes numbers."""
+
+    id: str
+    numbers: dict = field(default_factory=dict)
+
+
+@dataclass
+class PlainResource:
+    """Resource without additional features."""
+
+    id: str
+
+
+class FakeController:
+    """Controller holding a list of resources."""
+
+    ITEM_SENSORS: dict = {}
+    ITEM_BINARY_SENSORS: dict = {}
+
+    def __init__(self, item_cls: type, resources: list) -> None:
+        """Initialize the controller."""
+        self.ITEM_CLS = item_cls
+        self._resources = resources
+
+    def __iter__(self):
+        """Iterate over the resources."""
+        return iter(self._resources)
+
+
+def build(controller, resource) -> list[str]:
+    """Create one entity per number."""
+    return [f"{resource.id}-{number}" for number in resource.numbers]
+
+
+@pytest.fixture
+def controllers() -> tuple[FakeController, FakeController]:
+    """Create controllers with and without numbers."""
+    return (
+        FakeController(
+            NumberResource,
+            [NumberResource("a", {"speed": 1}), NumberResource("b", {"max": 2})],
+        ),
+        FakeController(PlainResource, [PlainResource("c")]),
+    )
+
+
+def test_controller_has_feature(controllers):
+    """Ensure the features of a controller are determined from its resources."""
+    numbers, plain = controllers
+    assert controller_has_feature(numbers, "numbers")
+    assert not controller_has_feature(numbers, "selects")
+    assert not controller_has_feature(plain, "numbers")
+    assert not controller_has_feature(plain, "sensors")
+
+
+def test_register(controllers):
+    """Ensure the entities for every resource are added in a single batch."""
+    numbers, plain = controllers
+    factory = EntityFactory()
+    factory.async_index(controllers)
+    assert factory.index["numbers"] == [numbers]
+    assert factory.index["selects"] == []
+    added = []
+    unregister = factory.async_register("numbers", build, added.append)
+    assert added == [["a-speed", "b-max"]]
+    factory.async_resource_added(numbers, NumberResource("d", {"min": 0}))
+    factory.async_resource_added(plain, NumberResource("e", {"min": 0}))
+    assert added == [["a-speed", "b-max"], ["d-min"]]
+    unregister()
+    factory.async_resource_added(numbers, NumberResource("f", {"min": 0}))
+    assert len(added) == 2
@@ -2,7 +2,7 @@
 
 from aioafero.errors import InvalidAuth
 from homeassistant.const import CONF_PASSWORD, CONF_TIMEOUT, CONF_TOKEN, CONF_USERNAME
-from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import device_registry as dr, entity_registry as er
 import pytest
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
@@ -266,6 +266,43 @@ async def test_perform_v5_migration_from_v4(v4_config_entry):
     assert v4_config_entry[1].minor_version == 0
 
 
+@pytest.mark.asyncio
+async def test_perform_v6_migration_from_v5(v5_config_entry):
+    """Test configuration migration from v5 to v6."""
+    hass, entry = v5_config_entry
+    device_reg = dr.async_get(hass)
+    entity_reg = er.async_get(hass)
+    hub_device = device_reg.async_get_or_create(
+        config_entry_id=entry.entry_id, identifiers={(const.DOMAIN, "cool")}
+    )
+    sensor = entity_reg.async_get_or_create(
+        "sensor", const.DOMAIN, "cool-error_rate", config_entry=entry
+    )
+    light = entity_reg.async_get_or_create(
+        "light",
+        const.DOMAIN,
+        "2a3572cb-3fbf-4094-846e-f2ebcb10521a",
+        config_entry=entry,
+    )
+    await hubspace.perform_v6_migration(hass, entry)
+    assert entry.unique_id == "hubspace-cool"
+    assert entry.version == 6
+    assert entry.minor_version == 0
+    assert device_reg.async_get(hub_device.id).identifiers == {
+        (const.DOMAIN, "hubspace-cool")
+    }
+    assert (
+        entity_reg.async_get(sensor.entity_id).unique_id == "hubspace-cool-error_rate"
+    )
+    # Entity IDs are kept, so automations do not need to change
+    assert entity_reg.async_get(sensor.entity_id).entity_id == sensor.entity_id
+    # Device entities are not identified by the account
+    assert (
+        entity_reg.async_get(light.entity_id).unique_id
+        == "2a3572cb-3fbf-4094-846e-f2ebcb10521a"
+    )
+
+
 @pytest.mark.asyncio
 async def test_reload(hass, mocker):
     """Ensure we can reload the config entry."""
@@ -316,3 +353,17 @@ async def test_reload(hass, mocker):
         (dr.CONNECTION_NETWORK_MAC, "abbc66b9-d102-4404-9b14-f7d62fec1d2c"),
         (dr.CONNECTION_BLUETOOTH, "cb948b76-713f-4a20-8ad4-2abc97b402c8"),
     }
+
+
+@pytest.mark.asyncio
+async def test_async_remove_entry(hass, hass_storage, v4_config_entry):
+    """Ensure the discovery snapshot is removed with the entry."""
+    hass, entry = v4_config_entry
+    key = f"{const.DOMAIN}.{entry.entry_id}.discovery"
+    hass_storage[key] = {
+        "version": 1,
+        "key": key,
+        "data": {"temperature_unit": "celsius", "devices": []},
+    }
+    await hubspace.async_remove_entry(hass, entry)
+    assert key not in hass_storage
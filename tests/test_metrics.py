@@ -0,0 +1,104 @@
+"""Test the tracking of request latency."""
+
+import pytest
+
+from custom_components.hubspace.metrics import (
+    LatencyStats,
+    get_error_rate,
+    get_request_rate,
+)
+
+from .test_polling import FakeClock
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Clock used to time requests."""
+    return FakeClock()
+
+
+def test_percentiles():
+    """Ensure percentiles use the nearest sample."""
+    stats = LatencyStats(100)
+    assert stats.percentile(50) is None
+    for latency in range(1, 11):
+        stats.record(latency / 10)
+    assert stats.percentile(50) == 0.5
+    assert stats.percentile(90) == 0.9
+    assert stats.percentile(99) == 1.0
+    assert stats.percentile(0) == 0.1
+
+
+def test_max_samples():
+    """Ensure only the most recent latencies are kept."""
+    stats = LatencyStats(3)
+    for latency in (10, 1, 2, 3):
+        stats.record(latency)
+    assert stats.percentile(100) == 3
+    assert stats.requests == 4
+
+
+def test_measure(clock):
+    """Ensure the time taken and outcome of a request are recorded."""
+    stats = LatencyStats(10, clock=clock)
+    with stats.measure():
+        assert stats.in_flight == 1
+        clock.now += 0.25
+
+    def fail() -> None:
+        clock.now += 1.5
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"), stats.measure():
+        fail()
+    # Requests can fail without raising
+    with stats.measure() as request:
+        clock.now += 0.25
+        request.failed = True
+    assert stats.in_flight == 0
+    assert stats.as_dict() == {
+        "requests": 3,
+        "errors": 2,
+        "samples": 3,
+        "latency_ms": {"p50": 250.0, "p90": 1500.0, "p99": 1500.0},
+    }
+
+
+def test_as_dict_empty():
+    """Ensure stats without any requests can be reported."""
+    assert LatencyStats(10).as_dict() == {
+        "requests": 0,
+        "errors": 0,
+        "samples": 0,
+        "latency_ms": {"p50": None, "p90": None, "p99": None},
+    }
+
+
+def test_rates(clock):
+    """Ensure only recent requests count towards the rates."""
+    polls = LatencyStats(10, clock=clock)
+    commands = LatencyStats(10, clock=clock)
+    assert get_request_rate([polls, commands], 60) == 0
+    assert get_error_rate([polls, commands], 60) is None
+    polls.record(0.1, error=True)
+    clock.now += 61
+    polls.record(0.1)
+    polls.record(0.1)
+    commands.record(0.1)
+    commands.record(0.1, error=True)
+    assert get_request_rate([polls, commands], 60) == 4
+    assert get_error_rate([polls, commands], 60) == 25.0
+    clock.now += 61
+    assert get_request_rate([polls, commands], 60) == 0
+
+
+def test_rates_not_capped(clock):
+    """Ensure the rates count more requests than the samples kept."""
+    stats = LatencyStats(10, clock=clock)
+    for request in range(100):
+        stats.record(0.1, error=request % 4 == 0)
+        clock.now += 0.5
+    assert get_request_rate([stats], 60) == 100
+    assert get_error_rate([stats], 60) == 25.0
+    clock.now += 30
+    assert get_request_rate([stats], 60) == 60
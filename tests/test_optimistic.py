@@ -0,0 +1,44 @@
+"""Test tracking of optimistic entity states."""
+
+from datetime import timedelta
+
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.hubspace.optimistic import ExpectationTracker
+
+
+@pytest.mark.asyncio
+async def test_expect(hass, mocker):
+    """Ensure a new expectation replaces the pending one."""
+    tracker = ExpectationTracker(hass, 10)
+    first_expired = mocker.Mock()
+    second_expired = mocker.Mock()
+    tracker.expect("entity-1", "dev-1", {"is_on": True}, first_expired)
+    expected = tracker.expect("entity-1", "dev-1", {"is_on": False}, second_expired)
+    assert len(tracker) == 1
+    assert tracker.get("entity-1").values == {"is_on": False}
+    # Only sent commands wait on a poll
+    assert tracker.pending_devices == set()
+    expected.sent = True
+    assert tracker.pending_devices == {"dev-1"}
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done()
+    first_expired.assert_not_called()
+    second_expired.assert_called_once()
+    assert tracker.get("entity-1") is None
+
+
+@pytest.mark.asyncio
+async def test_stop(hass, mocker):
+    """Ensure expectations do not expire once stopped."""
+    tracker = ExpectationTracker(hass, 10)
+    expired = mocker.Mock()
+    tracker.expect("entity-1", "dev-1", {"is_on": True}, expired)
+    tracker.expect("entity-2", "dev-1", {"is_on": True}, expired)
+    tracker.stop()
+    assert len(tracker) == 0
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done()
+    expired.assert_not_called()
@@ -0,0 +1,153 @@
+"""Test the adaptive polling scheduler."""
+
+from aioafero import AferoState
+import pytest
+
+from custom_components.hubspace import const
+from custom_components.hubspace.polling import (
+    PollScheduler,
+    get_poll_tier,
+    get_states_fingerprint,
+)
+
+from .utils import create_devices_from_data
+
+
+class FakeClock:
+    """Controllable monotonic clock."""
+
+    def __init__(self) -> None:
+        """Initialize the clock."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Clock used by the scheduler."""
+    return FakeClock()
+
+
+def test_min_is_capped_by_max(clock):
+    """Ensure the command interval is never slower than the idle interval."""
+    scheduler = PollScheduler(60, 30, 60, clock=clock)
+    assert scheduler.min_interval == 30
+    assert scheduler.tick == 30
+
+
+def test_idle_polling(clock):
+    """Ensure every device is polled on the idle interval."""
+    scheduler = PollScheduler(5, 30, 60, clock=clock)
+    devices = {"dev-1", "dev-2"}
+    clock.now = 29
+    assert scheduler.due_devices(devices) == set()
+    clock.now = 30
+    assert scheduler.due_devices(devices) == devices
+    clock.now = 35
+    assert scheduler.due_devices(devices) == set()
+    clock.now = 60
+    assert scheduler.due_devices(devices) == devices
+
+
+def test_command_boost_and_decay(clock):
+    """Ensure a commanded device is polled quickly then backs off."""
+    scheduler = PollScheduler(5, 100, 10, clock=clock)
+    devices = {"dev-1", "dev-2"}
+    clock.now = 1
+    scheduler.command_sent("dev-1")
+    assert scheduler.boosted_devices == {"dev-1"}
+    clock.now = 5
+    assert scheduler.due_devices(devices) == set()
+    # Within the decay window
+    clock.now = 6
+    assert scheduler.due_devices(devices) == {"dev-1"}
+    # Window has elapsed, the interval starts doubling
+    clock.now = 11
+    assert scheduler.due_devices(devices) == {"dev-1"}
+    clock.now = 20
+    assert scheduler.due_devices(devices) == set()
+    clock.now = 21
+    assert scheduler.due_devices(devices) == {"dev-1"}
+    clock.now = 41
+    assert scheduler.due_devices(devices) == {"dev-1"}
+    clock.now = 81
+    assert scheduler.due_devices(devices) == {"dev-1"}
+    assert scheduler.boosted_devices == {"dev-1"}
+    # The idle poll pushes the interval past the idle interval
+    clock.now = 100
+    assert scheduler.due_devices(devices) == devices
+    assert scheduler.boosted_devices == set()
+
+
+def test_untracked_boost_ignored(clock):
+    """Ensure commands for devices that are no longer tracked are not polled."""
+    scheduler = PollScheduler(5, 30, 60, clock=clock)
+    scheduler.command_sent("dev-1")
+    clock.now = 5
+    assert scheduler.due_devices({"dev-2"}) == set()
+
+
+def test_tick_uses_fastest_tier(clock):
+    """Ensure the scheduler checks often enough for the fastest tier."""
+    scheduler = PollScheduler(5, 30, 60, tier_intervals={"fast": 3}, clock=clock)
+    assert scheduler.tick == 3
+
+
+def test_tiered_polling(clock):
+    """Ensure each tier is polled on its own interval."""
+    scheduler = PollScheduler(
+        5, 30, 60, tier_intervals={"fast": 10, "slow": 120}, clock=clock
+    )
+    devices = {"dev-fast", "dev-slow", "dev-default"}
+    tiers = {"dev-fast": "fast", "dev-slow": "slow"}
+    clock.now = 10
+    assert scheduler.due_devices(devices, tiers) == {"dev-fast"}
+    clock.now = 20
+    assert scheduler.due_devices(devices, tiers) == {"dev-fast"}
+    clock.now = 30
+    assert scheduler.due_devices(devices, tiers) == {"dev-fast", "dev-default"}
+    clock.now = 35
+    assert scheduler.due_devices(devices, tiers) == set()
+    # Commanded devices are polled regardless of their tier
+    scheduler.command_sent("dev-slow")
+    clock.now = 40
+    assert scheduler.due_devices(devices, tiers) == {"dev-fast", "dev-slow"}
+    clock.now = 120
+    assert scheduler.due_devices(devices, tiers) == devices
+
+
+@pytest.mark.parametrize(
+    ("file_name", "index", "expected"),
+    [
+        ("fan-exhaust-fan.json", 2, const.POLLING_TIER_FAST),
+        ("fan-exhaust-fan.json", 3, None),
+        ("freezer.json", 0, const.POLLING_TIER_SLOW),
+        ("door-lock-TBD.json", 0, const.POLLING_TIER_SLOW),
+        ("light-a21.json", 0, None),
+    ],
+)
+def test_get_poll_tier(file_name, index, expected):
+    """Ensure devices are placed in the correct polling tier."""
+    device = create_devices_from_data(file_name)[index]
+    assert get_poll_tier(device) == expected
+
+
+def test_get_states_fingerprint():
+    """Ensure only the reported values contribute to the fingerprint."""
+    power = AferoState(functionClass="power", value="on", lastUpdateTime=1)
+    speed = AferoState(
+        functionClass="fan-speed",
+        functionInstance="fan-speed",
+        value={"value": 50},
+        lastUpdateTime=1,
+    )
+    fingerprint = get_states_fingerprint([power, speed])
+    assert get_states_fingerprint([speed, power]) == fingerprint
+    power_later = AferoState(functionClass="power", value="on", lastUpdateTime=2)
+    assert get_states_fingerprint([power_later, speed]) == fingerprint
+    power_off = AferoState(functionClass="power", value="off", lastUpdateTime=1)
+    assert get_states_fingerprint([power_off, speed]) != fingerprint
+    assert get_states_fingerprint([power]) != fingerprint
@@ -0,0 +1,152 @@
+"""Test the protection of the Afero API during outages."""
+
+import pytest
+
+from custom_components.hubspace.resilience import (
+    CircuitBreaker,
+    CircuitState,
+    RateLimitExceeded,
+    TokenBucket,
+)
+
+from .test_polling import FakeClock
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Clock used by the circuit breaker."""
+    return FakeClock()
+
+
+@pytest.fixture(autouse=True)
+def no_jitter(mocker):
+    """Use the full backoff so timings are predictable."""
+    mocker.patch(
+        "custom_components.hubspace.resilience.random.uniform",
+        side_effect=lambda low, high: high,
+    )
+
+
+def test_opens_after_threshold(clock, mocker):
+    """Ensure the circuit only opens after consecutive failures."""
+    on_change = mocker.Mock()
+    circuit = CircuitBreaker(3, 10, 100, on_change=on_change, clock=clock)
+    circuit.record_failure()
+    circuit.record_failure()
+    circuit.record_success()
+    circuit.record_failure()
+    circuit.record_failure()
+    assert circuit.state == CircuitState.CLOSED
+    assert circuit.allow()
+    circuit.record_failure()
+    assert circuit.state == CircuitState.OPEN
+    assert not circuit.available
+    on_change.assert_called_once_with(CircuitState.OPEN)
+    assert not circuit.allow()
+    assert circuit.rejected == 1
+    assert circuit.retry_in == 10
+
+
+def test_single_probe(clock):
+    """Ensure only one request is sent once the backoff has elapsed."""
+    circuit = CircuitBreaker(1, 10, 100, clock=clock)
+    circuit.record_failure()
+    clock.now = 10
+    assert circuit.allow()
+    assert circuit.state == CircuitState.HALF_OPEN
+    assert not circuit.available
+    assert not circuit.allow()
+    circuit.record_success()
+    assert circuit.state == CircuitState.CLOSED
+    assert circuit.allow()
+
+
+def test_probe_failure_backoff(clock):
+    """Ensure a failed probe doubles the backoff up to the maximum."""
+    circuit = CircuitBreaker(1, 10, 25, clock=clock)
+    circuit.record_failure()
+    for expected in (20, 25, 25):
+        clock.now += circuit.retry_in
+        assert circuit.allow()
+        circuit.record_failure()
+        assert circuit.state == CircuitState.OPEN
+        assert circuit.retry_in == expected
+
+
+def test_stale_probe(clock):
+    """Ensure another probe is allowed if the previous never reports back."""
+    circuit = CircuitBreaker(1, 10, 100, clock=clock)
+    circuit.record_failure()
+    clock.now = 10
+    assert circuit.allow()
+    clock.now = 19
+    assert not circuit.allow()
+    clock.now = 20
+    assert circuit.allow()
+    assert circuit.state == CircuitState.HALF_OPEN
+
+
+@pytest.fixture
+def sleeps(clock, mocker) -> list[float]:
+    """Advance the clock instead of sleeping."""
+    waits: list[float] = []
+
+    async def sleep(delay: float) -> None:
+        waits.append(delay)
+        clock.now += delay
+
+    mocker.patch("custom_components.hubspace.resilience.asyncio.sleep", sleep)
+    return waits
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_burst(clock, sleeps):
+    """Ensure requests over the burst are delayed to the configured rate."""
+    bucket = TokenBucket(60, 2, clock=clock)
+    for _ in range(4):
+        await bucket.async_acquire()
+    assert sleeps == [1, 1]
+    assert bucket.sent == 4
+    assert bucket.delayed == 2
+    assert bucket.delay_total == 2
+    # Tokens never exceed the burst
+    clock.now += 60
+    for _ in range(3):
+        await bucket.async_acquire()
+    assert sleeps == [1, 1, 1]
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_reserved(clock, sleeps):
+    """Ensure concurrent requests wait in the order they arrived."""
+    bucket = TokenBucket(60, 1, clock=clock)
+    await bucket.async_acquire()
+    # Reserve tokens without advancing the clock between requests
+    bucket.tokens -= 1
+    await bucket.async_acquire()
+    assert sleeps == [2]
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_max_wait(clock, sleeps):
+    """Ensure requests that would wait too long are rejected."""
+    bucket = TokenBucket(6, 1, clock=clock)
+    await bucket.async_acquire(max_wait=5)
+    with pytest.raises(RateLimitExceeded, match="retry in 10 seconds"):
+        await bucket.async_acquire(max_wait=5)
+    assert bucket.throttled == 1
+    assert sleeps == []
+    clock.now = 5
+    await bucket.async_acquire(max_wait=5)
+    assert sleeps == [5]
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_disabled(clock, sleeps):
+    """Ensure requests are never delayed when the limit is disabled."""
+    bucket = TokenBucket(0, 1, clock=clock)
+    assert not bucket.enabled
+    for _ in range(5):
+        await bucket.async_acquire(max_wait=0)
+    assert bucket.sent == 5
+    assert sleeps == []
@@ -0,0 +1,81 @@
+"""Test routing resource updates to entities."""
+
+from aioafero import AferoState
+import pytest
+
+from custom_components.hubspace.const import DOMAIN
+from custom_components.hubspace.routing import (
+    entity_changed,
+    get_changed_functions,
+    get_function_values,
+)
+
+from .utils import create_devices_from_data, modify_state
+
+transformer = create_devices_from_data("transformer.json")[0]
+
+
+def test_get_changed_functions():
+    """Ensure only the functions whose values differ are reported."""
+    previous = get_function_values(transformer.states)
+    updated = create_devices_from_data("transformer.json")[0]
+    modify_state(
+        updated,
+        AferoState(functionClass="watts", functionInstance=None, value=66),
+    )
+    current = get_function_values(updated.states)
+    assert get_changed_functions(previous, current) == {("watts", None)}
+    # Nothing changed so every entity must be updated
+    assert get_changed_functions(previous, previous) is None
+    assert get_changed_functions(None, current) is None
+    assert get_changed_functions(previous, None) is None
+
+
+@pytest.mark.parametrize(
+    ("functions", "changed", "expected"),
+    [
+        (None, {("watts", None)}, True),
+        (frozenset({("watts", None)}), {("watts", None)}, True),
+        (frozenset({("toggle", None)}), {("toggle", "zone-1")}, True),
+        (frozenset({("toggle", "zone-2")}), {("toggle", "zone-1")}, False),
+        (frozenset({("toggle", "zone-2")}), {("toggle", "zone-2")}, True),
+        (frozenset({("watts", None)}), {("output-voltage-switch", None)}, False),
+        (frozenset({("watts", None)}), {("available", None)}, True),
+    ],
+)
+def test_entity_changed(functions, changed, expected):
+    """Ensure entities are only updated for the functions they render."""
+    assert entity_changed(functions, changed) is expected
+
+
+@pytest.mark.asyncio
+async def test_routed_updates(mocked_entry):
+    """Ensure entities that do not render a changed function are skipped."""
+    hass, entry, bridge = mocked_entry
+    await bridge.generate_devices_from_data([transformer])
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    router = hass.data[DOMAIN][entry.entry_id].router
+    # The device and switch controllers each track the transformer
+    assert router.resource_count == 2
+    # Entities are looked up by the router rather than subscribing to the
+    # resource themselves
+    assert not bridge.switches.subscribers.get(transformer.id)
+    assert not bridge.devices.subscribers.get(transformer.id)
+    switch_subscriptions = len(bridge.switches.subscribers["*"])
+    updated = create_devices_from_data("transformer.json")[0]
+    modify_state(
+        updated,
+        AferoState(functionClass="watts", functionInstance=None, value=66),
+    )
+    await bridge.generate_devices_from_data([updated])
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.friendly_device_6_watts").state == "66"
+    # The zones render every function, but the voltage sensor is skipped
+    assert router.routed == 4
+    assert router.skipped == 1
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert router.resource_count == 0
+    assert len(bridge.switches.subscribers["*"]) < switch_subscriptions
+    await bridge.close()
@@ -142,6 +142,7 @@ async def test_security_sensor_select(mocked_entry):
     alarm_panel = create_devices_from_data("security-system.json")[1]
     await bridge.generate_devices_from_data([alarm_panel])
     await bridge.async_block_until_done()
+    await hass.async_block_till_done()
     await hass.services.async_call(
         "select",
         "select_option",
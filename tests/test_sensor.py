@@ -13,6 +13,11 @@ transformer_watts = "sensor.friendly_device_6_watts"
 transformer_rssi = "sensor.friendly_device_6_wifi_rssi"
 lock = create_devices_from_data("door-lock-TBD.json")[0]
 lock_battery = "sensor.friendly_device_0_battery_level"
+duration_sensor = "sensor.hubspace_api_username_last_poll_duration"
+last_poll_sensor = "sensor.hubspace_api_username_last_successful_poll"
+requests_sensor = "sensor.hubspace_api_username_requests_per_minute"
+error_rate_sensor = "sensor.hubspace_api_username_error_rate"
+in_flight_sensor = "sensor.hubspace_api_username_commands_in_flight"
 
 
 @pytest.fixture
@@ -133,3 +138,39 @@ async def test_get_sensors(mocked_entry, mocker, caplog):
         "Unknown sensor not-a-sensor found in SwitchController friendly-device-6. Please open a bug report"
         in caplog.text
     )
+
+
+@pytest.mark.asyncio
+async def test_health_sensors(mocked_entry, mocker):
+    """Ensure the health of the API is reported on the hub device."""
+    hass, entry, bridge = mocked_entry
+    await bridge.generate_devices_from_data(transformer_from_file)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    entity_reg = er.async_get(hass)
+    for entity_id in [
+        duration_sensor,
+        last_poll_sensor,
+        requests_sensor,
+        error_rate_sensor,
+        in_flight_sensor,
+    ]:
+        ent = entity_reg.async_get(entity_id)
+        assert ent is not None
+        assert ent.entity_category == "diagnostic"
+        # The same account may be added for each client
+        assert ent.unique_id.startswith("hubspace-username-")
+    assert hass.states.get(duration_sensor).state == "unknown"
+    assert hass.states.get(error_rate_sensor).state == "unknown"
+    assert hass.states.get(in_flight_sensor).state == "0"
+    hs_bridge = hass.data["hubspace"][entry.entry_id]
+    mocker.patch.object(bridge, "fetch_device_states", return_value=[])
+    mocker.patch.object(
+        hs_bridge.poll_scheduler, "due_devices", return_value={transformer.id}
+    )
+    await hs_bridge.async_fetch_due_states()
+    await hass.async_block_till_done()
+    assert float(hass.states.get(duration_sensor).state) >= 0
+    assert hass.states.get(last_poll_sensor).state != "unknown"
+    assert hass.states.get(requests_sensor).state == "1"
+    assert hass.states.get(error_rate_sensor).state == "0.0"
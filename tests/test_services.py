@@ -1,7 +1,9 @@
 """Test the integration between Home Assistant Services and Afero devices."""
 
 from aioafero import AferoState
+from homeassistant.config_entries import ConfigEntryState
 from homeassistant.const import CONF_PASSWORD, CONF_TIMEOUT, CONF_TOKEN, CONF_USERNAME
+from homeassistant.exceptions import HomeAssistantError
 import pytest
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 import voluptuous as vol
@@ -16,8 +18,14 @@ from custom_components.hubspace.const import (
     VERSION_MAJOR,
     VERSION_MINOR,
 )
+from custom_components.hubspace.resilience import RateLimitExceeded
 
-from .utils import create_devices_from_data, modify_state
+from .utils import (
+    create_devices_from_data,
+    get_mocked_bridge,
+    get_mocked_entry,
+    modify_state,
+)
 
 fan_zandra = create_devices_from_data("fan-ZandraFan.json")
 fan_zandra_light = fan_zandra[1]
@@ -148,6 +156,31 @@ async def test_service_valid_no_username(
                 assert f"No bridge using account {account}" in caplog.text
 
 
+@pytest.mark.asyncio
+async def test_service_rate_limited(mocked_entity, mocker):
+    """Ensure commands over the rate limit raise a Home Assistant error."""
+    hass, _, bridge = mocked_entity
+    mocker.patch.object(
+        bridge.lights,
+        "update_afero_api",
+        side_effect=RateLimitExceeded(
+            "Too many requests to the Hubspace API, retry in 12 seconds"
+        ),
+    )
+    with pytest.raises(HomeAssistantError, match="retry in 12 seconds"):
+        await hass.services.async_call(
+            const.DOMAIN,
+            services.SERVICE_SEND_COMMAND,
+            service_data={
+                "entity_id": [fan_zandra_light_id],
+                "value": "off",
+                "function_class": "power",
+                "function_instance": "light-power",
+            },
+            blocking=True,
+        )
+
+
 async def test_service_deprecated_args(hass, mocker, mocked_bridge, caplog):
     """Ensure the deprecated argument warning is not present."""
     entry = MockConfigEntry(
@@ -175,3 +208,79 @@ async def test_service_deprecated_args(hass, mocker, mocked_bridge, caplog):
         "The deprecated argument hass was passed to verify_domain_control from hubspace. It will be removed in HA Core 2026.10."
         not in caplog.text
     )
+
+
+@pytest.mark.asyncio
+async def test_service_uses_entity_account(hass, mocked_bridge, mocker):
+    """Ensure commands are sent by the account that owns the entity."""
+    bridge = mocked_bridge
+    # The same email on another client, added first
+    other_bridge = get_mocked_bridge(mocker)
+    await other_bridge.initialize()
+    other_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "username",
+            CONF_PASSWORD: "password",
+            CONF_TOKEN: "mock-token",
+            CONF_CLIENT: "myko",
+        },
+        options={
+            CONF_TIMEOUT: 30,
+            POLLING_TIME_STR: DEFAULT_POLLING_INTERVAL_SEC,
+        },
+        version=VERSION_MAJOR,
+        minor_version=VERSION_MINOR,
+    )
+    other_entry.add_to_hass(hass)
+    hass, entry, bridge = get_mocked_entry(hass, mocker, bridge)
+    mocker.patch(
+        "custom_components.hubspace.bridge.AferoBridgeV1",
+        side_effect=lambda *args, **kwargs: (
+            other_bridge if kwargs["afero_client"] == "myko" else bridge
+        ),
+    )
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert other_entry.state is ConfigEntryState.LOADED
+    await bridge.generate_devices_from_data(fan_zandra)
+    await hass.async_block_till_done()
+    send = mocker.patch.object(bridge, "send_service_request")
+    other_send = mocker.patch.object(other_bridge, "send_service_request")
+    service_data = {
+        "entity_id": [fan_zandra_light_id],
+        "value": "off",
+        "function_class": "power",
+        "function_instance": "light-power",
+        "account": "username",
+    }
+    await hass.services.async_call(
+        const.DOMAIN,
+        services.SERVICE_SEND_COMMAND,
+        service_data=service_data,
+        blocking=True,
+    )
+    send.assert_called_once_with(
+        device_id=fan_zandra_light.id,
+        states=[
+            {
+                "value": "off",
+                "functionClass": "power",
+                "functionInstance": "light-power",
+            }
+        ],
+    )
+    other_send.assert_not_called()
+    # Commands are rejected while the account is unable to reach Hubspace
+    hubspace_bridge = hass.data[DOMAIN][entry.entry_id]
+    for _ in range(3):
+        hubspace_bridge.circuit.record_failure()
+    with pytest.raises(HomeAssistantError, match="Hubspace API is unavailable"):
+        await hass.services.async_call(
+            const.DOMAIN,
+            services.SERVICE_SEND_COMMAND,
+            service_data=service_data,
+            blocking=True,
+        )
+    assert send.call_count == 1
+    await other_bridge.close()
@@ -0,0 +1,50 @@
+"""Test the persisted discovery snapshot."""
+
+from datetime import timedelta
+
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.hubspace.const import SNAPSHOT_SAVE_DELAY_SEC
+from custom_components.hubspace.snapshot import DiscoverySnapshot
+
+devices = [{"id": "device-1", "typeId": "metadevice.device"}]
+
+
+@pytest.mark.asyncio
+async def test_save_and_load(hass, hass_storage):
+    """Ensure the payload is written after the delay and can be loaded."""
+    snapshot = DiscoverySnapshot(hass, "entry-1")
+    snapshot.async_save("celsius", devices)
+    await hass.async_block_till_done()
+    assert "hubspace.entry-1.discovery" not in hass_storage
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=SNAPSHOT_SAVE_DELAY_SEC)
+    )
+    await hass.async_block_till_done()
+    assert hass_storage["hubspace.entry-1.discovery"]["data"] == {
+        "temperature_unit": "celsius",
+        "devices": devices,
+    }
+    assert await DiscoverySnapshot(hass, "entry-1").async_load("celsius") == {
+        "temperature_unit": "celsius",
+        "devices": devices,
+    }
+    # Temperatures would be reported in the wrong unit
+    assert await DiscoverySnapshot(hass, "entry-1").async_load("fahrenheit") is None
+    # Snapshots are per-account
+    assert await DiscoverySnapshot(hass, "entry-2").async_load("celsius") is None
+
+
+@pytest.mark.asyncio
+async def test_remove(hass, hass_storage):
+    """Ensure the snapshot is removed."""
+    hass_storage["hubspace.entry-1.discovery"] = {
+        "version": 1,
+        "key": "hubspace.entry-1.discovery",
+        "data": {"temperature_unit": "celsius", "devices": devices},
+    }
+    snapshot = DiscoverySnapshot(hass, "entry-1")
+    await snapshot.async_remove()
+    assert "hubspace.entry-1.discovery" not in hass_storage
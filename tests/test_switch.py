@@ -1,9 +1,22 @@
 """Test the integration between Home Assistant Switches and Afero devices."""
 
+from datetime import timedelta
+
+from aioafero import AferoState
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
 import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.hubspace.const import (
+    CONF_OPTIMISTIC,
+    DOMAIN,
+    OPTIMISTIC_TIMEOUT_SEC,
+)
+from custom_components.hubspace.entity import HubspaceBaseEntity
 
-from .utils import create_devices_from_data, hs_raw_from_dump
+from .utils import create_devices_from_data, hs_raw_from_dump, modify_state
 
 transformer_from_file = create_devices_from_data("transformer.json")
 transformer = transformer_from_file[0]
@@ -27,6 +40,20 @@ async def mocked_entity(mocked_entry):
     await bridge.close()
 
 
+@pytest.fixture
+async def mocked_entity_optimistic(mocked_entry, mocker):
+    """Initialize a mocked Switch with optimistic updates enabled."""
+    hass, entry, bridge = mocked_entry
+    hass.config_entries.async_update_entry(
+        entry, options={**entry.options, CONF_OPTIMISTIC: True}
+    )
+    await bridge.generate_devices_from_data(hs_switch_from_file)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    yield hass, entry, bridge
+    await bridge.close()
+
+
 @pytest.fixture
 async def mocked_entity_toggled(mocked_entry):
     """Initialize a mocked instanced Switch and register it within Home Assistant."""
@@ -237,3 +264,164 @@ async def test_light_speaker_power(mocked_light_speaker):
     test_switch = hass.states.get(speaker_light_id)
     assert test_switch is not None
     assert test_switch.state == "on"
+
+
+def switch_with_power(value: str):
+    """Generate the switch with the given power state."""
+    switch = create_devices_from_data("switch-HPSA11CWB.json")[0]
+    modify_state(
+        switch, AferoState(functionClass="power", functionInstance=None, value=value)
+    )
+    return switch
+
+
+@pytest.mark.asyncio
+async def test_turn_on_optimistic(mocked_entity_optimistic, mocker):
+    """Ensure the expected state is shown before Hubspace responds."""
+    hass, entry, bridge = mocked_entity_optimistic
+    states_during_call = []
+
+    async def set_state(**kwargs):
+        states_during_call.append(hass.states.get(hs_switch_id).state)
+
+    mocker.patch.object(bridge.switches, "set_state", side_effect=set_state)
+    await hass.services.async_call(
+        "switch", "turn_on", {"entity_id": hs_switch_id}, blocking=True
+    )
+    assert states_during_call == ["on"]
+    assert hass.states.get(hs_switch_id).state == "on"
+    # Hubspace confirms the state
+    await bridge.generate_devices_from_data([switch_with_power("on")])
+    await hass.async_block_till_done()
+    assert hass.states.get(hs_switch_id).state == "on"
+    assert len(hass.data[DOMAIN][entry.entry_id].expectations) == 0
+
+
+@pytest.mark.asyncio
+async def test_turn_on_optimistic_contradicted(
+    mocked_entity_optimistic, mocker, caplog
+):
+    """Ensure the entity reverts when Hubspace reports a different state."""
+    hass, entry, bridge = mocked_entity_optimistic
+    mocker.patch.object(bridge.switches, "set_state")
+    await hass.services.async_call(
+        "switch", "turn_on", {"entity_id": hs_switch_id}, blocking=True
+    )
+    assert hass.states.get(hs_switch_id).state == "on"
+    # Poll returns the same state that was already known
+    hubspace_bridge = hass.data[DOMAIN][entry.entry_id]
+    mocker.patch.object(
+        hubspace_bridge.poll_scheduler, "due_devices", return_value={hs_switch.id}
+    )
+    mocker.patch.object(
+        bridge,
+        "fetch_device_states",
+        return_value=switch_with_power("off").states,
+    )
+    assert await hubspace_bridge.async_fetch_due_states() == []
+    await bridge.async_block_until_done()
+    await hass.async_block_till_done()
+    assert hass.states.get(hs_switch_id).state == "off"
+    assert "Expected is_on of switch.basement_furnace_switch to be True" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_turn_on_optimistic_timeout(mocked_entity_optimistic, mocker, caplog):
+    """Ensure the entity reverts when Hubspace never confirms the state."""
+    hass, entry, bridge = mocked_entity_optimistic
+    mocker.patch.object(bridge.switches, "set_state")
+    await hass.services.async_call(
+        "switch", "turn_on", {"entity_id": hs_switch_id}, blocking=True
+    )
+    assert hass.states.get(hs_switch_id).state == "on"
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=OPTIMISTIC_TIMEOUT_SEC + 1)
+    )
+    await hass.async_block_till_done()
+    assert hass.states.get(hs_switch_id).state == "off"
+    assert "was not confirmed by Hubspace" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_turn_on_optimistic_failed(mocked_entity_optimistic, mocker):
+    """Ensure the entity reverts when the command fails."""
+    hass, entry, bridge = mocked_entity_optimistic
+    mocker.patch.object(bridge.switches, "set_state", side_effect=ValueError("boom"))
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(
+            "switch", "turn_on", {"entity_id": hs_switch_id}, blocking=True
+        )
+    assert hass.states.get(hs_switch_id).state == "off"
+    assert len(hass.data[DOMAIN][entry.entry_id].expectations) == 0
+
+
+@pytest.mark.asyncio
+async def test_unavailable_during_outage(mocked_entity):
+    """Ensure entities are unavailable while the API is unreachable."""
+    hass, entry, bridge = mocked_entity
+    hubspace_bridge = hass.data[DOMAIN][entry.entry_id]
+    for _ in range(3):
+        hubspace_bridge.circuit.record_failure()
+    await hass.async_block_till_done()
+    assert hass.states.get(hs_switch_id).state == "unavailable"
+    hubspace_bridge.circuit.record_success()
+    await hass.async_block_till_done()
+    assert hass.states.get(hs_switch_id).state == "off"
+
+
+@pytest.mark.asyncio
+async def test_unchanged_state_not_written(mocked_entity_toggled):
+    """Ensure entities only write their state when it has changed."""
+    hass, entry, bridge = mocked_entity_toggled
+    zone_1_reported = hass.states.get(transformer_entity_zone_1).last_reported
+    zone_2_reported = hass.states.get(transformer_entity_zone_2).last_reported
+    updated = create_devices_from_data("transformer.json")[0]
+    modify_state(
+        updated,
+        AferoState(functionClass="watts", functionInstance=None, value=66),
+    )
+    await bridge.generate_devices_from_data([updated])
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.friendly_device_6_watts").state == "66"
+    assert hass.states.get(transformer_entity_zone_1).last_reported == zone_1_reported
+    modify_state(
+        updated,
+        AferoState(functionClass="toggle", functionInstance="zone-1", value="off"),
+    )
+    await bridge.generate_devices_from_data([updated])
+    await hass.async_block_till_done()
+    assert hass.states.get(transformer_entity_zone_1).state == "off"
+    assert hass.states.get(transformer_entity_zone_2).last_reported == zone_2_reported
+
+
+@pytest.mark.asyncio
+async def test_changed_state_fingerprinted_once(mocked_entity_toggled, mocker):
+    """Ensure the state of an updated entity is only fingerprinted once."""
+    hass, entry, bridge = mocked_entity_toggled
+    fingerprint = mocker.spy(HubspaceBaseEntity, "get_state_fingerprint")
+    updated = create_devices_from_data("transformer.json")[0]
+    modify_state(
+        updated,
+        AferoState(functionClass="toggle", functionInstance="zone-1", value="on"),
+    )
+    await bridge.generate_devices_from_data([updated])
+    await hass.async_block_till_done()
+    assert hass.states.get(transformer_entity_zone_1).state == "on"
+    zone_1 = [
+        call
+        for call in fingerprint.call_args_list
+        if call.args[0].entity_id == transformer_entity_zone_1
+    ]
+    assert len(zone_1) == 1
+
+
+@pytest.mark.asyncio
+async def test_ha_write_not_fingerprinted(mocked_entity_toggled, mocker):
+    """Ensure writes started by Home Assistant do not fingerprint the state."""
+    hass, entry, bridge = mocked_entity_toggled
+    fingerprint = mocker.spy(HubspaceBaseEntity, "get_state_fingerprint")
+    entity = hass.data["entity_components"]["switch"].get_entity(
+        transformer_entity_zone_1
+    )
+    entity.async_write_ha_state()
+    assert fingerprint.call_count == 0
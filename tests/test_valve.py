@@ -1,10 +1,13 @@
 """Test the integration between Home Assistant Valves and Afero devices."""
 
+from aioafero import AferoState
 from homeassistant.components.valve import ATTR_CURRENT_POSITION
 from homeassistant.helpers import entity_registry as er
 import pytest
 
-from .utils import create_devices_from_data, hs_raw_from_dump
+from custom_components.hubspace.const import CONF_OPTIMISTIC, DOMAIN
+
+from .utils import create_devices_from_data, hs_raw_from_dump, modify_state
 
 spigot_from_file = create_devices_from_data("water-timer.json")
 spigot = spigot_from_file[0]
@@ -88,6 +91,40 @@ async def test_close_valve(mocked_entity):
     assert entity.state == "closed"
 
 
+@pytest.mark.asyncio
+async def test_open_valve_optimistic(mocked_entry, mocker, caplog):
+    """Ensure valves are optimistically shown as open until confirmed."""
+    hass, entry, bridge = mocked_entry
+    hass.config_entries.async_update_entry(
+        entry, options={**entry.options, CONF_OPTIMISTIC: True}
+    )
+    await bridge.generate_devices_from_data(spigot_from_file)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    states_during_call = []
+
+    async def set_state(**kwargs):
+        states_during_call.append(hass.states.get(spigot_1).state)
+
+    mocker.patch.object(bridge.valves, "set_state", side_effect=set_state)
+    await hass.services.async_call(
+        "valve", "open_valve", {"entity_id": spigot_1}, blocking=True
+    )
+    assert states_during_call == ["open"]
+    # Hubspace confirms the state
+    updated = create_devices_from_data("water-timer.json")[0]
+    modify_state(
+        updated,
+        AferoState(functionClass="toggle", functionInstance="spigot-1", value="on"),
+    )
+    await bridge.generate_devices_from_data([updated])
+    await hass.async_block_till_done()
+    assert hass.states.get(spigot_1).state == "open"
+    assert len(hass.data[DOMAIN][entry.entry_id].expectations) == 0
+    assert "Expected" not in caplog.text
+    await bridge.close()
+
+
 @pytest.mark.asyncio
 async def test_add_new_device(mocked_entry):
     """Ensure newly added devices are properly discovered and registered with Home Assistant."""
@@ -0,0 +1,148 @@
+"""Test coalescing entity state writes."""
+
+from datetime import timedelta
+
+from aioafero import AferoState
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.hubspace.const import CONF_COALESCE_WRITES, DOMAIN
+from custom_components.hubspace.writes import StateWriter
+
+from .utils import create_devices_from_data, modify_state
+
+
+class FakeClock:
+    """Controllable monotonic clock."""
+
+    def __init__(self) -> None:
+        """Initialize the clock."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+class FakeEntity:
+    """Entity that records when its state is written."""
+
+    def __init__(self, name: str, written: list[str]) -> None:
+        """Initialize the entity."""
+        self.name = name
+        self._written = written
+
+    def async_write_changed_state(self) -> None:
+        """Record the write."""
+        self._written.append(self.name)
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Clock used by the writer."""
+    return FakeClock()
+
+
+def fire_after(hass, seconds: float) -> None:
+    """Run the timers scheduled within the given number of seconds."""
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=seconds))
+
+
+@pytest.mark.asyncio
+async def test_write_immediately(hass, clock):
+    """Ensure writes are not delayed when nothing is enabled."""
+    writer = StateWriter(hass, False, 0, delay=0.5, batch_size=50, clock=clock)
+    written = []
+    writer.async_start_cycle()
+    writer.async_write(FakeEntity("a", written))
+    assert written == ["a"]
+    assert not writer.collecting
+
+
+@pytest.mark.asyncio
+async def test_write_after_cycle(hass, clock):
+    """Ensure writes from a poll are made together once the delay elapses."""
+    writer = StateWriter(hass, True, 0, delay=0.5, batch_size=2, clock=clock)
+    written = []
+    entities = [FakeEntity(name, written) for name in "abc"]
+    writer.async_start_cycle()
+    for entity in [*entities, entities[0]]:
+        writer.async_write(entity)
+    assert written == []
+    assert writer.dirty == 3
+    assert writer.deferred == 3
+    fire_after(hass, 1)
+    # The first batch is written, and the rest on the next loop iteration
+    assert written == ["a", "b"]
+    await hass.async_block_till_done()
+    assert written == ["a", "b", "c"]
+    assert writer.dirty == 0
+    # Writes outside of a poll are not delayed
+    writer.async_write(entities[0])
+    assert written == ["a", "b", "c", "a"]
+
+
+@pytest.mark.asyncio
+async def test_min_write_interval(hass, clock):
+    """Ensure an entity is written at most once per interval."""
+    writer = StateWriter(hass, False, 10, delay=0.5, batch_size=50, clock=clock)
+    written = []
+    chatty = FakeEntity("chatty", written)
+    quiet = FakeEntity("quiet", written)
+    writer.async_write(chatty)
+    clock.now = 1
+    writer.async_write(chatty)
+    writer.async_write(chatty)
+    writer.async_write(quiet)
+    assert written == ["chatty", "quiet"]
+    clock.now = 10
+    fire_after(hass, 10)
+    assert written == ["chatty", "quiet", "chatty"]
+
+
+@pytest.mark.asyncio
+async def test_discard(hass, clock):
+    """Ensure removed entities are not written."""
+    writer = StateWriter(hass, True, 0, delay=0.5, batch_size=50, clock=clock)
+    written = []
+    entity = FakeEntity("a", written)
+    writer.async_start_cycle()
+    writer.async_write(entity)
+    writer.discard(entity)
+    fire_after(hass, 1)
+    assert written == []
+    writer.async_start_cycle()
+    writer.async_write(entity)
+    writer.stop()
+    fire_after(hass, 1)
+    assert written == []
+
+
+@pytest.mark.asyncio
+async def test_coalesced_poll(mocked_entry):
+    """Ensure entities updated by a poll are written once the poll is processed."""
+    hass, entry, bridge = mocked_entry
+    hass.config_entries.async_update_entry(
+        entry, options={**entry.options, CONF_COALESCE_WRITES: True}
+    )
+    await bridge.generate_devices_from_data(
+        create_devices_from_data("transformer.json")
+    )
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    hubspace_bridge = hass.data[DOMAIN][entry.entry_id]
+    updated = create_devices_from_data("transformer.json")[0]
+    modify_state(
+        updated,
+        AferoState(functionClass="watts", functionInstance=None, value=66),
+    )
+    hubspace_bridge.state_writer.async_start_cycle()
+    await bridge.generate_devices_from_data([updated])
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.friendly_device_6_watts").state != "66"
+    fire_after(hass, 1)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.friendly_device_6_watts").state == "66"
+    assert hubspace_bridge.state_writer.written == 1
+    await bridge.close()